@@ -137,8 +137,176 @@ class WordFormat(object):
 		
 		return 1.0*self.minimum_scaled_value * self.lsb_value
 
+	@property
+	def storage_dtype(self):
+		"""
+		Return the narrowest unsigned integer type that holds a word of this width.
+		
+		Notes:
+		Words wider than 32 bits are stored in 64-bit integers.
+		"""
+		
+		for dtype in (np.uint8,np.uint16,np.uint32):
+			if (self.width <= 8*np.dtype(dtype).itemsize):
+				return np.dtype(dtype)
+		
+		return np.dtype(np.uint64)
+
 # end class WordFormat
 
+def quantize(val,fmt):
+	"""
+	Return the scaled values of the given numbers, saturating those outside the representable range.
+	
+	Arguments:
+	val -- Real-valued numbers, as for the Word constructor.
+	fmt -- A WordFormat instance that defines the binary representation 
+	used.
+	
+	Notes:
+	The values are scaled by the least-significant bit value, clipped 
+	to the range of scaled values and truncated toward zero, which gives
+	the same result as constructing a Word from values clipped to the 
+	representable range. This is done in a single sequence of array 
+	operations, without first testing the range. The result is a signed
+	integer array of the narrowest type that holds the width of the 
+	format, e.g. int8 for an 8-bit format.
+	"""
+	
+	# the least-significant bit value is a power of two, so that scaling
+	# by its inverse is exact
+	scaled = np.asarray(np.multiply(val,1.0/fmt.lsb_value))
+	np.clip(scaled,fmt.minimum_scaled_value,fmt.maximum_scaled_value,out=scaled)
+	
+	return scaled.astype(fmt.storage_dtype.str.replace('u','i'))
+
+def _masked(scaled,fmt):
+	# Return the two's complement representation of signed scaled values
+	# as unsigned integers of the same size, with the bits outside the
+	# width of the format cleared. The given array is modified.
+	
+	unsigned = scaled.view(fmt.storage_dtype)
+	if (fmt.width < 8*unsigned.itemsize):
+		np.bitwise_and(unsigned,unsigned.dtype.type(fmt.mask),out=unsigned)
+	
+	return unsigned
+
+# Word widths that can be packed into bytes.
+packed_widths = (1,2,4)
+
+def pack(scaled_value,width):
+	"""
+	Pack scaled values of the given width into bytes.
+	
+	Arguments:
+	scaled_value -- Integer array as returned by the scaled_value
+	property of a Word with a format of the given width.
+	width -- The word width in bits, one of packed_widths.
+	
+	Notes:
+	Consecutive values along the last axis are packed into bytes, the
+	first value in the least-significant bits of each byte, so that a
+	byte holds 8/width values. The last axis is padded with zero bits to
+	a whole number of bytes, and the result is a uint8 array with the
+	same shape as scaled_value except for the last axis.
+	"""
+	
+	if (width not in packed_widths):
+		raise ValueError("Only words of width " + ",".join([str(w) for w in packed_widths]) + " can be packed.")
+	
+	per_byte = 8 / width
+	unsigned = np.bitwise_and(scaled_value,2**width - 1).astype(np.uint8,copy=False)
+	n = unsigned.shape[-1]
+	n_bytes = (n + per_byte - 1) / per_byte
+	if (n_bytes*per_byte != n):
+		padding = np.zeros(unsigned.shape[:-1] + (n_bytes*per_byte - n,),dtype=np.uint8)
+		unsigned = np.concatenate((unsigned,padding),axis=-1)
+	
+	# view the values for each byte as a single little-endian integer, in
+	# which value ii is at bit 8*ii, and shift each value to bit ii*width;
+	# the bits shifted into the low byte from other values are all zero
+	grouped = unsigned.view('<u' + str(per_byte))
+	packed = grouped.copy()
+	for ii in range(1,per_byte):
+		packed |= np.right_shift(grouped,ii*(8 - width))
+	
+	return packed.astype(np.uint8)
+
+def unpack(packed,width,count,table=None):
+	"""
+	Return the scaled values packed into bytes.
+	
+	Arguments:
+	packed -- A uint8 array as returned by pack.
+	width -- The word width in bits, one of packed_widths.
+	count -- The number of values along the last axis.
+	
+	Keyword arguments:
+	table -- Array of 2**width entries, in which case the entry for
+	each packed value is returned instead of the value itself (default
+	is None).
+	
+	Notes:
+	This is the inverse of pack. Bytes are unpacked by a lookup table
+	that holds the values in each of the 256 possible bytes, and the
+	result is a uint8 array, or an array of the type of table. Entries
+	of table are combined with the lookup table of bytes beforehand, so
+	that translating values (e.g. offset binary codes to scaled values)
+	takes no additional pass over the result.
+	"""
+	
+	if (width not in packed_widths):
+		raise ValueError("Only words of width " + ",".join([str(w) for w in packed_widths]) + " can be packed.")
+	
+	byte_table = _unpack_table(width)
+	if (table is not None):
+		byte_table = np.asarray(table)[byte_table]
+	
+	return _lookup(byte_table,packed,count)
+
+# Lookup tables for unpacking bytes, for each width and format.
+_unpack_tables = dict()
+_value_tables = dict()
+
+def _unpack_table(width):
+	# Return the scaled values packed in each possible byte, as a
+	# (256,8/width) array.
+	
+	if (width not in _unpack_tables):
+		shifts = np.arange(0,8,width,dtype=np.uint8)
+		table = np.right_shift(np.arange(0,256,dtype=np.uint8).reshape((256,1)),shifts)
+		_unpack_tables[width] = np.bitwise_and(table,2**width - 1)
+	
+	return _unpack_tables[width]
+
+def _value_table(fmt):
+	# Return the values packed in each possible byte for the given format,
+	# as a (256,8/width) array.
+	
+	key = (fmt.width,fmt.lsb_value)
+	if (key not in _value_tables):
+		_value_tables[key] = Word.from_scaled_value(_unpack_table(fmt.width),fmt).value
+	
+	return _value_tables[key]
+
+def _lookup(table,packed,count):
+	# Return the entries of table for each byte in packed, with the last
+	# axis cut to count entries. The row of entries for each byte is
+	# viewed as a single item, integer if it fits, so that the lookup
+	# copies one item per byte rather than indexing along two axes.
+	
+	table = np.ascontiguousarray(table)
+	row_bytes = table.itemsize * table.shape[-1]
+	if (row_bytes in (1,2,4,8)):
+		rows = table.view('u' + str(row_bytes))
+	else:
+		rows = table.view(np.dtype((np.void,row_bytes)))
+	
+	entries = np.take(rows.reshape(table.shape[0]),packed).view(table.dtype)
+	entries = entries.reshape(np.shape(packed)[:-1] + (-1,))
+	
+	return entries[...,:count]
+
 class Word(object):
 	"""
 	Represent a number in a limited width binary format.
@@ -226,6 +394,11 @@ class Word(object):
 		
 		return "????????"
 
+	def _arithmetic_type(self):
+		# Return the type used for the result of arithmetic operations.
+		
+		return type(self)
+	
 	def __neg__(self):
 		"""
 		Negate operator.
@@ -233,7 +406,7 @@ class Word(object):
 		"""
 		
 		new_val = -self.value
-		return type(self)(new_val,self.word_format)
+		return self._arithmetic_type()(new_val,self.word_format)
 
 	def __pos__(self):
 		"""
@@ -274,9 +447,9 @@ class Word(object):
 		new_val = self.value + other.value
 		
 		# check which type to use for result
-		type_other = type(other)
-		type_self = type(self)
-		if (isinstance(other,type_self)):
+		type_other = other._arithmetic_type()
+		type_self = self._arithmetic_type()
+		if (issubclass(type_other,type_self)):
 			return type_other(new_val,new_fmt)
 		else:
 			return type_self(new_val,new_fmt)
@@ -312,9 +485,9 @@ class Word(object):
 		new_val = self.value - other.value
 		
 		# check which type to use for result
-		type_other = type(other)
-		type_self = type(self)
-		if (isinstance(other,type_self)):
+		type_other = other._arithmetic_type()
+		type_self = self._arithmetic_type()
+		if (issubclass(type_other,type_self)):
 			return type_other(new_val,new_fmt)
 		else:
 			return type_self(new_val,new_fmt)
@@ -350,9 +523,9 @@ class Word(object):
 		new_val = self.value * other.value
 		
 		# check which type to use for result
-		type_other = type(other)
-		type_self = type(self)
-		if (isinstance(other,type_self)):
+		type_other = other._arithmetic_type()
+		type_self = self._arithmetic_type()
+		if (issubclass(type_other,type_self)):
 			return type_other(new_val,new_fmt)
 		else:
 			return type_self(new_val,new_fmt)
@@ -382,10 +555,74 @@ class Word(object):
 		
 		"""
 		
-		neg_value = self.scaled_value & (-self.word_format.minimum_scaled_value)
-		pos_value = self.scaled_value & self.word_format.maximum_scaled_value
+		# scaled values may be stored in a narrower unsigned type
+		scaled_value = np.asarray(self.scaled_value,dtype=np.int64)
+		neg_value = scaled_value & (-self.word_format.minimum_scaled_value)
+		pos_value = scaled_value & self.word_format.maximum_scaled_value
 		
 		return 1.0 * (pos_value - neg_value) * self.word_format.lsb_value
+	
+	@property
+	def shape(self):
+		"""
+		Return the shape of the represented value.
+		
+		"""
+		
+		return np.shape(self._scaled_value)
+	
+	@property
+	def nbytes(self):
+		"""
+		Return the memory used to store the scaled value, in bytes.
+		
+		"""
+		
+		return np.asarray(self._scaled_value).nbytes
+
+	@classmethod
+	def from_scaled_value(cls,scaled_value,fmt):
+		"""
+		Construct a Word directly from its scaled value representation.
+		
+		Arguments:
+		scaled_value -- Integer array as returned by the scaled_value 
+		property of a Word in the given format.
+		fmt -- A WordFormat instance that defines the binary representation 
+		used.
+		
+		Notes:
+		The array is used as is, without copying, masking or checking the
+		range, so that words can be constructed around existing buffers 
+		(e.g. in shared memory). The caller should ensure that it holds
+		a valid representation.
+		"""
+		
+		word = cls.__new__(cls)
+		word._word_format = fmt
+		word._scaled_value = scaled_value
+		
+		return word
+	
+	@classmethod
+	def saturate(cls,val,fmt):
+		"""
+		Construct a Word for the given values, saturating those outside the representable range.
+		
+		Arguments:
+		val -- The value to be represented.
+		fmt -- A WordFormat instance that defines the binary representation 
+		used.
+		
+		Notes:
+		Unlike the constructor, no OverflowError is raised: values outside
+		the representable range are replaced by the nearest bound, see 
+		quantize. The scaled values are stored in the narrowest unsigned
+		type that holds the width of the format (see 
+		WordFormat.storage_dtype) rather than in 64-bit integers.
+		"""
+		
+		return cls.from_scaled_value(_masked(quantize(val,fmt),fmt),fmt)
 
 # End class Word(object):
 
@@ -532,11 +769,377 @@ class WordComplex(Word):
 		
 		"""
 		
-		neg_value_real = self.scaled_value_real & (-self.word_format.minimum_scaled_value)
-		pos_value_real = self.scaled_value_real & self.word_format.maximum_scaled_value
-		neg_value_imag = self.scaled_value_imag & (-self.word_format.minimum_scaled_value)
-		pos_value_imag = self.scaled_value_imag & self.word_format.maximum_scaled_value
+		scaled_value_real = np.asarray(self.scaled_value_real,dtype=np.int64)
+		scaled_value_imag = np.asarray(self.scaled_value_imag,dtype=np.int64)
+		neg_value_real = scaled_value_real & (-self.word_format.minimum_scaled_value)
+		pos_value_real = scaled_value_real & self.word_format.maximum_scaled_value
+		neg_value_imag = scaled_value_imag & (-self.word_format.minimum_scaled_value)
+		pos_value_imag = scaled_value_imag & self.word_format.maximum_scaled_value
 		return np.array(((pos_value_real - neg_value_real) + 1.0j*(pos_value_imag - neg_value_imag))*self.word_format.lsb_value,dtype=np.complex)
 
+	@property
+	def shape(self):
+		"""
+		Return the shape of the represented value.
+		
+		"""
+		
+		return np.shape(self._scaled_value_real)
+	
+	@property
+	def nbytes(self):
+		"""
+		Return the memory used to store the real and imaginary scaled values, in bytes.
+		
+		"""
+		
+		return np.asarray(self._scaled_value_real).nbytes + np.asarray(self._scaled_value_imag).nbytes
+	
+	@classmethod
+	def from_scaled_value(cls,scaled_value_real,scaled_value_imag,fmt):
+		"""
+		Construct a WordComplex directly from its scaled value representation.
+		
+		Arguments:
+		scaled_value_real -- Integer array as returned by the 
+		scaled_value_real property of a WordComplex in the given format.
+		scaled_value_imag -- Integer array as returned by the 
+		scaled_value_imag property of a WordComplex in the given format.
+		fmt -- A WordFormat instance that defines the binary representation 
+		used.
+		
+		Notes:
+		See Word.from_scaled_value.
+		"""
+		
+		word = cls.__new__(cls)
+		word._word_format = fmt
+		word._scaled_value_real = scaled_value_real
+		word._scaled_value_imag = scaled_value_imag
+		
+		return word
+
+	@classmethod
+	def saturate(cls,val,fmt):
+		"""
+		Construct a WordComplex for the given values, saturating components outside the representable range.
+		
+		Arguments:
+		val -- The number to be represented in the given format.
+		fmt -- The WordFormat instance that defines the representation.
+		
+		Notes:
+		The real and imaginary components are saturated separately, see
+		Word.saturate.
+		"""
+		
+		val = np.asarray(val)
+		scaled_value_real = _masked(quantize(val.real,fmt),fmt)
+		scaled_value_imag = _masked(quantize(val.imag,fmt),fmt)
+		
+		return cls.from_scaled_value(scaled_value_real,scaled_value_imag,fmt)
+
 # End class WordComplex
 
+class PackedWord(Word):
+	"""
+	Extension of Word that stores values of 1, 2 or 4 bits packed into bytes.
+
+	The scaled values are packed along the last axis, several values to
+	a byte (see pack), which takes 8 to 64 times less memory than the
+	64-bit scaled values of a Word. The value and scaled_value properties
+	unpack the bytes through lookup tables, and return the same values
+	as a Word in the same format.
+	
+	Notes:
+	Arithmetic operations on packed words return Word instances, since
+	the format of the result is wider than that of the arguments.
+	"""
+	
+	def __init__(self,val,fmt):
+		"""
+		Construct a packed binary representation of the given value.
+		
+		Arguments:
+		val -- The value to be represented.
+		fmt -- A WordFormat instance that defines the binary representation
+		used, of which the width should be one of packed_widths.
+		
+		Notes:
+		See the constructor method of Word.
+		"""
+		
+		word = Word(val,fmt)
+		self._word_format = fmt
+		self._set_scaled_value(word.scaled_value)
+	
+	def _set_scaled_value(self,scaled_value):
+		# Pack the given scaled values. Scalars are packed as arrays of a
+		# single value.
+		
+		scaled_value = np.asarray(scaled_value)
+		self._shape = scaled_value.shape
+		self._packed = pack(scaled_value.reshape(self._shape or (1,)),self.word_format.width)
+	
+	def _count(self):
+		# Return the number of values along the last axis.
+		
+		if (len(self._shape) == 0):
+			return 1
+		
+		return self._shape[-1]
+	
+	def _arithmetic_type(self):
+		# Return the type used for the result of arithmetic operations.
+		
+		return Word
+	
+	@property
+	def packed(self):
+		"""
+		Return the packed scaled values as a uint8 array.
+		
+		"""
+		
+		return self._packed
+	
+	@property
+	def scaled_value(self):
+		"""
+		Return the scaled value representation.
+		
+		"""
+		
+		return unpack(self._packed,self.word_format.width,self._count()).reshape(self._shape)
+	
+	@property
+	def value(self):
+		"""
+		Return the actual value represented.
+		
+		"""
+		
+		return _lookup(_value_table(self.word_format),self._packed,self._count()).reshape(self._shape)
+	
+	@property
+	def shape(self):
+		"""
+		Return the shape of the represented value.
+		
+		"""
+		
+		return self._shape
+	
+	@property
+	def nbytes(self):
+		"""
+		Return the memory used to store the packed scaled value, in bytes.
+		
+		"""
+		
+		return self._packed.nbytes
+	
+	@classmethod
+	def from_scaled_value(cls,scaled_value,fmt):
+		"""
+		Construct a PackedWord from scaled values in the given format.
+		
+		Arguments:
+		scaled_value -- Integer array as returned by the scaled_value
+		property of a Word in the given format.
+		fmt -- A WordFormat instance that defines the binary representation
+		used.
+		
+		"""
+		
+		word = cls.__new__(cls)
+		word._word_format = fmt
+		word._set_scaled_value(scaled_value)
+		
+		return word
+	
+	@classmethod
+	def from_packed(cls,packed,shape,fmt):
+		"""
+		Construct a PackedWord around packed scaled values.
+		
+		Arguments:
+		packed -- A uint8 array as returned by the packed property of a
+		PackedWord in the given format.
+		shape -- The shape of the represented value.
+		fmt -- A WordFormat instance that defines the binary representation
+		used.
+		
+		Notes:
+		The array is used without copying, see Word.from_scaled_value.
+		"""
+		
+		word = cls.__new__(cls)
+		word._word_format = fmt
+		word._shape = tuple(shape)
+		word._packed = packed
+		
+		return word
+
+# End class PackedWord
+
+class PackedWordComplex(WordComplex):
+	"""
+	Extension of WordComplex that stores components of 1, 2 or 4 bits packed into bytes.
+	
+	The real and imaginary scaled values are packed separately, see
+	PackedWord.
+	"""
+	
+	def __init__(self,val,fmt):
+		"""
+		Construct a packed binary representation of a complex number.
+		
+		Arguments:
+		val -- The number to be represented in the given format.
+		fmt -- The WordFormat instance that defines the representation, of
+		which the width should be one of packed_widths.
+		
+		Notes:
+		See the constructor method of WordComplex.
+		"""
+		
+		word = WordComplex(val,fmt)
+		self._word_format = fmt
+		self._set_scaled_value(word.scaled_value_real,word.scaled_value_imag)
+	
+	def _set_scaled_value(self,scaled_value_real,scaled_value_imag):
+		# Pack the given real and imaginary scaled values.
+		
+		scaled_value_real = np.asarray(scaled_value_real)
+		scaled_value_imag = np.asarray(scaled_value_imag)
+		self._shape = scaled_value_real.shape
+		self._packed_real = pack(scaled_value_real.reshape(self._shape or (1,)),self.word_format.width)
+		self._packed_imag = pack(scaled_value_imag.reshape(self._shape or (1,)),self.word_format.width)
+	
+	def _count(self):
+		# Return the number of values along the last axis.
+		
+		if (len(self._shape) == 0):
+			return 1
+		
+		return self._shape[-1]
+	
+	def _arithmetic_type(self):
+		# Return the type used for the result of arithmetic operations.
+		
+		return WordComplex
+	
+	@property
+	def packed_real(self):
+		"""
+		Return the packed real scaled values as a uint8 array.
+		
+		"""
+		
+		return self._packed_real
+	
+	@property
+	def packed_imag(self):
+		"""
+		Return the packed imaginary scaled values as a uint8 array.
+		
+		"""
+		
+		return self._packed_imag
+	
+	@property
+	def scaled_value_real(self):
+		"""
+		Return the real component of the scaled value.
+		
+		"""
+		
+		return unpack(self._packed_real,self.word_format.width,self._count()).reshape(self._shape)
+	
+	@property
+	def scaled_value_imag(self):
+		"""
+		Return the imaginary component of the scaled value.
+		
+		"""
+		
+		return unpack(self._packed_imag,self.word_format.width,self._count()).reshape(self._shape)
+	
+	@property
+	def value(self):
+		"""
+		Return the actual value represented.
+		
+		"""
+		
+		table = _value_table(self.word_format)
+		value_real = _lookup(table,self._packed_real,self._count())
+		value_imag = _lookup(table,self._packed_imag,self._count())
+		
+		return (value_real + 1.0j * value_imag).reshape(self._shape)
+	
+	@property
+	def shape(self):
+		"""
+		Return the shape of the represented value.
+		
+		"""
+		
+		return self._shape
+	
+	@property
+	def nbytes(self):
+		"""
+		Return the memory used to store the packed real and imaginary scaled values, in bytes.
+		
+		"""
+		
+		return self._packed_real.nbytes + self._packed_imag.nbytes
+	
+	@classmethod
+	def from_scaled_value(cls,scaled_value_real,scaled_value_imag,fmt):
+		"""
+		Construct a PackedWordComplex from scaled values in the given format.
+		
+		Arguments:
+		scaled_value_real -- Integer array as returned by the
+		scaled_value_real property of a WordComplex in the given format.
+		scaled_value_imag -- Integer array as returned by the
+		scaled_value_imag property of a WordComplex in the given format.
+		fmt -- The WordFormat instance that defines the representation.
+		
+		"""
+		
+		word = cls.__new__(cls)
+		word._word_format = fmt
+		word._set_scaled_value(scaled_value_real,scaled_value_imag)
+		
+		return word
+	
+	@classmethod
+	def from_packed(cls,packed_real,packed_imag,shape,fmt):
+		"""
+		Construct a PackedWordComplex around packed scaled values.
+		
+		Arguments:
+		packed_real -- A uint8 array as returned by the packed_real
+		property of a PackedWordComplex in the given format.
+		packed_imag -- A uint8 array as returned by the packed_imag
+		property of a PackedWordComplex in the given format.
+		shape -- The shape of the represented value.
+		fmt -- The WordFormat instance that defines the representation.
+		
+		Notes:
+		The arrays are used without copying, see Word.from_scaled_value.
+		"""
+		
+		word = cls.__new__(cls)
+		word._word_format = fmt
+		word._shape = tuple(shape)
+		word._packed_real = packed_real
+		word._packed_imag = packed_imag
+		
+		return word
+
+# End class PackedWordComplex
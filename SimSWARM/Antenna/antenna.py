@@ -14,6 +14,9 @@
 #  	AY: Created 2015-01-22
 #	AY: Implemented Array as Parallel of Antenna 2015-01-27
 #	AY: Fixed .position attribute of Array (.positions removed) 2015-01-28
+#	AY: Added runner argument to Array.receiver_block 2026-10-18
+#	AY: Added spec methods for declarative descriptions 2026-10-18
+#	AY: Added time-varying geometric delay to receiver_block 2026-10-18
 
 """
 Defines antenna related classes and utilities.
@@ -86,13 +89,24 @@ class Antenna(object):
 			
 			self.sources.append(src)
 	
-	def receiver_block(self):
+	def receiver_block(self,phi_rate=None):
 		"""
 		Generate the signal received by this antenna.
 		
 		The result is returned as a Block instance on which the output
 		method may be called to yield the signal received by the antenna.
 		
+		Keyword arguments:
+		phi_rate -- Rate of change of the phi-coordinate of sources on 
+		the sky in degrees per second, e.g. due to the rotation of the 
+		earth, or None for sources at fixed positions (default is None).
+		
+		Notes:
+		If phi_rate is given, the geometric delay of each source on the
+		sky is applied as a delay polynomial d0 + d1*t + d2*t**2, which 
+		approximates the delay around t = 0 for the source moving at the
+		given rate, see SimSWARM.Blocks.AnalogDelayPolynomial. Otherwise
+		a constant delay is applied.
 		"""
 		
 		# first create a list of received signals
@@ -110,7 +124,10 @@ class Antenna(object):
 					l,m,n = src_pos.coords_lmn
 					ant_x,ant_y,ant_z = self.position
 					delay = -(l*ant_x + m*ant_y + n*ant_z)/const.c
-					delay_block = bl.AnalogDelay(delay)
+					if (phi_rate == None):
+						delay_block = bl.AnalogDelay(delay)
+					else:
+						delay_block = bl.AnalogDelayPolynomial([delay] + self._sky_delay_rates(src_pos,phi_rate))
 					delay_block.attach_source(src.signal)
 					received_signals.append(delay_block)
 				elif (isinstance(src_pos,sr.CartesianPosition)):
@@ -127,6 +144,56 @@ class Antenna(object):
 		
 		return result
 	
+	def _sky_delay_rates(self,src_pos,phi_rate):
+		# Return the first and second order coefficients of the geometric
+		# delay of a source on the sky whose phi-coordinate changes at
+		# phi_rate degrees per second. The delay is 
+		# -sin(theta)*(x*cos(phi) + y*sin(phi))/c - cos(theta)*z/c, of
+		# which only the first term depends on phi.
+		
+		omega = np.deg2rad(phi_rate)
+		theta = np.deg2rad(src_pos.theta)
+		phi = np.deg2rad(src_pos.phi)
+		ant_x,ant_y,ant_z = self.position
+		
+		d1 = -np.sin(theta)*omega*(-ant_x*np.sin(phi) + ant_y*np.cos(phi))/const.c
+		d2 = np.sin(theta)*omega**2*(ant_x*np.cos(phi) + ant_y*np.sin(phi))/(2.0*const.c)
+		
+		return [d1,d2]
+	
+	def _spec_params(self):
+		"""
+		Return the constructor arguments of this antenna as a dictionary.
+		
+		Notes:
+		See SimSWARM.Signal.Signal._spec_params. The visible sources are
+		restored separately, see _spec_links.
+		"""
+		
+		return {'pos': self._position}
+	
+	def _spec_links(self):
+		"""
+		Return the sources visible to this antenna.
+		
+		Notes:
+		Links are restored after all objects in a spec have been 
+		constructed, see SimSWARM.Blocks.Block._spec_links.
+		"""
+		
+		return {'sources': self._sources}
+	
+	def _restore_spec_links(self,links):
+		"""
+		Restore the sources visible to this antenna.
+		
+		Arguments:
+		links -- Dictionary as returned by _spec_links, of which the
+		values have been restored from a spec.
+		"""
+		
+		self._sources = links['sources']
+	
 # end class Antenna
 
 class Array(Antenna):
@@ -219,19 +286,54 @@ class Array(Antenna):
 			for a in self.antennas:
 				a.add_source(src)
 	
-	def receiver_block(self):
+	def receiver_block(self,runner=None,phi_rate=None):
 		"""
 		Generate the signal received by this antenna array.
 		
 		The result is returned as a Parallel instance on which the output
 		method may be called to yield the signal received by the antenna.
 		
+		Keyword arguments:
+		runner -- Runner used to evaluate the per-antenna paths, see 
+		SimSWARM.Blocks.Parallel.set_runner (default is None, i.e. serial
+		evaluation).
+		phi_rate -- Rate of change of the phi-coordinate of sources on 
+		the sky in degrees per second, see Antenna.receiver_block 
+		(default is None).
+		
 		"""
 		
 		antenna_blocks = list()
 		for antenna in self.antennas:
-			antenna_blocks.append(antenna.receiver_block())
+			antenna_blocks.append(antenna.receiver_block(phi_rate=phi_rate))
+		
+		result = bl.Parallel(antenna_blocks)
+		result.set_runner(runner)
+		
+		return result
+	
+	def _spec_params(self):
+		"""
+		Return the list of antennas as constructor argument.
+		
+		"""
+		
+		return {'antlist': self.antennas}
+	
+	def _spec_links(self):
+		"""
+		Return an empty dictionary, the sources are linked to each antenna.
+		
+		"""
+		
+		return dict()
+	
+	def _restore_spec_links(self,links):
+		"""
+		Restore nothing, see _spec_links.
+		
+		"""
 		
-		return bl.Parallel(antenna_blocks)
+		pass
 
 # end class Array
@@ -0,0 +1,20 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#  __init__.py
+#  Oct 18, 2026 10:12:40 EDT
+#  Copyright 2026
+#         
+#  Andre Young <andre.young@cfa.harvard.edu>
+#  Harvard-Smithsonian Center for Astrophysics
+#  60 Garden Street, Cambridge
+#  MA 02138
+#  
+#  Changelog:
+#  	AY: Created 2026-10-18
+"""
+Defines atmospheric propagation effects for the SWARM simulator.
+
+"""
+
+from atmosphere import *
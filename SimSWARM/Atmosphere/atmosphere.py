@@ -0,0 +1,269 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#  atmosphere.py
+#  Oct 18, 2026 10:13:05 EDT
+#  Copyright 2026
+#         
+#  Andre Young <andre.young@cfa.harvard.edu>
+#  Harvard-Smithsonian Center for Astrophysics
+#  60 Garden Street, Cambridge
+#  MA 02138
+#  
+#  Changelog:
+#  	AY: Created 2026-10-18
+
+"""
+Defines atmospheric phase screens and related utilities.
+
+"""
+
+import numpy as np
+import scipy.constants as const
+
+pi = np.pi
+
+class PhaseScreen(object):
+	"""
+	Define a frozen-flow Kolmogorov phase screen above an antenna array.
+	
+	The screen is synthesized by FFT in tiles along the direction of the
+	wind, and tiles are generated lazily as the screen is advanced in 
+	time. Each tile is seeded by its index, so that any part of the screen
+	can be regenerated identically, and consecutive tiles are blended over
+	a short overlap to avoid discontinuities at the tile boundaries.
+	"""
+	
+	# Maximum number of tiles kept in memory. Tiles are deterministic, so
+	# evicted tiles are simply regenerated if they are needed again.
+	_max_cached_tiles = 8
+	
+	@property
+	def r0(self):
+		"""
+		Return the Fried parameter in meters.
+		
+		"""
+		
+		return self._r0
+	
+	@property
+	def wavelength(self):
+		"""
+		Return the wavelength in meters at which r0 is defined.
+		
+		"""
+		
+		return self._wavelength
+	
+	@property
+	def velocity(self):
+		"""
+		Return the (x,y) wind velocity in meters per second.
+		
+		"""
+		
+		return self._velocity
+	
+	@property
+	def pixel_scale(self):
+		"""
+		Return the size of a screen pixel in meters.
+		
+		"""
+		
+		return self._pixel_scale
+	
+	@property
+	def tile_length(self):
+		"""
+		Return the length of a screen tile in pixels along the wind direction.
+		
+		"""
+		
+		return self._tile_length
+	
+	@property
+	def seed(self):
+		"""
+		Return the random generator seed for this screen.
+		
+		"""
+		
+		return self._seed
+	
+	def __init__(self,array,r0,wavelength,velocity,pixel_scale=1.0,tile_length=1024,seed=0):
+		"""
+		Construct a phase screen for the given antenna array.
+		
+		Arguments:
+		array -- SimSWARM.Antenna.Array instance, the antennas of which
+		are looked up on the screen.
+		r0 -- The Fried parameter in meters.
+		wavelength -- The wavelength in meters at which r0 is defined.
+		velocity -- The (x,y) wind velocity in meters per second.
+		
+		Keyword arguments:
+		pixel_scale -- The size of a screen pixel in meters (default 1.0).
+		tile_length -- The number of pixels per tile along the wind 
+		direction (default 1024).
+		seed -- Base seed for the random generator (default 0).
+		
+		Notes:
+		The screen moves across the array with the given velocity, which
+		should be non-zero. Only the (x,y) antenna coordinates are used,
+		i.e. the screen is assumed to be parallel to the ground.
+		"""
+		
+		self._r0 = r0
+		self._wavelength = wavelength
+		self._velocity = tuple(velocity)
+		self._pixel_scale = pixel_scale
+		self._tile_length = int(tile_length)
+		self._seed = seed
+		
+		speed = np.sqrt(self._velocity[0]**2 + self._velocity[1]**2)
+		if (speed == 0.0):
+			raise ValueError("PhaseScreen requires a non-zero wind velocity.")
+		self._speed = speed
+		
+		# project antenna positions onto the wind direction and the 
+		# direction perpendicular to it, in units of pixels
+		x,y,z = array.position
+		x = np.array(x,dtype=np.float64)
+		y = np.array(y,dtype=np.float64)
+		ux,uy = self._velocity[0]/speed,self._velocity[1]/speed
+		along = (x*ux + y*uy)/pixel_scale
+		across = (-x*uy + y*ux)/pixel_scale
+		self._along = along - along.min() + 1.0
+		self._across = across - across.min() + 1.0
+		
+		# screen width across the wind covers the array with a margin
+		self._width = int(2**np.ceil(np.log2(self._across.max() + 3.0)))
+		self._overlap = max(1,self._tile_length/8)
+		
+		self._raw_tiles = dict()
+		self._tiles = dict()
+	
+	def delays(self,t):
+		"""
+		Return the atmospheric delay for each antenna at the given time(s).
+		
+		Arguments:
+		t -- Time in seconds, either a scalar or an array of times.
+		
+		Notes:
+		For scalar t the result is an array of delays in seconds, one per
+		antenna in the order of Array.antennas. For array t the result has
+		shape (number of antennas, number of times).
+		
+		All lookups are done at once using bilinear interpolation on the
+		screen, with the screen tiles required generated as needed.
+		"""
+		
+		t_arr = np.array(t,dtype=np.float64)
+		pos_along = self._along.reshape((-1,1)) + self._speed*t_arr.reshape((1,-1))/self.pixel_scale
+		pos_across = self._across.reshape((-1,1)) * np.ones((1,t_arr.size))
+		
+		idx_along = np.array(np.floor(pos_along),dtype=np.int64)
+		idx_across = np.array(np.floor(pos_across),dtype=np.int64)
+		frac_along = pos_along - idx_along
+		frac_across = pos_across - idx_across
+		
+		# assemble the strip of tiles that covers all lookups
+		tile_first = idx_along.min() // self.tile_length
+		tile_last = (idx_along.max() + 1) // self.tile_length
+		strip = np.concatenate([self._tile(k) for k in range(tile_first,tile_last+1)],axis=0)
+		i0 = idx_along - tile_first*self.tile_length
+		
+		phase = (1.0-frac_along)*(1.0-frac_across)*strip[i0,idx_across] + \
+			frac_along*(1.0-frac_across)*strip[i0+1,idx_across] + \
+			(1.0-frac_along)*frac_across*strip[i0,idx_across+1] + \
+			frac_along*frac_across*strip[i0+1,idx_across+1]
+		
+		delay = phase * self.wavelength / (2.0*pi*const.c)
+		if (t_arr.ndim == 0):
+			return delay[:,0]
+		
+		return delay
+	
+	def delay_polynomials(self,t,dt):
+		"""
+		Return a linear delay polynomial for each antenna over the given interval.
+		
+		Arguments:
+		t -- Start time of the interval in seconds.
+		dt -- Duration of the interval in seconds.
+		
+		Notes:
+		The result is a list of (d0,d1) tuples, one per antenna, such that
+		d0 + d1*t' matches the screen delay at t' = t and t' = t + dt. These
+		can be passed to SimSWARM.Blocks.AnalogDelayPolynomial to apply a
+		smoothly varying atmospheric delay over a frame.
+		"""
+		
+		d = self.delays(np.array([t,t+dt]))
+		d1 = (d[:,1] - d[:,0])/dt
+		d0 = d[:,0] - d1*t
+		
+		return zip(d0,d1)
+	
+	def _tile(self,k):
+		# Return the blended tile with index k. The first rows of each tile
+		# are a blend of the overlap rows of the raw tiles k-1 and k, using
+		# cosine / sine weights so that the variance is preserved.
+		
+		if (k in self._tiles):
+			return self._tiles[k]
+		
+		raw = self._raw_tile(k)
+		prev = self._raw_tile(k-1)
+		L = self.tile_length
+		O = self._overlap
+		theta = 0.5*pi*(np.arange(O) + 0.5)/O
+		tile = raw[0:L,:].copy()
+		tile[0:O,:] = np.cos(theta).reshape((-1,1))*prev[L:L+O,:] + np.sin(theta).reshape((-1,1))*raw[0:O,:]
+		
+		self._cache(self._tiles,k,tile)
+		return tile
+	
+	def _raw_tile(self,k):
+		# Return the raw FFT-synthesized tile with index k, which extends
+		# by the overlap length beyond the tile length. The screen is
+		# synthesized on a grid twice as large in each dimension and then
+		# cropped, which reduces the periodicity imposed by the FFT.
+		
+		if (k in self._raw_tiles):
+			return self._raw_tiles[k]
+		
+		n_along = 2*(self.tile_length + self._overlap)
+		n_across = 2*self._width
+		dx = self.pixel_scale
+		fx = np.fft.fftfreq(n_along,dx).reshape((-1,1))
+		fy = np.fft.fftfreq(n_across,dx).reshape((1,-1))
+		f = np.sqrt(fx**2 + fy**2)
+		f[0,0] = 1.0
+		# Kolmogorov phase power spectral density in rad^2 m^2
+		psd = 0.023 * self.r0**(-5.0/3.0) * f**(-11.0/3.0)
+		psd[0,0] = 0.0
+		df = 1.0/(n_along*dx) * 1.0/(n_across*dx)
+		
+		rs = np.random.RandomState([self.seed,k % 2**32])
+		cn = (rs.randn(n_along,n_across) + 1j*rs.randn(n_along,n_across)) * np.sqrt(psd*df)
+		raw = np.fft.ifft2(cn).real * n_along * n_across
+		raw = raw[0:(self.tile_length + self._overlap),0:(self._width + 1)]
+		
+		self._cache(self._raw_tiles,k,raw)
+		return raw
+	
+	def _cache(self,tiles,k,tile):
+		# Store the tile, evicting the tile furthest from k if the cache
+		# is full.
+		
+		if (len(tiles) >= self._max_cached_tiles):
+			furthest = max(tiles.keys(),key=lambda kk: abs(kk-k))
+			del tiles[furthest]
+		
+		tiles[k] = tile
+
+# end class PhaseScreen
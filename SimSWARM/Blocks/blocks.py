@@ -19,6 +19,26 @@
 # 	AY: Added time offset to AnalogDigitalConverter 2015-02-18
 #	AY: Added TimeSteppingADC 2015-02-18
 #	AY: Added switch to FFT-blocks to allow bypassing limited precision calculations 2015-02-18
+#	AY: Added AnalogDelayPolynomial for time-varying delays 2026-10-18
+#	AY: Route source evaluation through Block._resolve for graph executors 2026-10-18
+#	AY: Added streaming mode (process, Chain.stream) and DigitalAccumulator 2026-10-18
+#	AY: Added block state access and pluggable runners for Parallel 2026-10-18
+#	AY: Replaced deep copy of blocks by clone method 2026-10-18
+#	AY: Added batched evaluation of homogeneous Parallel blocks 2026-10-18
+#	AY: Added plan method for dry-run planning of block networks 2026-10-18
+#	AY: Replaced recursive DFT by iterative radix-2 stages 2026-10-18
+#	AY: Added spec methods for declarative description of networks 2026-10-18
+#	AY: Added checkpoint argument to Chain.stream 2026-10-18
+#	AY: Added PrefetchingADC 2026-10-18
+#	AY: Added telemetry hook for block outputs 2026-10-18
+#	AY: Replaced exception-driven saturation by single-pass quantization 2026-10-18
+#	AY: Added packed output option to Requantizer 2026-10-18
+#	AY: Added DigitalPFB channelizer 2026-10-18
+#	AY: Plan ADC and Requantizer output at its storage size 2026-10-18
+#	AY: Key batches of DigitalPFB on the window instead of the coefficients 2026-10-18
+#	AY: Record telemetry of the parallel blocks in streaming mode 2026-10-18
+#	AY: Batched evaluation of parallel blocks in streaming mode 2026-10-18
+#	AY: Keep the planner separately for each thread 2026-10-18
 
 """
 Defines various fundamental signal processing blocks.
@@ -26,19 +46,53 @@ Defines various fundamental signal processing blocks.
 """
 
 import SimSWARM.Signal as sg
+import SimSWARM.Spec as sp
 import FixedWidthBinary as fw
 
 import copy
+import hashlib
 import numpy as np
+import Queue
+import sys
+import threading
 
 pi = np.pi
 
+def _sum_format(fmt_a,fmt_b):
+	# Return the WordFormat of the sum of two Words in the given formats,
+	# see FixedWidthBinary.Word.__add__.
+	
+	lsb_pot = int(np.log2(min(fmt_a.lsb_value,fmt_b.lsb_value)))
+	
+	return fw.WordFormat(max(fmt_a.width,fmt_b.width) + 1,lsb_pot)
+
+def _product_format(fmt_a,fmt_b):
+	# Return the WordFormat of the product of two Words in the given 
+	# formats, see FixedWidthBinary.Word.__mul__.
+	
+	lsb_pot = int(np.log2(fmt_a.lsb_value * fmt_b.lsb_value))
+	
+	return fw.WordFormat(fmt_a.width + fmt_b.width,lsb_pot)
+
 class Block(object):
 	"""
 	Baseclass for all signal processing blocks.
 	
 	"""
 	
+	# Executor that resolves block outputs while a graph is evaluated, 
+	# see SimSWARM.Execution.GraphExecutor and _get_executor, and planner
+	# that resolves the plans of source blocks while a network is 
+	# planned, see SimSWARM.Execution.Planner and _get_planner. These are
+	# kept separately for each thread, so that blocks evaluated 
+	# concurrently (e.g. by a ThreadPoolRunner) cannot replace each 
+	# other's executor or planner.
+	_local = threading.local()
+	
+	# Telemetry that records the output of blocks, see 
+	# SimSWARM.Execution.Telemetry. When None, nothing is recorded.
+	_telemetry = None
+	
 	@property
 	def source(self):
 		"""
@@ -92,8 +146,7 @@ class Block(object):
 		if (src == None):
 			raise RuntimeError("No input defined for this Block; cannot generate output.")
 		
-		if (isinstance(src,Block)):
-			src = src.output()
+		src = self._resolve(src)
 		
 		# src should always reduce to some instance of Signal
 		if (isinstance(src,sg.Signal)):
@@ -101,6 +154,284 @@ class Block(object):
 		
 		raise RuntimeError("Input is not reducable to Signal instance.")
 	
+	def plan(self):
+		"""
+		Return a description of the output of the block, without generating it.
+		
+		Notes:
+		The result is a SimSWARM.Signal.SignalPlan (or a list of them for
+		blocks that output a list of signals), derived from the plans of
+		the sources. No signal data is generated, and the state of the 
+		block is not changed. This implementation returns the plan of the
+		input, like output returns the input; derived classes that change
+		the kind, length, type or precision of the signal should override
+		it.
+		"""
+		
+		src = self.source
+		if (src == None):
+			raise RuntimeError("No input defined for this Block; cannot generate plan.")
+		
+		return self._resolve_plan(src)
+	
+	def _resolve_plan(self,src):
+		# Reduce src to a SignalPlan, through the plan method if it is a
+		# Block. A planner may intercept the request, like an executor for
+		# _resolve.
+		
+		if (isinstance(src,Block)):
+			planner = Block._get_planner()
+			if (planner != None):
+				return planner.resolve(src)
+			
+			return src.plan()
+		
+		return sg.SignalPlan.describe(src)
+	
+	def _digital_plan(self,src,name):
+		# Return the plan for a source that should be a digital signal.
+		
+		s_in = self._resolve_plan(src)
+		if ((not isinstance(s_in,sg.SignalPlan)) or (s_in.kind != 'digital')):
+			raise ValueError("Input to " + name + " should be a DigitalSignal instance.")
+		
+		return s_in
+	
+	def upstream_blocks(self):
+		"""
+		Return the list of blocks whose output is used by this block.
+		
+		Notes:
+		This implementation returns the attached source if it is a Block,
+		or the Block items in the source if it is a list. Derived classes
+		that obtain input in some other way should override this method.
+		"""
+		
+		src = self.source
+		if (isinstance(src,Block)):
+			return [src]
+		elif (isinstance(src,list)):
+			return [s for s in src if isinstance(s,Block)]
+		
+		return []
+	
+	def _resolve(self,src):
+		# Reduce src to its output if it is a Block, otherwise return src
+		# as-is. All blocks obtain the output of their sources through
+		# this method, so that an executor may intercept the request.
+		
+		if (not isinstance(src,Block)):
+			return src
+		
+		executor = Block._get_executor()
+		if (executor != None):
+			return executor.resolve(src)
+		
+		return Block._measure(src,src.output)
+	
+	@staticmethod
+	def _get_executor():
+		# Return the executor installed in the current thread. When None,
+		# the output of a source block is simply requested through its
+		# output method.
+		
+		return getattr(Block._local,'executor',None)
+	
+	@staticmethod
+	def _set_executor(executor):
+		# Install an executor in the current thread (None to remove it),
+		# and return the executor it replaces.
+		
+		previous = Block._get_executor()
+		Block._local.executor = executor
+		
+		return previous
+	
+	@staticmethod
+	def _get_planner():
+		# Return the planner installed in the current thread. When None,
+		# the plan of a source block is simply requested through its plan
+		# method.
+		
+		return getattr(Block._local,'planner',None)
+	
+	@staticmethod
+	def _set_planner(planner):
+		# Install a planner in the current thread (None to remove it), and
+		# return the planner it replaces.
+		
+		previous = Block._get_planner()
+		Block._local.planner = planner
+		
+		return previous
+	
+	@staticmethod
+	def _measure(b,call,*args):
+		# Call a method of block b that computes its output (e.g. output or
+		# process) and return the result. If telemetry is installed the 
+		# call is recorded.
+		
+		if (Block._telemetry != None):
+			return Block._telemetry.measure(b,call,*args)
+		
+		return call(*args)
+	
+	def _defers_upstream(self):
+		# Return True if this block requests the output of its upstream
+		# blocks itself, in a way that an executor cannot anticipate (e.g.
+		# more than once per output), so that they should not be evaluated
+		# in advance.
+		
+		return False
+	
+	def _chunkable(self):
+		"""
+		Return True if the output of this block can be computed in chunks of samples.
+		
+		Notes:
+		A block is chunkable if its output for a span of samples depends
+		only on its input for the same span, so that its output for 
+		consecutive chunks can be computed separately and concatenated,
+		see SimSWARM.Execution.ChunkedExecutor. This implementation 
+		returns False.
+		"""
+		
+		return False
+	
+	def process(self,frame):
+		"""
+		Process a single frame in streaming mode and return the resulting frame.
+		
+		Arguments:
+		frame -- SimSWARM.Signal.Frame instance.
+		
+		Notes:
+		This implementation temporarily uses the frame payload as source
+		for the block and returns the result of output as a new Frame
+		with the same timestamp. Blocks that carry state from one frame
+		to the next should override this method, and may return None if
+		no output is available yet.
+		"""
+		
+		out = self._output_from(frame.payload)
+		
+		return self._make_frame(frame.timestamp,out,frame.sample_rate)
+	
+	def _output_from(self,s_in):
+		# Return the output of this block for the given input signal, by
+		# temporarily using it as the source.
+		
+		src = self._source
+		self._source = s_in
+		try:
+			return self.output()
+		finally:
+			self._source = src
+	
+	def reset(self):
+		"""
+		Reset any state carried from one frame to the next in streaming mode.
+		
+		This implementation is empty, derived classes that carry state 
+		should override it.
+		"""
+		
+		pass
+	
+	def frames(self,n=None):
+		"""
+		Generate frames by repeatedly requesting the output of this block.
+		
+		Keyword arguments:
+		n -- The number of frames to generate, or None to generate frames
+		indefinitely (default is None).
+		
+		Notes:
+		This is only meaningful for blocks whose output advances in time
+		with each call, e.g. TimeSteppingADC. The timestamp of each frame
+		is the result of _frame_time just before output is requested.
+		"""
+		
+		count = 0
+		while ((n == None) or (count < n)):
+			timestamp = self._frame_time()
+			yield self._make_frame(timestamp,Block._measure(self,self.output),None)
+			count = count + 1
+	
+	def _frame_time(self):
+		# Return the time of the next output of this block if it produces
+		# a stream of frames, otherwise None.
+		
+		return None
+	
+	def get_state(self):
+		"""
+		Return the mutable state of this block as a dictionary.
+		
+		Notes:
+		The state comprises only those attributes that change as a result
+		of calling output or process, e.g. the time offset of a 
+		TimeSteppingADC. This implementation returns an empty dictionary,
+		derived classes that carry state should override it together with
+		set_state.
+		"""
+		
+		return dict()
+	
+	def set_state(self,state):
+		"""
+		Restore the mutable state of this block.
+		
+		Arguments:
+		state -- Dictionary as returned by get_state.
+		"""
+		
+		pass
+	
+	def _batch_key(self):
+		"""
+		Return the parameters that determine the output of this block for batched evaluation.
+		
+		Notes:
+		Blocks of the same type that return equal keys can be evaluated
+		together, see _batch_output and Parallel.batch_output. This 
+		implementation returns None, which means the block does not 
+		support batched evaluation.
+		"""
+		
+		return None
+	
+	def _batch_output(self,blocks,s_in):
+		"""
+		Return the output of the given blocks as a single batch.
+		
+		Arguments:
+		blocks -- List of blocks of the same type as this block and with
+		the same batch key, including this block.
+		s_in -- The inputs to the blocks, either a DigitalSignalBatch or
+		a list of Signal instances.
+		
+		Notes:
+		The result is returned as a SimSWARM.Signal.DigitalSignalBatch.
+		Derived classes that return a batch key should override this 
+		method.
+		"""
+		
+		raise NotImplementedError("Batched evaluation not implemented for " + type(self).__name__ + ".")
+	
+	def _make_frame(self,timestamp,out,rate):
+		# Wrap an output in a Frame, using the sample rate of the (first)
+		# output signal if it is a DigitalSignal and rate otherwise.
+		
+		first = out
+		if (isinstance(out,list) and (len(out) > 0)):
+			first = out[0]
+		
+		if (isinstance(first,sg.DigitalSignal)):
+			rate = first.sample_rate
+		
+		return sg.Frame(timestamp,rate,out)
+	
 	@classmethod
 	def copy(cls,b):
 		"""
@@ -110,10 +441,97 @@ class Block(object):
 		b -- Block instance to copy.
 		
 		Notes:
-		Current implementation uses a deep copy.
+		Current implementation uses the clone method of b, see clone.
+		"""
+		
+		return b.clone()
+	
+	def clone(self,memo=None):
+		"""
+		Construct and return a copy of this block and the network upstream of it.
+		
+		Keyword arguments:
+		memo -- Dictionary that maps the id of blocks already cloned to 
+		their clones, used to preserve shared blocks within the copied 
+		network (default is None).
+		
+		Notes:
+		Block parameters and source Signal instances are shared with the
+		original, since they are not modified by the blocks. Blocks in the
+		attached source are cloned, and the mutable state (see get_state)
+		of each block is copied. The result produces identical output to
+		a deep copy at a fraction of the construction time and memory.
+		"""
+		
+		if (memo == None):
+			memo = dict()
+		
+		if (id(self) in memo):
+			return memo[id(self)]
+		
+		b = copy.copy(self)
+		memo[id(self)] = b
+		b.set_state(copy.deepcopy(self.get_state()))
+		if ('_source' in self.__dict__):
+			b._source = self._clone_source(self._source,memo)
+		
+		return b
+	
+	def _clone_source(self,src,memo):
+		# Clone the Block items in a source, and share the rest.
+		
+		if (isinstance(src,Block)):
+			return src.clone(memo)
+		elif (isinstance(src,list)):
+			return [self._clone_source(s,memo) for s in src]
+		
+		return src
+	
+	def _spec_params(self):
+		"""
+		Return the constructor arguments of this block as a dictionary.
+		
+		Notes:
+		The dictionary maps keyword argument names of the constructor to
+		their values, and is used to describe the block in a declarative
+		spec (see SimSWARM.Spec). Values may be blocks, signals or other
+		objects that are themselves described in the spec. This
+		implementation returns an empty dictionary, derived classes of
+		which the constructor takes arguments should override it.
+		"""
+		
+		return dict()
+	
+	def _spec_links(self):
+		"""
+		Return the objects attached to this block as a dictionary.
+		
+		Notes:
+		Links are restored after all objects in a spec have been
+		constructed, see _restore_spec_links. This implementation returns
+		the attached source, if any.
+		"""
+		
+		if ('_source' in self.__dict__):
+			return {'source': self._source}
+		
+		return dict()
+	
+	def _restore_spec_links(self,links):
+		"""
+		Restore the objects attached to this block.
+		
+		Arguments:
+		links -- Dictionary as returned by _spec_links, of which the
+		values have been restored from a spec.
+		
+		Notes:
+		The source is restored as-is rather than through attach_source,
+		which may copy it.
 		"""
 		
-		return copy.deepcopy(b)
+		if ('source' in links):
+			self._source = links['source']
 
 # end class Block
 
@@ -131,6 +549,15 @@ class Parallel(Block):
 		
 		return self._blocks
 	
+	@property
+	def runner(self):
+		"""
+		Return the runner used to evaluate the parallel blocks, or None for serial evaluation.
+		
+		"""
+		
+		return self._runner
+	
 	def __init__(self,parblock,n=None):
 		"""
 		Construct a parallel signal processing path.
@@ -157,6 +584,30 @@ class Parallel(Block):
 			for ii in range(0,n):
 				self._blocks.append(Block.copy(parblock))
 		
+		self._source = None
+		self._runner = None
+	
+	def __getstate__(self):
+		# The runner is not copied or pickled along with the Parallel, it
+		# typically holds a pool of workers which cannot be duplicated.
+		
+		state = self.__dict__.copy()
+		state['_runner'] = None
+		
+		return state
+	
+	def set_runner(self,runner):
+		"""
+		Set the runner used to evaluate the parallel blocks.
+		
+		Arguments:
+		runner -- An object with an evaluate(parallel) method that returns
+		the list of outputs of the parallel blocks, such as 
+		SimSWARM.Execution.ProcessPoolRunner, or None to evaluate the
+		blocks serially.
+		"""
+		
+		self._runner = runner
 
 	def attach_source(self,src):
 		"""
@@ -174,12 +625,16 @@ class Parallel(Block):
 		any other single object instance, src is copied and attached
 		separately for each parallel block.
 		
+		A source Parallel is also kept as the source of this Parallel, 
+		so that its output can be passed on as a batch, see batch_output.
 		"""
 		
+		self._source = None
 		if (isinstance(src,list)):
 			for ii in range(0,len(src)):
 				self.blocks[ii].attach_source(src[ii])
 		elif (isinstance(src,Parallel)):
+			self._source = src
 			src = src.blocks
 			for ii in range(0,len(src)):
 				self.blocks[ii].attach_source(src[ii])
@@ -188,7 +643,7 @@ class Parallel(Block):
 				iblock.attach_source(Block.copy(src))
 		elif (isinstance(src,sg.Signal)):
 			for iblock in self.blocks:
-				iblock.attach_source(sg.Signal.copy(src))
+				iblock.attach_source(src.clone())
 		else:
 			raise TypeError("Invalid type for source to attach to Parallel.")
 	
@@ -198,101 +653,549 @@ class Parallel(Block):
 		
 		Notes:
 		The returned value is a list containing the output method result
-		of each of the parallel blocks individually.
+		of each of the parallel blocks individually. If a runner is set,
+		the blocks are evaluated by the runner. Otherwise, if the blocks 
+		support batched evaluation (see is_batchable), the outputs of all
+		blocks are computed together and then split into separate signals.
 		"""
 		
+		if (self.runner != None):
+			return self.runner.evaluate(self)
+		
+		if (self.is_batchable()):
+			return self._batch_evaluate(True)
+		
 		out = list()
 		for iblock in self.blocks:
-			out.append(iblock.output())
+			out.append(self._resolve(iblock))
 		
 		return out
+	
+	def _batch_source(self):
+		# Return the source Parallel if its batch output can be used as
+		# input for batched evaluation, otherwise None.
 		
-# end class Parallel
-
-
-class Chain(Block):
-	"""
-	Baseclass for a serial execution of signal processing blocks.
+		up = self.source
+		if (not isinstance(up,Parallel) or (up.runner != None) or not up.is_batchable()):
+			return None
+		
+		if (len(up.blocks) != len(self.blocks)):
+			return None
+		
+		for ii in range(0,len(self.blocks)):
+			if (self.blocks[ii].source is not up.blocks[ii]):
+				return None
+		
+		return up
 	
-	"""
+	def _batch_blocks(self):
+		# Return all blocks of which the output is computed by batched 
+		# evaluation of this Parallel, including those of source Parallels
+		# evaluated as a batch.
+		
+		blocks = list(self.blocks)
+		up = self._batch_source()
+		if (up != None):
+			blocks.extend(up._batch_blocks())
+		
+		return blocks
 	
-	@property
-	def source(self):
+	def _defers_upstream(self):
+		# A runner requests the output of the parallel blocks itself, 
+		# possibly in other processes.
+		
+		return self.runner != None
+	
+	def plan(self):
 		"""
-		Return the input source for this chain.
+		Return a description of the output signals for the parallel paths.
 		
-		The input source in this case is that of the first block in 
-		the chain.
+		Notes:
+		The result is a list containing the plan of each parallel block.
 		"""
 		
-		return self.blocks[0].source
+		return [self._resolve_plan(iblock) for iblock in self.blocks]
 	
-	@property
-	def blocks(self):
+	def is_batchable(self):
 		"""
-		Return a list of blocks that comprise this signal chain.
+		Return True if the parallel blocks can be evaluated as a batch.
+		
+		Notes:
+		This is the case if all blocks are of the same type, support 
+		batched evaluation and have identical parameters (as far as these
+		affect batched evaluation, e.g. DigitalGain blocks may differ in
+		gain value but not in gain precision).
 		"""
 		
-		return self._blocks
+		if (len(self.blocks) == 0):
+			return False
+		
+		first = self.blocks[0]
+		key = first._batch_key()
+		if (key == None):
+			return False
+		
+		for iblock in self.blocks:
+			if ((type(iblock) != type(first)) or (iblock._batch_key() != key)):
+				return False
+		
+		return True
 	
-	def __init__(self):
-		"""
-		Construct a signal processing chain.
+	def batch_output(self):
 		"""
+		Return the output signals for the parallel paths as a single batch.
 		
-		self._blocks = list()
+		Notes:
+		The result is a SimSWARM.Signal.DigitalSignalBatch that holds the
+		output of all blocks as a single array, computed by one call to 
+		the batched implementation of the block type. If the source of 
+		this Parallel is another batchable Parallel, its batch output is
+		used directly as input. A RuntimeError is raised if the blocks 
+		cannot be evaluated as a batch.
+		"""
+		
+		if (not self.is_batchable()):
+			raise RuntimeError("Parallel blocks cannot be evaluated as a batch.")
+		
+		return self._batch_evaluate(False)
+	
+	def _batch_evaluate(self,split):
+		# Evaluate the parallel blocks as a batch, and return the result
+		# as a list of signals if split is True, or as a batch otherwise.
+		
+		executor = Block._get_executor()
+		if ((executor != None) and any([executor.has_output(iblock) for iblock in self.blocks])):
+			# some of the blocks were already evaluated separately, reuse
+			# those outputs rather than evaluating them again
+			out = [self._resolve(iblock) for iblock in self.blocks]
+			if (split):
+				return out
+			
+			return sg.DigitalSignalBatch.stack(out)
+		
+		s_in = self._batch_input()
+		if (isinstance(s_in,list) and any([isinstance(s,sg.DigitalSignal) for s in s_in])):
+			# digital inputs that cannot be stacked, evaluate separately
+			out = [self.blocks[ii]._output_from(s_in[ii]) for ii in range(0,len(self.blocks))]
+			batch = None
+		else:
+			first = self.blocks[0]
+			batch = Block._measure(first,first._batch_output,self.blocks,s_in)
+			out = None
+		
+		if (split or (executor != None)):
+			if (out == None):
+				out = batch.split()
+			
+			if (executor != None):
+				for ii in range(0,len(self.blocks)):
+					executor.provide(self.blocks[ii],out[ii])
+		
+		if (split):
+			return out
+		
+		if (batch == None):
+			batch = sg.DigitalSignalBatch.stack(out)
+		
+		return batch
 	
-	def attach_source(self,src):
+	def _batch_input(self):
+		# Return the input for batched evaluation, which is the batch 
+		# output of the source Parallel if possible, and otherwise the
+		# outputs of the sources of the blocks stacked into a batch if
+		# they are digital, or a list of signals if they are not.
+		
+		up = self._batch_source()
+		if (up != None):
+			return up.batch_output()
+		
+		s_in = [self._resolve(iblock.source) for iblock in self.blocks]
+		if (sg.DigitalSignalBatch.stackable(s_in)):
+			return sg.DigitalSignalBatch.stack(s_in)
+		
+		return s_in
+	
+	def upstream_blocks(self):
 		"""
-		Attach source for the first block in this chain.
+		Return the list of blocks whose output is used by this block.
 		
-		Arguments:
-		src -- A valid block input source to attach to first block in 
-		chain.
+		Notes:
+		The output of a Parallel is the output of each of its blocks.
 		"""
 		
-		self.blocks[0].attach_source(src)
+		return list(self.blocks)
 	
-	def add_block(self,b):
+	def clone(self,memo=None):
 		"""
-		Add the block to the signal chain.
+		Construct and return a copy of this Parallel and the network upstream of it.
 		
-		Arguments:
-		b -- Block instance to be appended (at the end) of the signal 
-		chain.
+		Notes:
+		Each of the parallel blocks is cloned, see Block.clone. The runner
+		is shared with the original.
 		"""
 		
-		if (not isinstance(b,Block)):
-			raise ValueError("Only Block or Chain instances can be added to a Chain.")
+		if (memo == None):
+			memo = dict()
 		
-		#~ if (isinstance(b,Chain)):
-			#~ for link in b:
-				#~ self.add_block(l)
-		#~ else:
-			#~ self._blocks.append(b)
+		if (id(self) in memo):
+			return memo[id(self)]
 		
-		# set current last entry as the input to this link
-		if (len(self.blocks) > 0):
-			b.attach_source(self.blocks[-1])
-			
-		self._blocks.append(b)
+		b = super(Parallel,self).clone(memo)
+		b._blocks = [iblock.clone(memo) for iblock in self.blocks]
+		b._runner = self.runner
 		
+		return b
 	
-	def output(self):
+	def process(self,frame):
 		"""
-		Return output signal for the chain.
+		Process a single frame in streaming mode and return the resulting frame.
 		
-		"""
+		Arguments:
+		frame -- SimSWARM.Signal.Frame instance.
 		
-		#~ s_out = s_in
-		#~ for b in self.blocks():
-			#~ s_out = b.output(s_out)
-		#~ 
-		#~ return s_out
+		Notes:
+		If the frame payload is a list, each item is processed by the
+		corresponding parallel block, otherwise the same payload is
+		processed by each block. The payload of the returned frame is
+		a list, or None is returned if any of the blocks returns None.
 		
-		# call to output of last link in chain should recursively
+		Blocks that carry no state from one frame to the next are 
+		processed as a batch if they support batched evaluation (see 
+		is_batchable), as in output.
+		"""
+		
+		payload = frame.payload
+		if (isinstance(payload,list)):
+			items = payload
+		else:
+			items = [payload] * len(self.blocks)
+		
+		out = self._batch_process(items)
+		if (out != None):
+			return self._make_frame(frame.timestamp,out,frame.sample_rate)
+		
+		results = list()
+		for ii in range(0,len(self.blocks)):
+			if (isinstance(payload,list)):
+				item = sg.Frame(frame.timestamp,frame.sample_rate,payload[ii])
+			else:
+				item = frame
+			
+			# every block has to see the frame, even if an earlier one
+			# produced no output
+			iblock = self.blocks[ii]
+			results.append(Block._measure(iblock,iblock.process,item))
+		
+		if (None in results):
+			return None
+		
+		return self._make_frame(results[0].timestamp,[r.payload for r in results],frame.sample_rate)
+	
+	def _batch_process(self,items):
+		# Return the output of the parallel blocks for the given inputs
+		# computed as a batch, or None if the blocks carry state in 
+		# streaming mode (i.e. override Block.process) or cannot be 
+		# evaluated as a batch.
+		
+		if ((len(self.blocks) == 0) or (type(self.blocks[0]).process.im_func is not Block.process.im_func)):
+			return None
+		
+		if (not self.is_batchable()):
+			return None
+		
+		if (sg.DigitalSignalBatch.stackable(items)):
+			s_in = sg.DigitalSignalBatch.stack(items)
+		elif (any([isinstance(s,sg.DigitalSignal) for s in items])):
+			return None
+		else:
+			s_in = items
+		
+		first = self.blocks[0]
+		
+		return Block._measure(first,first._batch_output,self.blocks,s_in).split()
+	
+	def reset(self):
+		"""
+		Reset the streaming state of each of the parallel blocks.
+		
+		"""
+		
+		for iblock in self.blocks:
+			iblock.reset()
+	
+	def _frame_time(self):
+		# The parallel paths are assumed to advance in lock-step.
+		
+		return self.blocks[0]._frame_time()
+	
+	def _spec_params(self):
+		"""
+		Return the list of parallel blocks as constructor argument.
+		
+		"""
+		
+		return {'parblock': self.blocks}
+	
+	def _chunkable(self):
+		"""
+		Return True, the parallel paths are independent.
+		
+		"""
+		
+		return True
+		
+# end class Parallel
+
+
+class Chain(Block):
+	"""
+	Baseclass for a serial execution of signal processing blocks.
+	
+	"""
+	
+	@property
+	def source(self):
+		"""
+		Return the input source for this chain.
+		
+		The input source in this case is that of the first block in 
+		the chain.
+		"""
+		
+		return self.blocks[0].source
+	
+	@property
+	def blocks(self):
+		"""
+		Return a list of blocks that comprise this signal chain.
+		"""
+		
+		return self._blocks
+	
+	def __init__(self):
+		"""
+		Construct a signal processing chain.
+		"""
+		
+		self._blocks = list()
+	
+	def attach_source(self,src):
+		"""
+		Attach source for the first block in this chain.
+		
+		Arguments:
+		src -- A valid block input source to attach to first block in 
+		chain.
+		"""
+		
+		self.blocks[0].attach_source(src)
+	
+	def add_block(self,b):
+		"""
+		Add the block to the signal chain.
+		
+		Arguments:
+		b -- Block instance to be appended (at the end) of the signal 
+		chain.
+		"""
+		
+		if (not isinstance(b,Block)):
+			raise ValueError("Only Block or Chain instances can be added to a Chain.")
+		
+		#~ if (isinstance(b,Chain)):
+			#~ for link in b:
+				#~ self.add_block(l)
+		#~ else:
+			#~ self._blocks.append(b)
+		
+		# set current last entry as the input to this link
+		if (len(self.blocks) > 0):
+			b.attach_source(self.blocks[-1])
+			
+		self._blocks.append(b)
+		
+	
+	def output(self):
+		"""
+		Return output signal for the chain.
+		
+		"""
+		
+		#~ s_out = s_in
+		#~ for b in self.blocks():
+			#~ s_out = b.output(s_out)
+		#~ 
+		#~ return s_out
+		
+		# call to output of last link in chain should recursively
 		# invoke output of all links, down to the first
-		return self.blocks[-1].output()
+		return self._resolve(self.blocks[-1])
+	
+	def plan(self):
+		"""
+		Return a description of the output of the last block in the chain.
+		
+		"""
+		
+		return self._resolve_plan(self.blocks[-1])
+	
+	def upstream_blocks(self):
+		"""
+		Return the list of blocks whose output is used by this block.
+		
+		Notes:
+		The output of a Chain is the output of the last block in the
+		chain.
+		"""
+		
+		return [self.blocks[-1]]
+	
+	def clone(self,memo=None):
+		"""
+		Construct and return a copy of this Chain and the network upstream of it.
+		
+		Notes:
+		The blocks are cloned in order, so that each clone is attached to
+		the clone of the preceding block, see Block.clone.
+		"""
+		
+		if (memo == None):
+			memo = dict()
+		
+		if (id(self) in memo):
+			return memo[id(self)]
+		
+		b = super(Chain,self).clone(memo)
+		b._blocks = [iblock.clone(memo) for iblock in self.blocks]
+		
+		return b
+	
+	def process(self,frame):
+		"""
+		Process a single frame in streaming mode and return the resulting frame.
+		
+		Arguments:
+		frame -- SimSWARM.Signal.Frame instance.
+		
+		Notes:
+		The frame is pushed through each of the blocks in the chain in 
+		order. If any block returns None, None is returned.
+		"""
+		
+		for b in self.blocks:
+			frame = Block._measure(b,b.process,frame)
+			if (frame == None):
+				return None
+		
+		return frame
+	
+	def reset(self):
+		"""
+		Reset the streaming state of each of the blocks in the chain.
+		
+		"""
+		
+		for b in self.blocks:
+			b.reset()
+	
+	def stream(self,frames=None,n=None,reset=True,checkpoint=None):
+		"""
+		Generate output frames by pushing a stream of frames through the chain.
+		
+		Keyword arguments:
+		frames -- Iterable of SimSWARM.Signal.Frame instances to push
+		through all blocks of the chain. If None, frames are generated by
+		the last block in the chain that produces a stream of frames, 
+		e.g. a TimeSteppingADC (or Parallel of such), and pushed through
+		the blocks that follow it (default is None).
+		n -- The number of frames to generate if frames is None, or None
+		to stream indefinitely (default is None).
+		reset -- If True, the streaming state of the blocks that frames
+		are pushed through is reset before streaming (default is True).
+		checkpoint -- Object with an update(chain) method, such as 
+		SimSWARM.Execution.Checkpoint, which is called after each input
+		frame has been processed by all blocks and the resulting output
+		frame (if any) has been handled by the caller (default is None).
+		
+		Notes:
+		This method returns a generator, so that only one frame is held
+		in memory at a time (apart from state carried by the blocks). 
+		Blocks that return None for a frame, e.g. DigitalAccumulator while
+		accumulating, produce no output frame.
+		"""
+		
+		frames,blocks = self._stream_source(frames,n)
+		
+		if (reset):
+			for b in blocks:
+				b.reset()
+		
+		for frame in frames:
+			for b in blocks:
+				frame = Block._measure(b,b.process,frame)
+				if (frame == None):
+					break
+			
+			if (Block._telemetry != None):
+				Block._telemetry.frame_done()
+			
+			if (frame != None):
+				yield frame
+			
+			if (checkpoint != None):
+				checkpoint.update(self)
+	
+	def _stream_source(self,frames,n):
+		# Return the frames to push through the chain, and the blocks to
+		# push them through, see stream.
+		
+		if (frames != None):
+			return frames,self.blocks
+		
+		idx = None
+		for ii in range(0,len(self.blocks)):
+			if (self.blocks[ii]._frame_time() != None):
+				idx = ii
+		
+		if (idx == None):
+			raise RuntimeError("No block in Chain produces a stream of frames.")
+		
+		if ((n != None) and (Block._telemetry != None)):
+			Block._telemetry.expect(n)
+		
+		return self.blocks[idx].frames(n),self.blocks[(idx+1):]
+	
+	def _frame_time(self):
+		# The chain produces frames if its last block does.
+		
+		return self.blocks[-1]._frame_time()
+	
+	def _spec_links(self):
+		"""
+		Return the blocks in this chain.
+		
+		"""
+		
+		return {'blocks': self.blocks}
+	
+	def _restore_spec_links(self,links):
+		"""
+		Restore the blocks in this chain.
+		
+		Notes:
+		The blocks are restored as-is rather than through add_block, 
+		since the links between them are restored separately.
+		"""
+		
+		self._blocks = links['blocks']
+	
+	def _chunkable(self):
+		"""
+		Return True, the output is that of the last block.
+		
+		"""
+		
+		return True
 
 # end class Chain
 
@@ -368,8 +1271,7 @@ class AnalogDelay(Block):
 		"""
 		s_in = self.source
 		
-		if (isinstance(s_in,Block)):
-			s_in = s_in.output()
+		s_in = self._resolve(s_in)
 		
 		if (not isinstance(s_in, sg.AnalogSignal)):
 			raise ValueError("AnalogDelay can only operate on instances of AnalogSignal or derivative classes.")
@@ -388,9 +1290,81 @@ class AnalogDelay(Block):
 		s_out.apply_delay(self.delay)
 		
 		return s_out
+	
+	def _spec_params(self):
+		"""
+		Return the delay as constructor argument.
+		
+		"""
+		
+		return {'d': self.delay}
 
 # end class AnalogDelay
 
+class AnalogDelayPolynomial(Block):
+	"""
+	Define a time-varying delay along the propagation path of an analog signal.
+	
+	"""
+	
+	@property
+	def coefficients(self):
+		"""
+		Return the delay polynomial coefficients applied by the block.
+		
+		"""
+		
+		return self._coefficients
+	
+	def __init__(self,coeffs):
+		"""
+		Construct an analog delay polynomial block.
+		
+		Arguments:
+		coeffs -- Sequence of delay polynomial coefficients (d0,d1,d2,...)
+		in order of ascending power, such that the delay at time t is
+		d0 + d1*t + d2*t**2 + ... seconds.
+		
+		Notes:
+		See SimSWARM.Signal.TransformedAnalogSignal.apply_delay_polynomial
+		for additional information.
+		"""
+		
+		self._coefficients = tuple(coeffs)
+	
+	def output(self):
+		"""
+		Return a transformed analog signal with the corresponding delay.
+		
+		"""
+		s_in = self.source
+		
+		s_in = self._resolve(s_in)
+		
+		if (not isinstance(s_in, sg.AnalogSignal)):
+			raise ValueError("AnalogDelayPolynomial can only operate on instances of AnalogSignal or derivative classes.")
+		
+		# Create output signal, which will be TransformedAnalogSignal instance.
+		if (not isinstance(s_in, sg.TransformedAnalogSignal)):
+			s_out = sg.TransformedAnalogSignal(s_in)
+		else:
+			s_out = sg.Signal.copy(s_in)
+		
+		# Apply the effect to the output signal
+		s_out.apply_delay_polynomial(self.coefficients)
+		
+		return s_out
+	
+	def _spec_params(self):
+		"""
+		Return the delay polynomial coefficients as constructor argument.
+		
+		"""
+		
+		return {'coeffs': self.coefficients}
+
+# end class AnalogDelayPolynomial
+
 class AnalogGain(Block):
 	"""
 	Define a gain along the propagation path of an analog signal
@@ -423,8 +1397,7 @@ class AnalogGain(Block):
 		"""
 		s_in = self.source
 		
-		if (isinstance(s_in,Block)):
-			s_in = s_in.output()
+		s_in = self._resolve(s_in)
 		
 		if (not isinstance(s_in, sg.AnalogSignal)):
 			raise ValueError("AnalogGain can only operate on instances of AnalogSignal or derivative classes.")
@@ -443,6 +1416,14 @@ class AnalogGain(Block):
 		s_out.apply_gain(self.gain)
 		
 		return s_out
+	
+	def _spec_params(self):
+		"""
+		Return the gain as constructor argument.
+		
+		"""
+		
+		return {'g': self.gain}
 
 # end class AnalogGain
 
@@ -482,8 +1463,7 @@ class AnalogFrequencyGainSlope(Block):
 		"""
 		s_in = self.source
 		
-		if (isinstance(s_in,Block)):
-			s_in = s_in.output()
+		s_in = self._resolve(s_in)
 		
 		if (not isinstance(s_in, sg.AnalogSignal)):
 			raise ValueError("AnalogFrequencyGainSlope can only operate on instances of AnalogSignal or derivative classes.")
@@ -502,6 +1482,14 @@ class AnalogFrequencyGainSlope(Block):
 		s_out.apply_frequency_magnitude_slope(self.slope)
 		
 		return s_out
+	
+	def _spec_params(self):
+		"""
+		Return the slope as constructor argument.
+		
+		"""
+		
+		return {'m': self.slope}
 
 # end class AnalogSpectrumSlope
 
@@ -541,8 +1529,7 @@ class AnalogFrequencyPhaseSlope(Block):
 		"""
 		s_in = self.source
 		
-		if (isinstance(s_in,Block)):
-			s_in = s_in.output()
+		s_in = self._resolve(s_in)
 		
 		if (not isinstance(s_in, sg.AnalogSignal)):
 			raise ValueError("AnalogFrequencyPhaseSlope can only operate on instances of AnalogSignal or derivative classes.")
@@ -561,6 +1548,14 @@ class AnalogFrequencyPhaseSlope(Block):
 		s_out.apply_frequency_phase_slope(self.slope)
 		
 		return s_out
+	
+	def _spec_params(self):
+		"""
+		Return the slope as constructor argument.
+		
+		"""
+		
+		return {'p': self.slope}
 
 # end class AnalogFrequencyPhaseSlope
 
@@ -603,8 +1598,7 @@ class AnalogCombiner(Block):
 		
 		s_list_in = list()
 		for src in self.source:
-			if (isinstance(src,Block)):
-				src = src.output()
+			src = self._resolve(src)
 			
 			if (not isinstance(src,sg.AnalogSignal)):
 				raise RuntimeError("AnalogCombiner can only operate on AnalogSignal inputs.")
@@ -612,7 +1606,20 @@ class AnalogCombiner(Block):
 			s_list_in.append(src)
 		
 		return sg.CompoundAnalogSignal(s_list_in)
-
+	
+	def plan(self):
+		"""
+		Return a description of the combined analog signal.
+		
+		"""
+		
+		for src in self.source:
+			s_in = self._resolve_plan(src)
+			if ((not isinstance(s_in,sg.SignalPlan)) or (s_in.kind != 'analog')):
+				raise RuntimeError("AnalogCombiner can only operate on AnalogSignal inputs.")
+		
+		return sg.SignalPlan('analog')
+
 # end class AnalogCombiner
 
 ### End of analog blocks
@@ -684,18 +1691,16 @@ class AnalogDigitalConverter(Block):
 		Return the digital output for the given analog input.
 		
 		Notes:
-		The amplitude discretization is hanled by the FixedWidthNum 
-		constructor method. That method raises an exception if values
-		passed to it fall outside the range of values representable in 
-		the given FixedWidthType format. This implementation catches
-		the exception and then applies a hard limit so that all values
-		are within the representable range.
+		The amplitude discretization is handled by 
+		FixedWidthBinary.Word.saturate, which applies a hard limit so that
+		all values are within the range representable in the given 
+		FixedWidthType format. The samples are stored in the narrowest
+		integer type that holds the width of the format.
 		
 		"""
 		s_in = self.source
 		
-		if (isinstance(s_in,Block)):
-			s_in = s_in.output()
+		s_in = self._resolve(s_in)
 		
 		if (not isinstance(s_in,sg.AnalogSignal)):
 			raise ValueError("Input to AnalogDigitalConverter should be an AnalogSignal instance.")
@@ -705,20 +1710,79 @@ class AnalogDigitalConverter(Block):
 		# classes, e.g. TimeSteppingADC.
 		svec = s_in.sample(self.sample_rate,self.number_of_samples,self.time_offset)
 		
-		# Apply amplitude discretization. The constructor of a FixedWithNumber
-		# may raise an error if the given values fall outside the range 
-		# of values representable in the given format. In that case the 
-		# ADC simply saturates to the nearest bound.
-		try:
-			svec_digital = fw.Word(svec,self.precision).value
-		except fw.OverflowError:
-			max_val = self.precision.maximum_value
-			min_val = self.precision.minimum_value
-			svec[svec > max_val] = max_val
-			svec[svec < min_val] = min_val
-			svec_digital = fw.Word(svec,self.precision).value
-		
-		return sg.DigitalSignal(self.sample_rate,self.precision,svec_digital)
+		word = self._quantize(svec)
+		
+		return sg.DigitalSignal.from_word(self.sample_rate,word)
+	
+	def plan(self):
+		"""
+		Return a description of the digital output, without sampling the input.
+		
+		"""
+		
+		s_in = self._resolve_plan(self.source)
+		if ((not isinstance(s_in,sg.SignalPlan)) or (s_in.kind != 'analog')):
+			raise ValueError("Input to AnalogDigitalConverter should be an AnalogSignal instance.")
+		
+		return sg.SignalPlan('digital',self.sample_rate,self.number_of_samples,False,self.precision,saturated=True)
+	
+	def _quantize(self,svec):
+		# Apply amplitude discretization, and return the samples as a Word. 
+		# Values that fall outside the range of values representable in 
+		# the given format saturate to the nearest bound.
+		
+		return fw.Word.saturate(svec,self.precision)
+	
+	def _batch_key(self):
+		"""
+		Return the sampling parameters and precision of this ADC.
+		
+		"""
+		
+		return (self.sample_rate,self.number_of_samples,self.time_offset,self.precision.width,self.precision.lsb_value)
+	
+	def _batch_output(self,blocks,s_in):
+		"""
+		Return the digital output for the given analog inputs as a single batch.
+		
+		Arguments:
+		blocks -- List of AnalogDigitalConverter instances with the same
+		parameters as this one.
+		s_in -- List of AnalogSignal instances, one for each block.
+		
+		Notes:
+		Each input is sampled separately, and the samples of all inputs
+		are then quantized together.
+		"""
+		
+		if (not isinstance(s_in,list) or not all([isinstance(s,sg.AnalogSignal) for s in s_in])):
+			raise ValueError("Input to AnalogDigitalConverter should be an AnalogSignal instance.")
+		
+		svec = np.array([s.sample(self.sample_rate,self.number_of_samples,self.time_offset) for s in s_in])
+		
+		word = self._quantize(svec)
+		
+		return sg.DigitalSignalBatch.from_word(self.sample_rate,word)
+	
+	def _spec_params(self):
+		"""
+		Return the sampling characteristics as constructor arguments.
+		
+		"""
+		
+		return {'rate': self.sample_rate, 'length': self.number_of_samples, 'precision': self.precision}
+	
+	def _chunkable(self):
+		"""
+		Return True, chunks are sampled at the corresponding time offsets.
+		
+		Notes:
+		Analog signals with transformations applied in the frequency domain
+		(e.g. fractional delays) are sampled separately for each chunk, in
+		the same way as consecutive outputs of a TimeSteppingADC.
+		"""
+		
+		return True
 
 class TimeSteppingADC(AnalogDigitalConverter):
 	"""
@@ -740,6 +1804,45 @@ class TimeSteppingADC(AnalogDigitalConverter):
 		
 		self._time_offset = self.time_offset + time_step
 	
+	def _frame_time(self):
+		# Each output is a new frame starting at the current time offset.
+		
+		return self.time_offset
+	
+	def get_state(self):
+		"""
+		Return the time offset as the mutable state of this ADC.
+		
+		"""
+		
+		return {'time_offset': self.time_offset}
+	
+	def set_state(self,state):
+		"""
+		Restore the time offset of this ADC.
+		
+		Arguments:
+		state -- Dictionary as returned by get_state.
+		"""
+		
+		self._time_offset = state['time_offset']
+	
+	def _batch_output(self,blocks,s_in):
+		"""
+		Return the digital output for the given analog inputs as a single batch.
+		
+		Notes:
+		The time offset of each of the blocks is incremented as for output.
+		"""
+		
+		signal_out = super(TimeSteppingADC,self)._batch_output(blocks,s_in)
+		
+		sample_time = self.number_of_samples / self.sample_rate
+		for b in blocks:
+			b.step_in_time(sample_time)
+		
+		return signal_out
+	
 	def output(self):
 		"""
 		Return the digital output for the given analog input.
@@ -762,6 +1865,225 @@ class TimeSteppingADC(AnalogDigitalConverter):
 
 # end class TimeSteppedADC
 
+class PrefetchingADC(TimeSteppingADC):
+	"""
+	TimeSteppingADC that samples the following outputs in a background thread.
+	
+	While the output for one time step is processed downstream (e.g. by
+	FFTs), a background thread samples and quantizes the analog input 
+	for the next time steps into a queue of at most depth outputs. Each
+	call to output takes the next output from the queue without copying
+	it, so that the time spent sampling overlaps with the rest of the
+	simulation. The output is identical to that of a TimeSteppingADC 
+	with the same parameters:
+		
+		adc = PrefetchingADC(rate,length,precision,depth=4)
+		for frame in chain.stream(n=1000):
+			...
+	
+	Notes:
+	The background thread samples the analog signal obtained from the 
+	source in the first call to output, at the time offsets that follow
+	from stepping as in output. Whenever the time offset, the sampling
+	characteristics or the analog input differ from those prefetched, 
+	the prefetched outputs are discarded and sampling starts again from
+	the current time offset. The analog input is compared by identity,
+	and only by its description (see SimSWARM.Spec.digest) if the source
+	returns a different signal instance. Copies of the block do not 
+	share the background thread, and call close to stop it.
+	"""
+	
+	@property
+	def depth(self):
+		"""
+		Return the number of outputs sampled in advance.
+		
+		"""
+		
+		return self._depth
+	
+	def __init__(self,rate,length,precision,depth=2):
+		"""
+		Construct a prefetching ADC.
+		
+		Arguments:
+		rate -- Sampling rate in samples per second
+		length -- The number of samples to acquire
+		precision -- Defines the amplitude discretization as a FixedWidthType
+		instance.
+		
+		Keyword arguments:
+		depth -- The number of outputs sampled in advance (default is 2).
+		
+		"""
+		
+		if (depth < 1):
+			raise ValueError("PrefetchingADC should sample at least one output in advance.")
+		
+		super(PrefetchingADC,self).__init__(rate,length,precision)
+		
+		self._depth = depth
+		self._prefetcher = None
+	
+	def __getstate__(self):
+		# The background thread is not copied or pickled, copies start
+		# their own when their output is requested.
+		
+		state = self.__dict__.copy()
+		state['_prefetcher'] = None
+		
+		return state
+	
+	def __del__(self):
+		
+		self.close()
+	
+	def close(self):
+		"""
+		Stop the background thread and discard the prefetched outputs.
+		
+		"""
+		
+		if (self.__dict__.get('_prefetcher') != None):
+			self._prefetcher.stop()
+			self._prefetcher = None
+	
+	def output(self):
+		"""
+		Return the digital output for the given analog input.
+		
+		Notes:
+		The output is taken from the prefetched buffers, and the time 
+		offset is incremented as for TimeSteppingADC.
+		"""
+		
+		s_in = self._resolve(self.source)
+		if (not isinstance(s_in,sg.AnalogSignal)):
+			raise ValueError("Input to AnalogDigitalConverter should be an AnalogSignal instance.")
+		
+		params = (self.sample_rate,self.number_of_samples,self.precision.width,self.precision.lsb_value)
+		if ((self._prefetcher == None) or not self._prefetcher.serves(s_in,params,self.time_offset)):
+			self.close()
+			sample_time = self.number_of_samples / self.sample_rate
+			self._prefetcher = _ADCPrefetcher(self,s_in,params,sample_time)
+		
+		signal_out = sg.DigitalSignal.from_word(self.sample_rate,fw.Word.from_scaled_value(self._prefetcher.next(),self.precision))
+		
+		# do time-stepping
+		sample_time = self.number_of_samples / self.sample_rate
+		self.step_in_time(sample_time)
+		
+		return signal_out
+	
+	def _batch_key(self):
+		"""
+		Return None, each ADC samples in its own background thread.
+		
+		"""
+		
+		return None
+	
+	def _spec_params(self):
+		"""
+		Return the sampling characteristics and depth as constructor arguments.
+		
+		"""
+		
+		params = super(PrefetchingADC,self)._spec_params()
+		params['depth'] = self.depth
+		
+		return params
+
+# end class PrefetchingADC
+
+class _ADCPrefetcher(object):
+	# Samples consecutive outputs of an ADC in a background thread. The
+	# scaled values of each output are a new array, which is passed from
+	# the thread to the ADC through the ready queue, and used without 
+	# copying. The queue holds at most depth outputs.
+	
+	# Interval in seconds at which the waiting thread checks whether it 
+	# was stopped.
+	_poll_interval = 0.1
+	
+	def __init__(self,adc,s_in,params,sample_time):
+		self._params = params
+		self._s_in = s_in
+		self._digest = None
+		self._time_offset = adc.time_offset
+		self._ready = Queue.Queue(adc.depth)
+		self._stop = threading.Event()
+		
+		# the thread quantizes through a plain ADC with the same sampling
+		# characteristics, so that it does not keep the ADC itself alive
+		sampler = AnalogDigitalConverter(adc.sample_rate,adc.number_of_samples,adc.precision)
+		self._thread = threading.Thread(target=self._run,args=(sampler,s_in,sample_time))
+		self._thread.daemon = True
+		self._thread.start()
+	
+	def serves(self,s_in,params,time_offset):
+		# Return True if the next prefetched output is the one requested.
+		# The descriptions of the analog inputs are only compared if s_in
+		# is not the signal being sampled, and that of the signal being
+		# sampled is computed only once.
+		
+		if ((params != self._params) or (time_offset != self._time_offset) or self._stop.is_set()):
+			return False
+		
+		if (s_in is self._s_in):
+			return True
+		
+		if (self._digest == None):
+			self._digest = sp.digest(self._s_in)
+		
+		return sp.digest(s_in) == self._digest
+	
+	def next(self):
+		# Wait for the next prefetched output, and return its scaled values.
+		
+		scaled_value,time_offset,exc_info = self._ready.get()
+		if (exc_info != None):
+			self._stop.set()
+			raise exc_info[0],exc_info[1],exc_info[2]
+		
+		self._time_offset = time_offset
+		
+		return scaled_value
+	
+	def stop(self):
+		
+		self._stop.set()
+		self._thread.join()
+	
+	def _run(self,sampler,s_in,sample_time):
+		# Background thread: sample the outputs at consecutive time offsets,
+		# which are computed in the same way as by step_in_time.
+		
+		time_offset = self._time_offset
+		while (not self._stop.is_set()):
+			try:
+				svec = s_in.sample(sampler.sample_rate,sampler.number_of_samples,time_offset)
+				scaled_value = sampler._quantize(svec).scaled_value
+			except:
+				self._put((None,None,sys.exc_info()))
+				return
+			
+			time_offset = time_offset + sample_time
+			self._put((scaled_value,time_offset,None))
+	
+	def _put(self,item):
+		# Put an item in the ready queue once there is room, unless the 
+		# thread is stopped while waiting.
+		
+		while (not self._stop.is_set()):
+			try:
+				self._ready.put(item,True,self._poll_interval)
+				return
+			except Queue.Full:
+				continue
+
+# end class _ADCPrefetcher
+
 ### End analog-to-digital blocks
 
 ### Define a number of digital blocks
@@ -780,57 +2102,130 @@ class Requantizer(Block):
 		
 		return self._precision
 	
-	def __init__(self,precision):
+	@property
+	def packed(self):
+		"""
+		Return True if output samples are packed into bytes.
+		
+		"""
+		
+		return self._packed
+	
+	def __init__(self,precision,packed=False):
 		"""
 		Construct a requantizer block for the given precision.
 		
 		Arguments:
 		precision -- FixedWidthType that defines the amplitude 
 		discretization used in requantization.
+		
+		Keyword arguments:
+		packed -- Pack output samples into bytes, which is supported for 
+		precisions of 1, 2 or 4 bits (default is False). See 
+		FixedWidthBinary.PackedWord.
 		"""
 		
+		if (packed and (precision.width not in fw.packed_widths)):
+			raise ValueError("Packed output of Requantizer requires a width of " + ",".join([str(w) for w in fw.packed_widths]) + " bits.")
+		
 		self._precision = precision
+		self._packed = packed
 	
 	def output(self):
 		"""
 		Return the output after requantization of the input source.
 		
 		Notes:
-		Implementation for handling overflows is similar to the AnalogDigitalConverter
-		block. See output method for that class for information.
+		Values outside the representable range saturate to the nearest 
+		bound, as in the AnalogDigitalConverter block. See output method 
+		for that class for information.
 		
 		"""
 		
 		s_in = self.source
 		
-		if (isinstance(s_in,Block)):
-			s_in = s_in.output()
+		s_in = self._resolve(s_in)
 		
 		if (not isinstance(s_in,sg.DigitalSignal)):
 			raise ValueError("Input to Requantize should be a DigitalSignal instance.")
 		
-		# extract samples from input signal
-		svec = s_in.samples
-		# get word type, either Word or WordComplex
-		word_type = type(s_in.samples_word)
+		word = self._requantize(s_in)
 		
-		try:
-			svec_digital = word_type(svec,self.precision).value
-		except fw.OverflowError:
-			max_val = self.precision.maximum_value
-			min_val = self.precision.minimum_value
-			if (word_type == fw.WordComplex):
-				svec[svec.real > max_val] = max_val + svec[svec.real > max_val].imag*1j
-				svec[svec.real < min_val] = min_val + svec[svec.real < min_val].imag*1j
-				svec[svec.imag > max_val] = max_val*1j + svec[svec.imag > max_val].real
-				svec[svec.imag < min_val] = min_val*1j + svec[svec.imag < min_val].real
-			else:
-				svec[svec > max_val] = max_val
-				svec[svec < min_val] = min_val
-			
-			svec_digital = word_type(svec,self.precision).value
+		return sg.DigitalSignal.from_word(s_in.sample_rate,word)
+	
+	def plan(self):
+		"""
+		Return a description of the requantized output.
+		
+		"""
+		
+		s_in = self._digital_plan(self.source,'Requantizer')
+		
+		return sg.SignalPlan('digital',s_in.sample_rate,s_in.number_of_samples,s_in.is_complex,self.precision,self.packed,not self.packed)
+	
+	def _requantize(self,s_in):
+		# Represent the samples of s_in in the output precision, saturating
+		# values that fall outside the representable range (separately for
+		# real and imaginary parts). Packed input in the output precision
+		# is passed on without unpacking.
+		
+		word = s_in.samples_word
+		is_complex = isinstance(word,fw.WordComplex)
+		if (self.packed):
+			if (s_in.is_packed and (word.word_format.width == self.precision.width) and (word.word_format.lsb_value == self.precision.lsb_value)):
+				return word
+			word_type = fw.PackedWordComplex if is_complex else fw.PackedWord
+		else:
+			word_type = fw.WordComplex if is_complex else fw.Word
 		
-		return sg.DigitalSignal(s_in.sample_rate,self.precision,svec_digital)
+		return word_type.saturate(s_in.samples,self.precision)
+	
+	def _batch_key(self):
+		"""
+		Return the output precision and packing of this requantizer.
+		
+		"""
+		
+		return (self.precision.width,self.precision.lsb_value,self.packed)
+	
+	def _batch_output(self,blocks,s_in):
+		"""
+		Return the output after requantization of a batch of inputs.
+		
+		Arguments:
+		blocks -- List of Requantizer instances with the same precision
+		as this one.
+		s_in -- DigitalSignalBatch that contains the input for each block.
+		
+		"""
+		
+		if (not isinstance(s_in,sg.DigitalSignalBatch)):
+			raise ValueError("Batched input to Requantizer should be a DigitalSignalBatch instance.")
+		
+		word = self._requantize(s_in)
+		
+		return sg.DigitalSignalBatch.from_word(s_in.sample_rate,word)
+	
+	def _spec_params(self):
+		"""
+		Return the output precision and packing as constructor arguments.
+		
+		"""
+		
+		params = {'precision': self.precision}
+		# only given for packed output, which leaves other specs unchanged
+		if (self.packed):
+			params['packed'] = True
+		
+		return params
+	
+	def _chunkable(self):
+		"""
+		Return True, requantization is applied per sample.
+		
+		"""
+		
+		return True
 
 # end class Requantizer
 
@@ -901,83 +2296,356 @@ class DigitalGain(Block):
 		
 		s_in = self.source
 		
-		if (isinstance(s_in,Block)):
-			s_in = s_in.output()
+		s_in = self._resolve(s_in)
+		
+		if (not isinstance(s_in,sg.DigitalSignal)):
+			raise ValueError("Input to Requantize should be a DigitalSignal instance.")
+		
+		# do multiplication using Word instances
+		out_word = s_in.samples_word * self.gain_word
+	
+		return sg.DigitalSignal(s_in.sample_rate,out_word.word_format,out_word.value)
+	
+	def plan(self):
+		"""
+		Return a description of the output after applying the gain.
+		
+		Notes:
+		The output precision follows from that of the input and the gain
+		as for FixedWidthBinary.Word.__mul__.
+		"""
+		
+		s_in = self._digital_plan(self.source,'DigitalGain')
+		
+		fmt = _product_format(s_in.precision,self.gain_word.word_format)
+		is_complex = s_in.is_complex or isinstance(self.gain_word,fw.WordComplex)
+		
+		return sg.SignalPlan('digital',s_in.sample_rate,s_in.number_of_samples,is_complex,fmt)
+	
+	def _batch_key(self):
+		"""
+		Return the type, precision and shape of the gain.
+		
+		Notes:
+		The gain value itself is not part of the key, so that blocks 
+		which apply different gains can be evaluated as a batch.
+		"""
+		
+		fmt = self.gain_word.word_format
+		
+		return (type(self.gain_word),fmt.width,fmt.lsb_value,np.shape(self.gain))
+	
+	def _batch_output(self,blocks,s_in):
+		"""
+		Return the output after applying the gain of each block to a batch of inputs.
+		
+		Arguments:
+		blocks -- List of DigitalGain instances with the same gain 
+		precision as this one.
+		s_in -- DigitalSignalBatch that contains the input for each block.
+		
+		"""
+		
+		if (not isinstance(s_in,sg.DigitalSignalBatch)):
+			raise ValueError("Batched input to DigitalGain should be a DigitalSignalBatch instance.")
+		
+		# stack the gains such that each row applies to one path
+		gains = np.array([b.gain for b in blocks])
+		if (gains.ndim == 1):
+			gains = gains.reshape((-1,1))
+		
+		gain_word = type(self.gain_word)(gains,self.gain_word.word_format)
+		out_word = s_in.samples_word * gain_word
+		
+		return sg.DigitalSignalBatch(s_in.sample_rate,out_word.word_format,out_word.value)
+	
+	def _spec_params(self):
+		"""
+		Return the gain and its precision as constructor arguments.
+		
+		"""
+		
+		return {'g': self.gain, 'precision': self.gain_word.word_format}
+	
+	def _chunkable(self):
+		"""
+		Return True if the gain is scalar, i.e. applied equally to all samples.
+		
+		"""
+		
+		return (np.size(self.gain) == 1)
+
+# end class DigitalGain
+
+class DigitalCombiner(Block):
+	"""
+	Combines a number of digital signals by summation.
+	
+	The constructor is inherited as-is from Block, which is essentially 
+	empty.
+	"""
+	
+	def attach_source(self,s_in_list):
+		"""
+		Attach a list of input sources to this block.
+		
+		Arguments:
+		s_in_list -- A list of valid Block input instances, i.e. either
+		Block or Signal instances, or a single Parallel instance.
+		
+		Notes:
+		If s_in_list is a Parallel instance, then that class' blocks
+		attribute is accessed to return a list of Blocks, which is then
+		used as the list of sources to attach.
+		"""
+		
+		if (isinstance(s_in_list,Parallel)):
+			s_in_list = s_in_list.blocks
+		
+		if (not isinstance(s_in_list,list)):
+			raise ValueError("Source for DigitalCombiner should be a list of Block and/or Signal instances.")
+		
+		super(DigitalCombiner,self).attach_source(s_in_list)
+	
+	def output(self):
+		"""
+		Return a digital signal which is the sum of the input signals.
+		
+		Notes:
+		The addition operation is handled by the FixedWidthBinary.Word
+		override of __add__ which automatically handles the output 
+		WordFormat.
+		
+		"""
+		
+		result = None
+		sample_rate = None
+		for src in self.source:
+			src = self._resolve(src)
+			
+			if (not isinstance(src,sg.DigitalSignal)):
+				raise RuntimeError("DigitalCombiner can only operate on DigitalSignal inputs.")
+				
+			if (sample_rate == None):
+				sample_rate = src.sample_rate
+			else:
+				if (sample_rate != src.sample_rate):
+					raise RuntimeError("Sample rates should match at DigitalCombiner input.")
+			
+			if (result == None):
+				result = src.samples_word
+			else:
+				result = result + src.samples_word
+		
+		return sg.DigitalSignal(sample_rate,result.word_format,result.value)
+	
+	def plan(self):
+		"""
+		Return a description of the sum of the input signals.
+		
+		Notes:
+		The output precision grows with each input that is added, as for
+		FixedWidthBinary.Word.__add__.
+		"""
+		
+		result = None
+		for src in self.source:
+			s_in = self._digital_plan(src,'DigitalCombiner')
+			if (result == None):
+				result = s_in
+			else:
+				if (result.sample_rate != s_in.sample_rate):
+					raise RuntimeError("Sample rates should match at DigitalCombiner input.")
+				
+				fmt = _sum_format(result.precision,s_in.precision)
+				result = sg.SignalPlan('digital',result.sample_rate,result.number_of_samples,result.is_complex or s_in.is_complex,fmt)
+		
+		return result
+	
+	def _chunkable(self):
+		"""
+		Return True, inputs are combined per sample.
+		
+		"""
+		
+		return True
+
+# end class DigitalCombiner
+
+class DigitalAccumulator(Block):
+	"""
+	Accumulate a number of consecutive digital signal frames by summation.
+	
+	"""
+	
+	@property
+	def length(self):
+		"""
+		Return the number of frames accumulated for each output.
+		
+		"""
+		
+		return self._length
+	
+	def __init__(self,n):
+		"""
+		Construct an accumulator block.
+		
+		Arguments:
+		n -- The number of frames to accumulate.
+		
+		Notes:
+		The accumulated signal is represented with ceil(log2(n)) bits more
+		than the input signal, so that the accumulation cannot overflow.
+		"""
+		
+		self._length = n
+		self.reset()
+	
+	def output(self):
+		"""
+		Return the sum of the next n outputs of the source.
+		
+		Notes:
+		The source output is requested n times, which is only meaningful
+		if the source advances in time with each call, e.g. when it is fed
+		by a TimeSteppingADC. Since each request has to produce a new
+		output, the source is evaluated directly rather than through any
+		executor that may be running.
+		"""
+		
+		previous = Block._set_executor(None)
+		try:
+			for ii in range(0,self.length):
+				s_in = self._resolve(self.source)
+				if (not isinstance(s_in,sg.DigitalSignal)):
+					raise ValueError("Input to DigitalAccumulator should be a DigitalSignal instance.")
+				self._accumulate(s_in)
+		finally:
+			Block._set_executor(previous)
+		
+		out = self._accumulated()
+		self.reset()
+		
+		return out
+	
+	def process(self,frame):
+		"""
+		Accumulate a single frame in streaming mode.
+		
+		Arguments:
+		frame -- SimSWARM.Signal.Frame instance with a DigitalSignal payload.
+		
+		Notes:
+		Returns None until n frames have been accumulated, at which point
+		a frame holding the sum is returned, with the timestamp of the
+		first frame in the sum, and accumulation starts over.
+		"""
+		
+		s_in = frame.payload
+		if (not isinstance(s_in,sg.DigitalSignal)):
+			raise ValueError("Input to DigitalAccumulator should be a DigitalSignal instance.")
+		
+		if (self._count == 0):
+			self._timestamp = frame.timestamp
+		self._accumulate(s_in)
+		
+		if (self._count < self.length):
+			return None
+		
+		out = sg.Frame(self._timestamp,self._sample_rate,self._accumulated())
+		self.reset()
+		
+		return out
+	
+	def reset(self):
+		"""
+		Discard any partially accumulated frames.
+		
+		"""
+		
+		self._sum = None
+		self._count = 0
+		self._timestamp = None
+		self._sample_rate = None
+		self._precision = None
+	
+	def get_state(self):
+		"""
+		Return the partially accumulated sum as the mutable state of this block.
+		
+		"""
+		
+		return {'sum': self._sum, 'count': self._count, 'timestamp': self._timestamp, 
+			'sample_rate': self._sample_rate, 'precision': self._precision}
+	
+	def set_state(self,state):
+		"""
+		Restore the partially accumulated sum.
 		
-		if (not isinstance(s_in,sg.DigitalSignal)):
-			raise ValueError("Input to Requantize should be a DigitalSignal instance.")
+		Arguments:
+		state -- Dictionary as returned by get_state.
+		"""
 		
-		# do multiplication using Word instances
-		out_word = s_in.samples_word * self.gain_word
-	
-		return sg.DigitalSignal(s_in.sample_rate,out_word.word_format,out_word.value)
-
-# end class DigitalGain
-
-class DigitalCombiner(Block):
-	"""
-	Combines a number of digital signals by summation.
+		self._sum = state['sum']
+		self._count = state['count']
+		self._timestamp = state['timestamp']
+		self._sample_rate = state['sample_rate']
+		self._precision = state['precision']
 	
-	The constructor is inherited as-is from Block, which is essentially 
-	empty.
-	"""
+	def _defers_upstream(self):
+		# The source is evaluated directly, n times per output.
+		
+		return True
 	
-	def attach_source(self,s_in_list):
+	def plan(self):
 		"""
-		Attach a list of input sources to this block.
-		
-		Arguments:
-		s_in_list -- A list of valid Block input instances, i.e. either
-		Block or Signal instances, or a single Parallel instance.
+		Return a description of the accumulated output.
 		
-		Notes:
-		If s_in_list is a Parallel instance, then that class' blocks
-		attribute is accessed to return a list of Blocks, which is then
-		used as the list of sources to attach.
 		"""
 		
-		if (isinstance(s_in_list,Parallel)):
-			s_in_list = s_in_list.blocks
+		s_in = self._digital_plan(self.source,'DigitalAccumulator')
 		
-		if (not isinstance(s_in_list,list)):
-			raise ValueError("Source for DigitalCombiner should be a list of Block and/or Signal instances.")
+		fmt = s_in.precision
+		lsb_pot = int(np.log2(fmt.lsb_value))
+		width = fmt.width + int(np.ceil(np.log2(self.length)))
 		
-		super(DigitalCombiner,self).attach_source(s_in_list)
+		return sg.SignalPlan('digital',s_in.sample_rate,s_in.number_of_samples,s_in.is_complex,fw.WordFormat(width,lsb_pot))
 	
-	def output(self):
-		"""
-		Return a digital signal which is the sum of the input signals.
+	def _accumulate(self,s_in):
+		# Add the samples of the signal to the running sum. Samples are
+		# integer multiples of the lsb_value, so the sum is exact as long
+		# as it is representable in double precision.
 		
-		Notes:
-		The addition operation is handled by the FixedWidthBinary.Word
-		override of __add__ which automatically handles the output 
-		WordFormat.
+		if (self._count == 0):
+			self._sum = np.array(s_in.samples)
+			self._sample_rate = s_in.sample_rate
+			self._precision = s_in.precision
+		else:
+			if (self._sum.shape != s_in.samples.shape):
+				raise RuntimeError("DigitalAccumulator inputs should have the same number of samples.")
+			self._sum = self._sum + s_in.samples
+		
+		self._count = self._count + 1
+	
+	def _accumulated(self):
+		# Return the running sum as a DigitalSignal.
+		
+		fmt = self._precision
+		lsb_pot = int(np.log2(fmt.lsb_value))
+		width = fmt.width + int(np.ceil(np.log2(self.length)))
 		
+		return sg.DigitalSignal(self._sample_rate,fw.WordFormat(width,lsb_pot),self._sum,force_complex=np.iscomplexobj(self._sum))
+	
+	def _spec_params(self):
 		"""
+		Return the number of frames to accumulate as constructor argument.
 		
-		result = None
-		sample_rate = None
-		for src in self.source:
-			if (isinstance(src,Block)):
-				src = src.output()
-			
-			if (not isinstance(src,sg.DigitalSignal)):
-				raise RuntimeError("DigitalCombiner can only operate on DigitalSignal inputs.")
-				
-			if (sample_rate == None):
-				sample_rate = src.sample_rate
-			else:
-				if (sample_rate != src.sample_rate):
-					raise RuntimeError("Sample rates should match at DigitalCombiner input.")
-			
-			if (result == None):
-				result = src.samples_word
-			else:
-				result = result + src.samples_word
+		"""
 		
-		return sg.DigitalSignal(sample_rate,result.word_format,result.value)
+		return {'n': self.length}
 
-# end class DigitalCombiner
+# end class DigitalAccumulator
 
 class DigitalFFT(Block):
 	"""
@@ -1040,26 +2708,47 @@ class DigitalFFT(Block):
 		
 		src = self.source
 		
-		if (isinstance(src,Block)):
-			src = src.output()
+		src = self._resolve(src)
 		
 		if (not isinstance(src,sg.DigitalSignal)):
 			raise RuntimeError("FFTBlock can only operate on DigitalSignal instance.")
 		
+		return (src.sample_rate,self._fft_samples(src))
+	
+	def _fft_samples(self,src):
+		# Compute the FFT of the samples in src along the last axis, and
+		# return the result as a FixedWidthBinary.WordComplex.
+		
 		N = src.number_of_samples
+		self._check_length(N)
+		
+		# represent samples in the output WordFormat
+		samples_word = fw.WordComplex(src.samples,self.precision)
+		
+		return self._radix2_dft(samples_word,N)
+	
+	def _check_length(self,N):
+		# Raise an error if N is not a whole-numbered power of two.
+		
 		log2_N = np.log2(N)
 		if ( (log2_N - int(log2_N)) != 0.0 ):
 			raise RuntimeError("Only radix-2 implemented, number of samples should be whole-numbered power of two.")
+	
+	def plan(self):
+		"""
+		Return a description of the FFT of the input signal.
 		
-		# represent samples in the output WordFormat
-		samples_word = fw.WordComplex(src.samples,self.precision)
-		samples_fft_word = self._recursive_dft(samples_word,N)
+		"""
+		
+		s_in = self._digital_plan(self.source,'DigitalFFT')
+		if (not self.use_alt_output):
+			self._check_length(s_in.number_of_samples)
 		
-		return (src.sample_rate,samples_fft_word)
+		return sg.SignalPlan('digital',s_in.sample_rate,s_in.number_of_samples,True,self.precision)
 	
-	def _recursive_dft(self,full,N):
+	def _radix2_dft(self,full,N):
 		"""
-		Compute the N-point DFT using two N/2-point DFTs.
+		Compute the N-point DFT using log2(N) radix-2 butterfly stages.
 		
 		Arguments:
 		full -- The input vector, given as FixedWidthBinary.Word
@@ -1070,25 +2759,44 @@ class DigitalFFT(Block):
 		bit-growth for binary operations on Word instances is ignored in
 		the current implementation. Instead, the calculations are performed
 		on the value attributes of the Words involved, and the result
-		used to create a Word instance using the same WordFormat of full.
+		of each stage is represented using the same WordFormat of full.
+		
+		The input is put in bit-reversed order, after which each stage 
+		combines pairs of m/2-point DFTs into m-point DFTs, for m = 2, 4,
+		..., N, all in a single vectorized operation per stage. This is
+		the same computation as splitting the DFT recursively into DFTs of
+		the even and odd samples, and gives identical results.
+		
+		If full is multi-dimensional, the DFT is computed along the last
+		axis.
 		
 		"""
 		
-		if (N == 1):
-			return fw.WordComplex(full.value,full.word_format)
-		else:
-			# divide into two N/2-point DFTs
-			even_half = fw.WordComplex(full.value[0::2],full.word_format)
-			even_half = self._recursive_dft(even_half,N/2)
-			odd_half = fw.WordComplex(full.value[1::2],full.word_format)
-			odd_half = self._recursive_dft(odd_half,N/2)
-			# compute twiddle factors
-			twiddle_factors = self._compute_twiddle(N)
-			# combine into N-point DFT
-			result_lower = even_half.value + twiddle_factors.value * odd_half.value
-			result_upper = even_half.value - twiddle_factors.value * odd_half.value
-			return fw.WordComplex(np.concatenate((result_lower,result_upper)),full.word_format)
-
+		fmt = full.word_format
+		value = full.value
+		lead_shape = value.shape[:-1]
+		
+		# bit-reversed order, such that each block of m consecutive samples
+		# holds the even and odd halves of an m-point DFT
+		index = np.zeros(1,dtype=np.int64)
+		while (index.size < N):
+			index = np.concatenate((2*index,2*index+1))
+		value = fw.WordComplex(value[...,index],fmt).value
+		
+		m = 2
+		while (m <= N):
+			half = m/2
+			twiddle_factors = self._compute_twiddle(m)
+			blocks = value.reshape(lead_shape + (N/m,m))
+			even_half = blocks[...,:half]
+			odd_half = blocks[...,half:]
+			product = twiddle_factors.value * odd_half
+			result = np.concatenate((even_half + product,even_half - product),axis=-1)
+			value = fw.WordComplex(result.reshape(lead_shape + (N,)),fmt).value
+			m = 2*m
+		
+		return fw.WordComplex(value,fmt)
+	
 	def _compute_twiddle(self,N):
 		"""
 		Compute W_N^(n) = exp(-j*2*pi*n/N) for all n = 0, 1, ..., N/2-1
@@ -1122,8 +2830,7 @@ class DigitalFFT(Block):
 		
 		src = self.source
 		
-		if (isinstance(src,Block)):
-			src = src.output()
+		src = self._resolve(src)
 		
 		if (not isinstance(src,sg.DigitalSignal)):
 			raise RuntimeError("FFTBlock can only operate on DigitalSignal instance.")
@@ -1131,6 +2838,43 @@ class DigitalFFT(Block):
 		samples_fft = np.fft.fft(src.samples)
 		
 		return (src.sample_rate,fw.WordComplex(samples_fft,self.precision))
+	
+	def _batch_key(self):
+		"""
+		Return the precision and output method of this FFT.
+		
+		"""
+		
+		return (self.precision.width,self.precision.lsb_value,self.use_alt_output)
+	
+	def _batch_output(self,blocks,s_in):
+		"""
+		Return the FFT of each path in a batch of inputs.
+		
+		Arguments:
+		blocks -- List of DigitalFFT instances with the same parameters 
+		as this one.
+		s_in -- DigitalSignalBatch that contains the input for each block.
+		
+		"""
+		
+		if (not isinstance(s_in,sg.DigitalSignalBatch)):
+			raise RuntimeError("Batched FFT can only operate on DigitalSignalBatch instance.")
+		
+		if (self.use_alt_output):
+			result = fw.WordComplex(np.fft.fft(s_in.samples),self.precision)
+		else:
+			result = self._fft_samples(s_in)
+		
+		return sg.DigitalSignalBatch(s_in.sample_rate,result.word_format,result.value,force_complex=True)
+	
+	def _spec_params(self):
+		"""
+		Return the precision and output method as constructor arguments.
+		
+		"""
+		
+		return {'precision': self.precision, 'use_alt_output': self.use_alt_output}
 
 # end class DigitalFFT
 
@@ -1191,7 +2935,337 @@ class DigitalRealFFT(DigitalFFT):
 		
 		return sg.DigitalSignal(rate,result.word_format,result.value)
 	
+	def plan(self):
+		"""
+		Return a description of the positive frequency part of the FFT.
+		
+		"""
+		
+		result = super(DigitalRealFFT,self).plan()
+		
+		return sg.SignalPlan('digital',result.sample_rate,result.number_of_samples/2,True,result.precision)
+	
+	def _batch_key(self):
+		"""
+		Return None, batched evaluation is not implemented for the real FFT.
+		
+		"""
+		
+		return None
+
 # end class DigitalRealFFT
 
+class DigitalPFB(DigitalFFT):
+	"""
+	Implements a polyphase filter bank (PFB) channelizer.
+	
+	The input is cut into blocks of channels samples, and each spectrum
+	is the FFT of the sum of taps consecutive blocks, weighted by a
+	windowed sinc filter of taps*channels coefficients. Consecutive 
+	spectra start one block apart, so that the output is critically 
+	sampled: each block of input samples gives one spectrum of channels
+	samples. Compared to the FFT of single blocks (DigitalFFT) the 
+	channel response is flatter and leaks less into neighbouring 
+	channels, like the PFB of the SWARM correlator.
+	
+	The filter is applied to all spectra of an input at once, with one
+	vectorized multiply-add per tap over overlapping views of the input
+	blocks, and the FFTs of all spectra are computed together.
+	"""
+	
+	# Window functions for the filter coefficients, by name.
+	_windows = {'hamming': np.hamming, 'hann': np.hanning, 'blackman': np.blackman, 'rectangular': np.ones}
+	
+	@property
+	def channels(self):
+		"""
+		Return the number of channels, i.e. the length of each FFT.
+		
+		"""
+		
+		return self._channels
+	
+	@property
+	def taps(self):
+		"""
+		Return the number of taps of the filter in each channel.
+		
+		"""
+		
+		return self._taps
+	
+	@property
+	def window(self):
+		"""
+		Return the window applied to the filter coefficients.
+		
+		"""
+		
+		return self._window
+	
+	@property
+	def coefficient_precision(self):
+		"""
+		Return the precision used for representing filter coefficients.
+		
+		"""
+		
+		return self._coefficient_precision
+	
+	@property
+	def coefficients(self):
+		"""
+		Return the filter coefficients, as represented in the coefficient precision.
+		
+		"""
+		
+		return self._coefficients
+	
+	def __init__(self,precision,channels,taps=4,window='hamming',coefficient_precision=None,use_alt_output=False):
+		"""
+		Create a PFB block.
+		
+		Arguments:
+		precision -- The FixedWidthBinary.WordFormat instance that defines
+		the binary representation of the filter output and the Fourier
+		coefficients.
+		channels -- The number of channels, which should be a whole-numbered
+		power of two unless use_alt_output is True.
+		
+		Keyword arguments:
+		taps -- The number of taps of the filter in each channel (default 
+		is 4).
+		window -- Name of the window applied to the sinc filter, one of
+		'hamming', 'hann', 'blackman' or 'rectangular', or an array of 
+		taps*channels values (default is 'hamming').
+		coefficient_precision -- The FixedWidthBinary.WordFormat instance
+		that defines the binary representation of the filter coefficients,
+		or None to use machine precision (default is None).
+		use_alt_output -- Indicates whether the filter and FFT are computed
+		in machine precision, see DigitalFFT (default is False).
+		
+		Notes:
+		The coefficients are the product of the window and a sinc function
+		with its first zeros channels samples from the centre, with a peak
+		of one. Values outside the range of the coefficient precision
+		saturate to the nearest bound.
+		"""
+		
+		super(DigitalPFB,self).__init__(precision,use_alt_output=use_alt_output)
+		
+		if (not use_alt_output):
+			self._check_length(channels)
+		
+		self._channels = channels
+		self._taps = taps
+		self._window = window
+		self._coefficient_precision = coefficient_precision
+		self._coefficients = self._compute_coefficients()
+		self.reset()
+	
+	def _compute_coefficients(self):
+		# Return the windowed sinc filter coefficients, represented in the
+		# coefficient precision if one is given.
+		
+		length = self.taps * self.channels
+		if (isinstance(self.window,basestring)):
+			if (self.window not in self._windows):
+				raise ValueError("Window for DigitalPFB should be one of " + ",".join(sorted(self._windows.keys())) + ".")
+			window = self._windows[self.window](length)
+		else:
+			window = np.array(self.window,dtype=np.float64)
+			if (window.shape != (length,)):
+				raise ValueError("Window for DigitalPFB should have taps*channels values.")
+		
+		nvec = np.arange(0,length)
+		coefficients = window * np.sinc((nvec - (length - 1) / 2.0) / self.channels)
+		
+		if (self.coefficient_precision != None):
+			coefficients = fw.Word.saturate(coefficients,self.coefficient_precision).value
+		
+		return coefficients
+	
+	def output(self):
+		"""
+		Generate and return the spectra of the input signal.
+		
+		Notes:
+		The number of samples in the input should be a multiple of the
+		number of channels, and at least taps blocks long. Only spectra
+		for which the filter spans input samples are computed, i.e. the
+		number of spectra is taps - 1 less than the number of blocks. The
+		spectra are returned one after the other in a single signal.
+		"""
+		
+		src = self._resolve(self.source)
+		
+		if (not isinstance(src,sg.DigitalSignal)):
+			raise RuntimeError("DigitalPFB can only operate on DigitalSignal instance.")
+		
+		self._check_blocks(src.number_of_samples)
+		
+		return sg.DigitalSignal.from_word(src.sample_rate,self._channelize(src.samples))
+	
+	def process(self,frame):
+		"""
+		Channelize a single frame in streaming mode.
+		
+		Arguments:
+		frame -- SimSWARM.Signal.Frame instance with a DigitalSignal payload.
+		
+		Notes:
+		The last taps - 1 blocks of input (and any samples that do not fill
+		a block) are kept for the next frame, so that the spectra of a 
+		stream are those of the concatenated input, and each block of
+		input gives one spectrum. Before the first frame the kept input is
+		zero. The timestamp of the returned frame is that of the newest 
+		block in the first spectrum, and None is returned if the input 
+		does not complete a block.
+		"""
+		
+		s_in = frame.payload
+		if (not isinstance(s_in,sg.DigitalSignal)):
+			raise ValueError("Input to DigitalPFB should be a DigitalSignal instance.")
+		
+		samples = np.asarray(s_in.samples)
+		filter_history = (self.taps - 1) * self.channels
+		if (self._history is None):
+			self._history = np.zeros(samples.shape[:-1] + (filter_history,))
+		
+		timestamp = frame.timestamp - 1.0 * (self._history.shape[-1] - filter_history) / s_in.sample_rate
+		
+		samples = np.concatenate((self._history,samples),axis=-1)
+		spectra = samples.shape[-1] / self.channels - self.taps + 1
+		self._history = samples[...,(spectra * self.channels):].copy()
+		if (spectra == 0):
+			return None
+		
+		out = sg.DigitalSignal.from_word(s_in.sample_rate,self._channelize(samples))
+		
+		return sg.Frame(timestamp,s_in.sample_rate,out)
+	
+	def reset(self):
+		"""
+		Discard the input kept for the filter.
+		
+		"""
+		
+		self._history = None
+	
+	def get_state(self):
+		"""
+		Return the input kept for the filter as the mutable state of this block.
+		
+		"""
+		
+		return {'history': self._history}
+	
+	def set_state(self,state):
+		"""
+		Restore the input kept for the filter.
+		
+		Arguments:
+		state -- Dictionary as returned by get_state.
+		"""
+		
+		self._history = state['history']
+	
+	def _check_blocks(self,N):
+		# Raise an error if N samples do not fill a whole number of blocks,
+		# at least taps blocks.
+		
+		if ((N % self.channels != 0) or (N < self.taps * self.channels)):
+			raise ValueError("Number of samples for DigitalPFB should be a multiple of the number of channels, and at least taps times that.")
+	
+	def _channelize(self,samples):
+		# Compute the spectra of the samples along the last axis, and return
+		# them one after the other as a FixedWidthBinary.WordComplex. 
+		# Samples beyond the last whole block are ignored.
+		
+		N = self.channels
+		spectra = samples.shape[-1] / N - self.taps + 1
+		lead_shape = samples.shape[:-1]
+		
+		# each spectrum sums taps consecutive blocks, i.e. overlapping
+		# views of the blocks starting one block apart
+		blocks = samples[...,:((spectra + self.taps - 1) * N)].reshape(lead_shape + (spectra + self.taps - 1,N))
+		weights = self.coefficients.reshape((self.taps,N))
+		summed = blocks[...,0:spectra,:] * weights[0]
+		for ii in range(1,self.taps):
+			summed += blocks[...,ii:(ii + spectra),:] * weights[ii]
+		
+		if (self.use_alt_output):
+			result = fw.WordComplex(np.fft.fft(summed),self.precision)
+		else:
+			result = self._radix2_dft(fw.WordComplex.saturate(summed,self.precision),N)
+		
+		return fw.WordComplex.from_scaled_value(result.scaled_value_real.reshape(lead_shape + (-1,)),
+			result.scaled_value_imag.reshape(lead_shape + (-1,)),result.word_format)
+	
+	def plan(self):
+		"""
+		Return a description of the spectra of the input signal.
+		
+		"""
+		
+		s_in = self._digital_plan(self.source,'DigitalPFB')
+		self._check_blocks(s_in.number_of_samples)
+		
+		length = s_in.number_of_samples - (self.taps - 1) * self.channels
+		
+		return sg.SignalPlan('digital',s_in.sample_rate,length,True,self.precision)
+	
+	def _batch_key(self):
+		"""
+		Return the precision, output method and filter of this PFB.
+		
+		Notes:
+		The filter is identified by the window name, or by a digest of 
+		the window values for a given window, together with the 
+		coefficient precision, which define the coefficients.
+		"""
+		
+		if (isinstance(self.window,basestring)):
+			window = self.window
+		else:
+			window = hashlib.sha1(np.ascontiguousarray(self.window,dtype=np.float64)).hexdigest()
+		
+		if (self.coefficient_precision != None):
+			coefficient_precision = (self.coefficient_precision.width,self.coefficient_precision.lsb_value)
+		else:
+			coefficient_precision = None
+		
+		return (self.precision.width,self.precision.lsb_value,self.use_alt_output,self.channels,self.taps,
+			window,coefficient_precision)
+	
+	def _batch_output(self,blocks,s_in):
+		"""
+		Return the spectra of each path in a batch of inputs.
+		
+		Arguments:
+		blocks -- List of DigitalPFB instances with the same parameters 
+		as this one.
+		s_in -- DigitalSignalBatch that contains the input for each block.
+		
+		"""
+		
+		if (not isinstance(s_in,sg.DigitalSignalBatch)):
+			raise RuntimeError("Batched PFB can only operate on DigitalSignalBatch instance.")
+		
+		self._check_blocks(s_in.number_of_samples)
+		
+		return sg.DigitalSignalBatch.from_word(s_in.sample_rate,self._channelize(s_in.samples))
+	
+	def _spec_params(self):
+		"""
+		Return the precision, filter and output method as constructor arguments.
+		
+		"""
+		
+		return {'precision': self.precision, 'channels': self.channels, 'taps': self.taps, 'window': self.window,
+			'coefficient_precision': self.coefficient_precision, 'use_alt_output': self.use_alt_output}
+
+# end class DigitalPFB
+
 
 ### End digital blocks
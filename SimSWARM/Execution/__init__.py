@@ -0,0 +1,39 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#  __init__.py
+#  Oct 18, 2026 11:02:17 EDT
+#  Copyright 2026
+#         
+#  Andre Young <andre.young@cfa.harvard.edu>
+#  Harvard-Smithsonian Center for Astrophysics
+#  60 Garden Street, Cambridge
+#  MA 02138
+#  
+#  Changelog:
+#  	AY: Created 2026-10-18
+#	AY: Added profiling module 2026-10-18
+#	AY: Added planner module 2026-10-18
+#	AY: Added checkpoint module 2026-10-18
+#	AY: Added chunking module 2026-10-18
+#	AY: Added pipeline module 2026-10-18
+#	AY: Added cache module 2026-10-18
+#	AY: Added tracing module 2026-10-18
+#	AY: Added shared memory module 2026-10-18
+#	AY: Added telemetry module 2026-10-18
+"""
+Defines executors for evaluating networks of signal processing blocks.
+
+"""
+
+from executor import *
+from shared import *
+from runners import *
+from profiling import *
+from planner import *
+from checkpoint import *
+from chunking import *
+from pipeline import *
+from cache import *
+from tracing import *
+from telemetry import *
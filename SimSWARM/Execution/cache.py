@@ -0,0 +1,324 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#  cache.py
+#  Oct 18, 2026 20:03:52 EDT
+#  Copyright 2026
+#         
+#  Andre Young <andre.young@cfa.harvard.edu>
+#  Harvard-Smithsonian Center for Astrophysics
+#  60 Garden Street, Cambridge
+#  MA 02138
+#  
+#  Changelog:
+#  	AY: Created 2026-10-18
+#	AY: Keep packing of cached outputs 2026-10-18
+#	AY: List the cache directory once when evicting entries 2026-10-18
+
+"""
+Defines an on-disk cache for the outputs of stages in a network of blocks.
+
+"""
+
+import json
+import os
+import tempfile
+
+import numpy as np
+
+import FixedWidthBinary as fw
+import SimSWARM.Signal as sg
+import SimSWARM.Spec as sp
+
+from executor import GraphExecutor
+
+class StageCache(object):
+	"""
+	Store the outputs of selected blocks on disk, keyed by the network upstream of them.
+	
+	The key of a block is the digest of its spec (see SimSWARM.Spec.digest),
+	which covers the parameters, word formats and state of the block and
+	of all blocks, signals and generators (including seeds) upstream of
+	it. When a network is run through the cache, the outputs of the given
+	stage blocks are loaded from the cache if their key is found, and are
+	otherwise computed and stored. Changing a parameter downstream of a
+	stage, e.g. the width of a Requantizer after an FFT, leaves the key
+	of the stage unchanged, so that its output is reused:
+		
+		cache = StageCache('/scratch/stages',max_bytes=2**34)
+		out = cache.run(chain,[fft_parallel])
+	
+	Notes:
+	Each entry holds the sample arrays of the output as .npy files, and
+	the state of the blocks in the network upstream of the stage after it
+	was computed, which is restored when the entry is used (e.g. the time
+	offsets of TimeSteppingADC blocks). Once the total size of the cache
+	exceeds max_bytes, the least recently used entries are removed.
+	"""
+	
+	@property
+	def directory(self):
+		"""
+		Return the directory that holds the cache.
+		
+		"""
+		
+		return self._directory
+	
+	@property
+	def max_bytes(self):
+		"""
+		Return the maximum total size of the cache in bytes, or None if unlimited.
+		
+		"""
+		
+		return self._max_bytes
+	
+	@property
+	def hits(self):
+		"""
+		Return the list of stage blocks loaded from the cache in the last run.
+		
+		"""
+		
+		return self._hits
+	
+	@property
+	def misses(self):
+		"""
+		Return the list of stage blocks computed in the last run.
+		
+		"""
+		
+		return self._misses
+	
+	def __init__(self,directory,max_bytes=None):
+		"""
+		Construct a cache stored in the given directory.
+		
+		Arguments:
+		directory -- Path of the directory that holds the cache, which is
+		created if it does not exist.
+		
+		Keyword arguments:
+		max_bytes -- The maximum total size of the cache in bytes, or None
+		for no limit (default is None).
+		
+		"""
+		
+		if (not os.path.isdir(directory)):
+			os.makedirs(directory)
+		
+		self._directory = directory
+		self._max_bytes = max_bytes
+		self._hits = list()
+		self._misses = list()
+	
+	def key(self,b,memo=None):
+		"""
+		Return the cache key of block b.
+		
+		Keyword arguments:
+		memo -- Dictionary passed on to SimSWARM.Spec.digest (default is
+		None).
+		
+		"""
+		
+		return sp.digest(b,memo)
+	
+	def run(self,root,stages):
+		"""
+		Evaluate the network and return the output of the root block.
+		
+		Arguments:
+		root -- Block instance (typically a Chain), or a list of Block
+		instances.
+		stages -- List of blocks in the network of which the outputs are
+		cached.
+		
+		Notes:
+		The keys of the stages are computed before the network is run.
+		Outputs of stages found in the cache are used as precomputed
+		outputs (see GraphExecutor.run), so that the blocks upstream of
+		them are not evaluated, and the states stored with them are
+		restored after the run. Outputs of the other stages are stored
+		once the run is complete. Only stages with DigitalSignal outputs
+		(or lists of them) are stored.
+		"""
+		
+		graph = GraphExecutor(root)
+		memo = dict()
+		for b in graph.nodes:
+			sp.digest(b,memo)
+		
+		keys = [self.key(b,memo) for b in stages]
+		
+		self._hits = list()
+		self._misses = list()
+		outputs = dict()
+		states = dict()
+		for ii in range(0,len(stages)):
+			entry = self._load(keys[ii])
+			if (entry == None):
+				self._misses.append(stages[ii])
+			else:
+				outputs[stages[ii]] = entry[0]
+				states[ii] = entry[1]
+				self._hits.append(stages[ii])
+		
+		roots = graph._roots() + self.misses
+		result = GraphExecutor(roots).run(outputs)
+		
+		for ii in range(0,len(stages)):
+			if (ii in states):
+				self._restore_states(stages[ii],states[ii])
+		
+		for ii in range(0,len(stages)):
+			if (stages[ii] in self.misses):
+				out = result[len(graph._roots()) + self.misses.index(stages[ii])]
+				self._store(keys[ii],out,self._get_states(stages[ii]))
+		
+		self._evict()
+		
+		if (isinstance(root,list)):
+			return result[:len(root)]
+		
+		return result[0]
+	
+	def clear(self):
+		"""
+		Remove all entries from the cache.
+		
+		"""
+		
+		for name in os.listdir(self.directory):
+			if (name.endswith('.json') or name.endswith('.npy')):
+				os.remove(os.path.join(self.directory,name))
+	
+	def _get_states(self,b):
+		# Return the states of the blocks in the graph of b, in the same
+		# order as the nodes of a GraphExecutor, see runners.
+		
+		return [n.get_state() for n in GraphExecutor(b).nodes]
+	
+	def _restore_states(self,b,states):
+		# Apply states returned by _get_states.
+		
+		nodes = GraphExecutor(b).nodes
+		for ii in range(0,len(nodes)):
+			nodes[ii].set_state(states[ii])
+	
+	def _paths(self,key,n):
+		# Return the paths of the metadata file and sample arrays of an
+		# entry with n signals.
+		
+		base = os.path.join(self.directory,key)
+		
+		return base + '.json',[base + '.' + str(ii) + '.npy' for ii in range(0,n)]
+	
+	def _load(self,key):
+		# Return the output and states stored for key, or None if there is
+		# no such entry.
+		
+		meta_path,_ = self._paths(key,0)
+		try:
+			with open(meta_path,'r') as fh:
+				meta = json.load(fh)
+			
+			_,npy_paths = self._paths(key,len(meta['signals']))
+			signals = list()
+			for ii in range(0,len(meta['signals'])):
+				info = meta['signals'][ii]
+				samples = np.load(npy_paths[ii])
+				precision = sp.decode_value(info['precision'])
+				signals.append(sg.DigitalSignal(info['rate'],precision,samples,force_complex=info['force_complex'],packed=info.get('packed',False)))
+		except (IOError,OSError,ValueError,KeyError):
+			# missing or incomplete entry, e.g. evicted by another process
+			return None
+		
+		# mark the entry as recently used
+		os.utime(meta_path,None)
+		
+		out = signals
+		if (not meta['is_list']):
+			out = signals[0]
+		
+		return out,sp.decode_value(meta['states'])
+	
+	def _store(self,key,out,states):
+		# Store the output and states for key. The sample arrays are
+		# written first and the metadata file last, each replacing its
+		# path atomically, so that incomplete entries are never loaded.
+		
+		signals = out if isinstance(out,list) else [out]
+		if (not all([isinstance(s,sg.DigitalSignal) for s in signals])):
+			return
+		
+		meta_path,npy_paths = self._paths(key,len(signals))
+		info = list()
+		for ii in range(0,len(signals)):
+			s = signals[ii]
+			self._write(npy_paths[ii],lambda fh: np.save(fh,s.samples))
+			info.append({'rate': s.sample_rate, 'precision': sp.encode_value(s.precision),
+				'force_complex': isinstance(s.samples_word,fw.WordComplex), 'packed': s.is_packed})
+		
+		meta = {'is_list': isinstance(out,list), 'signals': info, 'states': sp.encode_value(states)}
+		self._write(meta_path,lambda fh: json.dump(meta,fh))
+	
+	def _write(self,path,write):
+		# Write a file through a temporary file that replaces path.
+		
+		fd,tmp_path = tempfile.mkstemp(prefix='.tmp-',dir=self.directory)
+		try:
+			with os.fdopen(fd,'wb') as fh:
+				write(fh)
+			os.rename(tmp_path,path)
+		except:
+			if (os.path.exists(tmp_path)):
+				os.remove(tmp_path)
+			raise
+	
+	def _evict(self):
+		# Remove the least recently used entries until the total size of
+		# the cache is within max_bytes.
+		
+		if (self.max_bytes == None):
+			return
+		
+		# group the sample arrays by the key of their entry, from a single 
+		# listing of the directory
+		names = os.listdir(self.directory)
+		npy_paths = dict()
+		for name in names:
+			if (name.endswith('.npy')):
+				key = name.split('.',1)[0]
+				npy_paths.setdefault(key,list()).append(os.path.join(self.directory,name))
+		
+		entries = list()
+		total = 0
+		for name in names:
+			if (not name.endswith('.json')):
+				continue
+			
+			key = name[:-len('.json')]
+			files = [os.path.join(self.directory,name)] + npy_paths.get(key,list())
+			try:
+				size = sum([os.path.getsize(f) for f in files])
+				used = os.path.getmtime(files[0])
+			except OSError:
+				continue
+			
+			entries.append((used,files,size))
+			total = total + size
+		
+		entries.sort()
+		for used,files,size in entries:
+			if (total <= self.max_bytes):
+				break
+			
+			for f in files:
+				if (os.path.exists(f)):
+					os.remove(f)
+			total = total - size
+
+# end class StageCache
@@ -0,0 +1,237 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#  checkpoint.py
+#  Oct 18, 2026 17:58:31 EDT
+#  Copyright 2026
+#         
+#  Andre Young <andre.young@cfa.harvard.edu>
+#  Harvard-Smithsonian Center for Astrophysics
+#  60 Garden Street, Cambridge
+#  MA 02138
+#  
+#  Changelog:
+#  	AY: Created 2026-10-18
+
+"""
+Defines checkpointing of streaming simulations.
+
+"""
+
+import json
+import os
+import tempfile
+
+import SimSWARM.Spec as sp
+
+class Checkpoint(object):
+	"""
+	Save and restore the state of a Chain streaming frames.
+	
+	A checkpoint file holds the spec of the chain (see SimSWARM.Spec),
+	which includes the time offsets of the ADCs, the seeds of the
+	generators and the contents of accumulators, together with the number
+	of input frames processed so far. The file is written at a fixed
+	interval of frames while streaming, and replaced atomically so that
+	an interrupted run always leaves a complete checkpoint. A run that is
+	restarted with the same checkpoint continues exactly where the last
+	checkpoint was taken:
+		
+		cp = Checkpoint('run.ckpt',interval=100)
+		for frame in cp.stream(chain,n=10000):
+			save(frame)
+	
+	Notes:
+	An output frame is only counted as done once the next frame is
+	requested from the stream, so that frames which were generated but
+	not handled by the caller when the run was interrupted are generated
+	again on resume. Runners set on Parallel blocks are not part of the
+	checkpoint, see SimSWARM.Spec.to_spec.
+	"""
+	
+	# Version of the checkpoint file layout.
+	_version = 1
+	
+	@property
+	def path(self):
+		"""
+		Return the path of the checkpoint file.
+		
+		"""
+		
+		return self._path
+	
+	@property
+	def interval(self):
+		"""
+		Return the number of input frames between checkpoints.
+		
+		"""
+		
+		return self._interval
+	
+	@property
+	def frames(self):
+		"""
+		Return the number of input frames processed by the chain.
+		
+		"""
+		
+		return self._frames
+	
+	def __init__(self,path,interval=1):
+		"""
+		Construct a checkpoint stored in the given file.
+		
+		Arguments:
+		path -- Path of the checkpoint file.
+		
+		Keyword arguments:
+		interval -- The number of input frames processed between writing
+		checkpoints (default is 1).
+		
+		"""
+		
+		if (interval < 1):
+			raise ValueError("Checkpoint interval should be at least one frame.")
+		
+		self._path = path
+		self._interval = interval
+		self._frames = 0
+	
+	def exists(self):
+		"""
+		Return True if the checkpoint file exists.
+		
+		"""
+		
+		return os.path.isfile(self.path)
+	
+	def save(self,chain):
+		"""
+		Write the checkpoint for the given chain.
+		
+		Arguments:
+		chain -- The Chain being streamed.
+		
+		Notes:
+		The checkpoint is first written to a temporary file in the same
+		directory, which then replaces the checkpoint file by renaming.
+		"""
+		
+		data = {'version': self._version, 'frames': self.frames, 'spec': sp.to_spec(chain)}
+		
+		directory = os.path.dirname(os.path.abspath(self.path))
+		fd,tmp_path = tempfile.mkstemp(prefix='.' + os.path.basename(self.path) + '.',dir=directory)
+		try:
+			with os.fdopen(fd,'w') as fh:
+				json.dump(data,fh)
+				fh.flush()
+				os.fsync(fh.fileno())
+			
+			if ((os.name == 'nt') and os.path.exists(self.path)):
+				# rename does not replace existing files on Windows
+				os.remove(self.path)
+			os.rename(tmp_path,self.path)
+		except:
+			if (os.path.exists(tmp_path)):
+				os.remove(tmp_path)
+			raise
+	
+	def load(self):
+		"""
+		Read the checkpoint and return the restored chain.
+		
+		Notes:
+		The number of input frames processed by the restored chain is
+		available as the frames attribute after loading.
+		"""
+		
+		with open(self.path,'r') as fh:
+			data = json.load(fh)
+		
+		if (data.get('version') != self._version):
+			raise ValueError("Unsupported checkpoint version " + str(data.get('version')) + ".")
+		
+		self._frames = data['frames']
+		
+		return sp.from_spec(data['spec'])
+	
+	def remove(self):
+		"""
+		Remove the checkpoint file, if it exists.
+		
+		"""
+		
+		if (self.exists()):
+			os.remove(self.path)
+	
+	def update(self,chain):
+		"""
+		Count an input frame as processed, and write a checkpoint if due.
+		
+		Arguments:
+		chain -- The Chain being streamed.
+		
+		Notes:
+		This is called by Chain.stream after each input frame has been
+		processed by all blocks and the resulting output frame, if any,
+		has been handled by the caller.
+		"""
+		
+		self._frames = self._frames + 1
+		if ((self._frames % self.interval) == 0):
+			self.save(chain)
+	
+	def stream(self,chain,frames=None,n=None):
+		"""
+		Stream frames through the chain, resuming from the checkpoint if it exists.
+		
+		Arguments:
+		chain -- The Chain to stream, used only if there is no checkpoint
+		to resume from.
+		
+		Keyword arguments:
+		frames -- Iterable of input frames, see Chain.stream. When resuming
+		the frames already processed are skipped (default is None).
+		n -- The total number of input frames to process, including those
+		processed before the checkpoint, or None to stream indefinitely
+		(default is None).
+		
+		Notes:
+		When the stream ends a final checkpoint is written, so that a
+		finished run is not repeated when started again.
+		"""
+		
+		reset = True
+		self._frames = 0
+		if (self.exists()):
+			chain = self.load()
+			reset = False
+		
+		remaining = None
+		if (n != None):
+			remaining = max(n - self.frames,0)
+		
+		if (frames != None):
+			frames = self._skip(frames,self.frames,remaining)
+			remaining = None
+		
+		for frame in chain.stream(frames,remaining,reset,checkpoint=self):
+			yield frame
+		
+		self.save(chain)
+	
+	def _skip(self,frames,done,remaining):
+		# Skip the input frames already processed, and stop after the
+		# remaining number of frames.
+		
+		count = 0
+		for frame in frames:
+			if (count >= done):
+				if ((remaining != None) and (count - done >= remaining)):
+					return
+				yield frame
+			count = count + 1
+
+# end class Checkpoint
@@ -0,0 +1,336 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#  chunking.py
+#  Oct 18, 2026 18:41:07 EDT
+#  Copyright 2026
+#         
+#  Andre Young <andre.young@cfa.harvard.edu>
+#  Harvard-Smithsonian Center for Astrophysics
+#  60 Garden Street, Cambridge
+#  MA 02138
+#  
+#  Changelog:
+#  	AY: Created 2026-10-18
+#	AY: Keep packing of stitched outputs 2026-10-18
+
+"""
+Defines an executor that evaluates a network in chunks of samples.
+
+"""
+
+import numpy as np
+
+import FixedWidthBinary as fw
+import SimSWARM.Blocks as bl
+import SimSWARM.Signal as sg
+
+from executor import GraphExecutor
+from planner import Planner
+
+class ChunkedExecutor(object):
+	"""
+	Evaluate a network of blocks within a memory budget, in chunks of samples.
+	
+	The blocks in the network are divided into those of which the output
+	can be computed in chunks of samples (see Block._chunkable), starting
+	from the ADCs, and those that need their input at once (e.g. FFTs).
+	The memory needed by the first part is estimated with a Planner, and
+	if it exceeds the budget the ADCs are set to sample consecutive
+	chunks of their full length in turn. The chunks are either stitched
+	together and used as input to the rest of the network, or, if the
+	output of the root block itself can be computed in chunks and a sink
+	is given, passed on to the sink one at a time:
+		
+		def sink(start,out):
+			out.samples.tofile(fh)
+		ChunkedExecutor(chain,2**30,sink).run()
+	
+	Notes:
+	The estimate counts the sample data of block outputs only, so the
+	budget should leave room for temporary arrays. Blocks upstream of a
+	block that requests their output itself (a DigitalAccumulator or a
+	Parallel with a runner) are evaluated at once. Chunks are sampled in
+	the same way as consecutive outputs of a TimeSteppingADC, so that
+	analog signals with fractional delays may differ slightly from the
+	signal sampled at once.
+	"""
+	
+	@property
+	def root(self):
+		"""
+		Return the block (or list of blocks) evaluated by this executor.
+		
+		"""
+		
+		return self._root
+	
+	@property
+	def budget(self):
+		"""
+		Return the memory budget in bytes.
+		
+		"""
+		
+		return self._budget
+	
+	@property
+	def sink(self):
+		"""
+		Return the sink that receives the output chunks, or None.
+		
+		"""
+		
+		return self._sink
+	
+	@property
+	def chunk_samples(self):
+		"""
+		Return the number of samples per chunk used in the last run.
+		
+		"""
+		
+		return self._chunk_samples
+	
+	@property
+	def chunks(self):
+		"""
+		Return the number of chunks evaluated in the last run.
+		
+		"""
+		
+		return self._chunks
+	
+	def __init__(self,root,budget,sink=None):
+		"""
+		Construct a chunked executor for the network attached upstream of root.
+		
+		Arguments:
+		root -- Block instance (typically a Chain or Parallel), or a list
+		of Block instances.
+		budget -- Memory budget in bytes for the block outputs that are
+		evaluated in chunks.
+		
+		Keyword arguments:
+		sink -- Callable sink(start,out) that receives the output of the
+		root block for each chunk, together with the index of the first
+		sample in the chunk, or None to return the complete output
+		(default is None).
+		
+		"""
+		
+		self._root = root
+		self._budget = budget
+		self._sink = sink
+		self._chunk_samples = None
+		self._chunks = 0
+	
+	def run(self):
+		"""
+		Evaluate the network and return the output of the root block.
+		
+		Notes:
+		If a sink is given, the output is passed to the sink instead and
+		None is returned. If the output of the root cannot be computed in
+		chunks, it is passed to the sink as a single chunk.
+		
+		Time-stepping ADCs that are evaluated in chunks are advanced as if
+		the network was evaluated at once.
+		"""
+		
+		graph = GraphExecutor(self.root)
+		planner = Planner(self.root)
+		planner.run()
+		
+		chunked = self._chunked_blocks(graph,planner)
+		frontier = self._frontier(graph,chunked)
+		adcs = [b for b in graph.nodes if (id(b) in chunked) and isinstance(b,bl.AnalogDigitalConverter)]
+		
+		self._chunk_samples = None
+		self._chunks = 1
+		if (len(adcs) > 0):
+			lengths = set([adc.number_of_samples for adc in adcs])
+			if (len(lengths) > 1):
+				raise ValueError("ADCs evaluated in chunks should all produce the same number of samples.")
+			length = lengths.pop()
+			
+			streamed = (self.sink != None) and (frontier == graph._roots())
+			chunk_samples = self._chunk_size(frontier,length,streamed)
+			if (chunk_samples < length):
+				self._chunk_samples = chunk_samples
+				return self._run_chunks(graph,frontier,adcs,length,streamed)
+		
+		out = graph.run()
+		if (self.sink != None):
+			self.sink(0,out)
+			return None
+		
+		return out
+	
+	def _chunked_blocks(self,graph,planner):
+		# Return the ids of the blocks that can be evaluated in chunks:
+		# blocks with a digital output that are chunkable, use only the
+		# output of other such blocks or analog blocks, and are either an
+		# ADC or downstream of one.
+		
+		deferred = set()
+		for b in graph.nodes:
+			if (b._defers_upstream()):
+				stack = list(b.upstream_blocks())
+				while (len(stack) > 0):
+					u = stack.pop()
+					if (id(u) not in deferred):
+						deferred.add(id(u))
+						stack.extend(u.upstream_blocks())
+		
+		analog = set()
+		chunked = set()
+		for b in graph.nodes:
+			upstream = [id(u) for u in b.upstream_blocks()]
+			if (self._is_analog(planner.plan_of(b))):
+				analog.add(id(b))
+			elif ((id(b) in deferred) or not b._chunkable() or self._has_digital_source(b)):
+				continue
+			elif (not all([(u in analog) or (u in chunked) for u in upstream])):
+				continue
+			elif (isinstance(b,bl.AnalogDigitalConverter) or any([u in chunked for u in upstream])):
+				chunked.add(id(b))
+		
+		return chunked
+	
+	def _frontier(self,graph,chunked):
+		# Return the blocks evaluated in chunks of which the output is
+		# needed by the rest of the network, in order of evaluation.
+		
+		needed = set([id(r) for r in graph._roots()])
+		for b in graph.nodes:
+			if (id(b) not in chunked):
+				needed.update([id(u) for u in b.upstream_blocks()])
+		
+		return [b for b in graph.nodes if (id(b) in chunked) and (id(b) in needed)]
+	
+	def _is_analog(self,p):
+		# Return True if a plan (or list of plans) describes analog output.
+		
+		if (isinstance(p,list)):
+			return all([self._is_analog(item) for item in p])
+		
+		return p.kind == 'analog'
+	
+	def _has_digital_source(self,b):
+		# Return True if a DigitalSignal is attached directly to block b,
+		# since it cannot be split into chunks.
+		
+		src = b.__dict__.get('_source')
+		if (not isinstance(src,list)):
+			src = [src]
+		
+		return any([isinstance(s,sg.DigitalSignal) for s in src])
+	
+	def _chunk_size(self,frontier,length,streamed):
+		# Return the number of samples per chunk for which the estimated
+		# memory use fits in the budget. Unless the chunks are streamed,
+		# the stitched outputs of the frontier blocks are held as well.
+		
+		planner = Planner(frontier)
+		planner.run()
+		if (planner.peak_bytes == 0):
+			return length
+		
+		stitched = 0
+		if (not streamed):
+			stitched = sum([planner.node_bytes(b) for b in frontier])
+		
+		chunk_samples = int(np.floor(1.0 * (self.budget - stitched) * length / planner.peak_bytes))
+		if (chunk_samples < 1):
+			raise ValueError("Memory budget of {:d} bytes is too small, the stitched outputs alone take {:d} bytes.".format(int(self.budget),stitched))
+		
+		return chunk_samples
+	
+	def _run_chunks(self,graph,frontier,adcs,length,streamed):
+		# Evaluate the frontier blocks in chunks, then either stream the
+		# chunks to the sink or stitch them and evaluate the rest of the
+		# network.
+		
+		offsets = [adc.time_offset for adc in adcs]
+		stitched = None
+		chunk_graph = GraphExecutor(frontier)
+		self._chunks = 0
+		try:
+			for start in range(0,length,self.chunk_samples):
+				n = min(self.chunk_samples,length - start)
+				for ii in range(0,len(adcs)):
+					adcs[ii]._number_of_samples = n
+					adcs[ii]._time_offset = offsets[ii] + 1.0 * start / adcs[ii].sample_rate
+				
+				out = chunk_graph.run()
+				self._chunks = self._chunks + 1
+				if (streamed):
+					if (not isinstance(self.root,list)):
+						out = out[0]
+					self.sink(start,out)
+					continue
+				
+				if (stitched == None):
+					stitched = [self._allocate(o,length) for o in out]
+				for ii in range(0,len(out)):
+					self._store(stitched[ii],out[ii],start)
+		finally:
+			for ii in range(0,len(adcs)):
+				adcs[ii]._number_of_samples = length
+				adcs[ii]._time_offset = offsets[ii]
+		
+		for adc in adcs:
+			if (isinstance(adc,bl.TimeSteppingADC)):
+				adc.step_in_time(adc.number_of_samples / adc.sample_rate)
+		
+		if (streamed):
+			return None
+		
+		outputs = dict()
+		for ii in range(0,len(frontier)):
+			outputs[frontier[ii]] = self._assemble(stitched[ii])
+		
+		out = graph.run(outputs)
+		if (self.sink != None):
+			self.sink(0,out)
+			return None
+		
+		return out
+	
+	def _allocate(self,out,length):
+		# Allocate sample arrays for the complete output of a block, given
+		# the output for its first chunk.
+		
+		if (isinstance(out,list)):
+			return [self._allocate(o,length) for o in out]
+		
+		if (not isinstance(out,sg.DigitalSignal)):
+			raise TypeError("Only DigitalSignal outputs can be stitched, not " + type(out).__name__ + ".")
+		
+		samples = out.samples
+		force_complex = isinstance(out.samples_word,fw.WordComplex)
+		
+		return {'samples': np.empty(length,dtype=samples.dtype), 'rate': out.sample_rate, 'precision': out.precision, 'force_complex': force_complex,
+			'packed': out.is_packed}
+	
+	def _store(self,buf,out,start):
+		# Copy the output for a chunk into the allocated arrays.
+		
+		if (isinstance(buf,list)):
+			for ii in range(0,len(buf)):
+				self._store(buf[ii],out[ii],start)
+			return
+		
+		samples = out.samples
+		buf['samples'][start:(start + samples.size)] = samples
+	
+	def _assemble(self,buf):
+		# Construct the complete output from the stitched arrays.
+		
+		if (isinstance(buf,list)):
+			return [self._assemble(b) for b in buf]
+		
+		return sg.DigitalSignal(buf['rate'],buf['precision'],buf['samples'],force_complex=buf['force_complex'],packed=buf['packed'])
+
+# end class ChunkedExecutor
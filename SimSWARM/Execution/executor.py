@@ -0,0 +1,423 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#  executor.py
+#  Oct 18, 2026 11:02:48 EDT
+#  Copyright 2026
+#         
+#  Andre Young <andre.young@cfa.harvard.edu>
+#  Harvard-Smithsonian Center for Astrophysics
+#  60 Garden Street, Cambridge
+#  MA 02138
+#  
+#  Changelog:
+#  	AY: Created 2026-10-18
+#	AY: Iterative compilation and evaluation of the graph 2026-10-18
+#	AY: Added outputs computed in advance to GraphExecutor.run 2026-10-18
+#	AY: Record block outputs in telemetry 2026-10-18
+#	AY: Keep outputs used by deferred consumers 2026-10-18
+
+"""
+Defines executors that evaluate a network of blocks as a graph.
+
+"""
+
+import threading
+
+import SimSWARM.Blocks as bl
+
+class GraphExecutor(object):
+	"""
+	Evaluate a network of blocks, computing the output of each block once.
+	
+	The network attached upstream of the given root block is compiled
+	into a directed acyclic graph. When the graph is run, the output of
+	each block is computed at most once, and shared by all blocks that
+	use it as input. Outputs may be requested from several threads at 
+	once, e.g. by a Parallel with a ThreadPoolRunner.
+	"""
+	
+	@property
+	def root(self):
+		"""
+		Return the block (or list of blocks) of which the output is computed by this executor.
+		
+		"""
+		
+		return self._root
+	
+	@property
+	def nodes(self):
+		"""
+		Return the blocks in the graph, ordered such that each block comes after all of its inputs.
+		
+		"""
+		
+		return self._nodes
+	
+	@property
+	def computed(self):
+		"""
+		Return the list of blocks computed during the last run, in order of computation.
+		
+		"""
+		
+		return self._computed
+	
+	@property
+	def reused(self):
+		"""
+		Return a dictionary that maps block id to the number of times its output was reused during the last run.
+		
+		"""
+		
+		return dict([(key,n - 1) for key,n in self._requests.items() if (n > 1)])
+	
+	def __init__(self,root):
+		"""
+		Construct an executor for the network attached upstream of root.
+		
+		Arguments:
+		root -- Block instance (typically a Chain or Parallel) of which
+		the output is requested, or a list of Block instances.
+		
+		Notes:
+		If root is a list, the outputs of all blocks in the list are 
+		computed in the same run, so that blocks shared between them are
+		computed only once.
+		
+		The graph is compiled on construction, and needs to be compiled
+		again (by calling compile) if blocks are added or sources attached
+		afterwards.
+		"""
+		
+		self._root = root
+		self._computed = list()
+		self._requests = dict()
+		self._memo = None
+		self._pending = None
+		self._lock = threading.Lock()
+		self.compile()
+	
+	def compile(self):
+		"""
+		Compile the network upstream of the root block into a graph.
+		
+		Notes:
+		Blocks are collected in depth-first order, starting from the root
+		and following the result of Block.upstream_blocks, such that each
+		block in nodes comes after all the blocks it depends on. The 
+		number of consumers for each block is also counted. The search 
+		uses an explicit stack rather than recursion, so that the depth 
+		of the network is not limited by the Python recursion limit.
+		"""
+		
+		self._nodes = list()
+		self._consumers = dict()
+		visited = set()
+		for r in self._roots():
+			if (id(r) in visited):
+				continue
+			
+			visited.add(id(r))
+			stack = [(r,iter(r.upstream_blocks()))]
+			while (len(stack) > 0):
+				b,upstream = stack[-1]
+				for u in upstream:
+					self._consumers[id(u)] = self._consumers.get(id(u),0) + 1
+					if (id(u) not in visited):
+						visited.add(id(u))
+						stack.append((u,iter(u.upstream_blocks())))
+						break
+				else:
+					# all upstream blocks of b have been added
+					stack.pop()
+					self._consumers.setdefault(id(b),0)
+					self._nodes.append(b)
+	
+	def _roots(self):
+		# Return the root block(s) as a list.
+		
+		if (isinstance(self.root,list)):
+			return self.root
+		
+		return [self.root]
+	
+	def consumers(self,b):
+		"""
+		Return the number of blocks in the graph that use the output of b.
+		
+		"""
+		
+		return self._consumers.get(id(b),0)
+	
+	def run(self,outputs=None):
+		"""
+		Evaluate the graph and return the output of the root block.
+		
+		Keyword arguments:
+		outputs -- Dictionary that maps blocks in the graph to outputs 
+		computed in advance, e.g. by a ChunkedExecutor. These blocks, and
+		the blocks upstream of them, are not evaluated (default is None).
+		
+		Notes:
+		If the root is a list of blocks, a list containing the output of
+		each of those blocks is returned.
+		
+		While the graph is evaluated this executor is installed as the 
+		Block executor, so that all source outputs requested by blocks
+		are resolved through the resolve method.
+		
+		The blocks are evaluated iteratively in the order of nodes, so 
+		that the output of every source is available by the time a block
+		requests it, and no chain of nested output calls is built up. The
+		output of a block is released as soon as all blocks that use it
+		have been evaluated, unless it is upstream of a DigitalAccumulator
+		or of a Parallel with a runner, which may request it at any time.
+		Blocks that are evaluated by a batchable Parallel (see 
+		Parallel.batch_output) are left to that Parallel, and blocks 
+		upstream of a DigitalAccumulator or of a Parallel with a runner 
+		are only evaluated when requested.
+		"""
+		
+		self._memo = dict()
+		self._pending = dict()
+		self._computed = list()
+		self._requests = dict()
+		if (outputs != None):
+			for b,out in outputs.items():
+				self._memo[id(b)] = out
+		
+		previous = bl.Block._set_executor(self)
+		try:
+			self._evaluate_nodes()
+			result = [self.resolve(r) for r in self._roots()]
+		finally:
+			bl.Block._set_executor(previous)
+			self._memo = None
+			self._pending = None
+		
+		if (isinstance(self.root,list)):
+			return result
+		
+		return result[0]
+	
+	def _schedule(self):
+		# Return the ids of the blocks to evaluate in advance, the number
+		# of times the output of each of them is used by those blocks, and
+		# the ids of the blocks evaluated as part of a batch. Blocks of 
+		# which the output is already available are not followed upstream.
+		
+		eager = set([id(r) for r in self._roots()])
+		uses = dict()
+		stack = list(self._roots())
+		while (len(stack) > 0):
+			b = stack.pop()
+			if (b._defers_upstream() or (id(b) in self._memo)):
+				continue
+			
+			for u in b.upstream_blocks():
+				uses[id(u)] = uses.get(id(u),0) + 1
+				if (id(u) not in eager):
+					eager.add(id(u))
+					stack.append(u)
+		
+		batched = set()
+		for b in self.nodes:
+			if ((id(b) in eager) and isinstance(b,bl.Parallel) and (b.runner == None) and b.is_batchable()):
+				batched.update([id(bb) for bb in b._batch_blocks()])
+		
+		return eager,uses,batched
+	
+	def _evaluate_nodes(self):
+		# Evaluate the blocks in order, and release outputs that are no 
+		# longer needed.
+		
+		eager,uses,batched = self._schedule()
+		roots = set([id(r) for r in self._roots()])
+		provided = set(self._memo.keys())
+		kept = self._deferred_upstream()
+		
+		def consumed(b):
+			# Release the outputs used by b if b was their last consumer.
+			if (b._defers_upstream() or (id(b) in provided)):
+				return
+			
+			for u in b.upstream_blocks():
+				uses[id(u)] = uses[id(u)] - 1
+				if ((uses[id(u)] == 0) and (id(u) not in roots) and (id(u) not in kept)):
+					with self._lock:
+						self._memo.pop(id(u),None)
+						self._pending.pop(id(u),None)
+		
+		waiting = list()
+		for b in self.nodes:
+			if (id(b) not in eager):
+				continue
+			
+			if (id(b) not in self._memo):
+				if (id(b) in batched):
+					# output is provided when the Parallel is evaluated
+					waiting.append(b)
+					continue
+				
+				self._fetch(b,False)
+			
+			consumed(b)
+			
+			for w in list(waiting):
+				if (id(w) in self._memo):
+					consumed(w)
+					waiting.remove(w)
+	
+	def _deferred_upstream(self):
+		# Return the ids of all blocks upstream of a block that requests the
+		# output of its upstream blocks itself (see Block._defers_upstream).
+		# Their outputs may be requested at any time while the graph is
+		# evaluated, and are never released.
+		
+		kept = set()
+		stack = [b for b in self.nodes if b._defers_upstream()]
+		while (len(stack) > 0):
+			b = stack.pop()
+			for u in b.upstream_blocks():
+				if (id(u) not in kept):
+					kept.add(id(u))
+					stack.append(u)
+		
+		return kept
+	
+	def resolve(self,b):
+		"""
+		Return the output of block b, computing it only if not yet available.
+		
+		Arguments:
+		b -- Block instance.
+		
+		Notes:
+		If the output of b is being computed in another thread, this 
+		method waits for that computation to finish.
+		"""
+		
+		return self._fetch(b,True)
+	
+	def _fetch(self,b,request):
+		# Return the output of b, computing it if needed. If request is
+		# True the call is counted as a request for the output, otherwise
+		# it is an evaluation in advance of any request.
+		
+		key = id(b)
+		with self._lock:
+			if (key in self._memo):
+				self._requests[key] = self._requests.get(key,0) + 1
+				return self._memo[key]
+			
+			done = self._pending.get(key)
+			if (done == None):
+				self._pending[key] = threading.Event()
+		
+		if (done != None):
+			done.wait()
+			with self._lock:
+				if (key not in self._memo):
+					raise RuntimeError("Output of " + type(b).__name__ + " failed in another thread.")
+				self._requests[key] = self._requests.get(key,0) + 1
+				return self._memo[key]
+		
+		try:
+			out = bl.Block._measure(b,b.output)
+			with self._lock:
+				self._memo[key] = out
+				self._computed.append(b)
+				if (request):
+					self._requests[key] = self._requests.get(key,0) + 1
+		finally:
+			self._pending[key].set()
+		
+		return out
+	
+	def has_output(self,b):
+		"""
+		Return True if the output of block b is available or being computed.
+		
+		"""
+		
+		with self._lock:
+			return ((id(b) in self._memo) or (id(b) in self._pending))
+	
+	def provide(self,b,out):
+		"""
+		Store the output of block b, computed outside of resolve.
+		
+		Arguments:
+		b -- Block instance.
+		out -- The output of b.
+		
+		Notes:
+		This is used when the outputs of several blocks are computed
+		together, e.g. by Parallel.batch_output, so that later requests
+		for the output of each block are served from the stored result.
+		"""
+		
+		with self._lock:
+			if (id(b) not in self._memo):
+				self._memo[id(b)] = out
+				self._computed.append(b)
+	
+	def upstream_outputs(self,b):
+		"""
+		Return the available outputs of blocks upstream of block b.
+		
+		Arguments:
+		b -- Block instance.
+		
+		Notes:
+		The result is a dictionary that maps blocks to their outputs, as
+		can be passed to run. Blocks upstream of a block with an available
+		output are not included. This is used to evaluate paths elsewhere,
+		e.g. by a ProcessPoolRunner, without computing outputs that are 
+		shared with other consumers a second time.
+		"""
+		
+		found = dict()
+		with self._lock:
+			if (self._memo == None):
+				return found
+			
+			visited = set()
+			stack = list(b.upstream_blocks())
+			while (len(stack) > 0):
+				u = stack.pop()
+				if (id(u) in visited):
+					continue
+				
+				visited.add(id(u))
+				if (id(u) in self._memo):
+					found[u] = self._memo[id(u)]
+				else:
+					stack.extend(u.upstream_blocks())
+		
+		return found
+	
+	def report(self):
+		"""
+		Return a string summarizing which blocks were computed and reused in the last run.
+		
+		"""
+		
+		computed = set([id(b) for b in self.computed])
+		lines = list()
+		lines.append("{:>5s}  {:<28s} {:>9s} {:>7s}".format('node','block','consumers','reused'))
+		for ii in range(0,len(self.nodes)):
+			b = self.nodes[ii]
+			if (id(b) in computed):
+				reused = "{:7d}".format(self.reused.get(id(b),0))
+			else:
+				reused = "{:>7s}".format('-')
+			lines.append("{:5d}  {:<28s} {:9d} {:s}".format(ii,type(b).__name__,self.consumers(b),reused))
+		
+		lines.append("{:d} of {:d} blocks computed, {:d} outputs reused.".format(len(self.computed),len(self.nodes),sum(self.reused.values())))
+		
+		return "\n".join(lines)
+
+# end class GraphExecutor
@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#  pipeline.py
+#  Oct 18, 2026 19:20:44 EDT
+#  Copyright 2026
+#         
+#  Andre Young <andre.young@cfa.harvard.edu>
+#  Harvard-Smithsonian Center for Astrophysics
+#  60 Garden Street, Cambridge
+#  MA 02138
+#  
+#  Changelog:
+#  	AY: Created 2026-10-18
+#	AY: Record frames and queue depths in telemetry 2026-10-18
+
+"""
+Defines a pipeline that streams frames through the stages of a Chain concurrently.
+
+"""
+
+import Queue
+import sys
+import threading
+
+import SimSWARM.Blocks as bl
+
+class Pipeline(object):
+	"""
+	Stream frames through a Chain with each stage running in its own thread.
+	
+	The frames generated by the chain (see Chain.stream) are pushed through
+	its blocks by a separate thread for each block, connected by bounded
+	queues. While a block processes frame k, the block before it can
+	process frame k+1 and the caller can handle the output for frame k-1,
+	e.g. write it to disk. Most of the work in a block is done in NumPy
+	routines that release the GIL, so the stages run concurrently. When a
+	queue is full the stage feeding it waits, so that the number of frames
+	in memory is bounded by the number of stages and the queue size:
+		
+		for frame in Pipeline(chain).stream(n=1000):
+			write(frame)
+	
+	Notes:
+	Each block is only used by its own stage, so blocks that carry state
+	from one frame to the next (e.g. DigitalAccumulator) produce the same
+	output as with Chain.stream, in the same order.
+	"""
+	
+	# Marks the end of the stream in a queue.
+	_end = object()
+	
+	# Interval in seconds at which waiting stages check whether the
+	# pipeline was stopped.
+	_poll_interval = 0.1
+	
+	@property
+	def chain(self):
+		"""
+		Return the Chain streamed by this pipeline.
+		
+		"""
+		
+		return self._chain
+	
+	@property
+	def maxsize(self):
+		"""
+		Return the maximum number of frames waiting between two stages.
+		
+		"""
+		
+		return self._maxsize
+	
+	def __init__(self,chain,maxsize=2):
+		"""
+		Construct a pipeline for the given chain.
+		
+		Arguments:
+		chain -- Chain instance.
+		
+		Keyword arguments:
+		maxsize -- The maximum number of frames waiting in the queue
+		between two stages (default is 2).
+		
+		"""
+		
+		if (maxsize < 1):
+			raise ValueError("Pipeline queue size should be at least one frame.")
+		
+		self._chain = chain
+		self._maxsize = maxsize
+	
+	def stream(self,frames=None,n=None,reset=True):
+		"""
+		Generate output frames by pushing a stream of frames through the chain.
+		
+		Keyword arguments:
+		frames -- Iterable of input frames, see Chain.stream (default is
+		None).
+		n -- The number of frames to generate if frames is None, see
+		Chain.stream (default is None).
+		reset -- If True, the streaming state of the blocks that frames
+		are pushed through is reset before streaming (default is True).
+		
+		Notes:
+		An exception raised in any of the stages is raised again by this
+		generator. If the caller stops iterating before the end of the
+		stream, the stages are stopped as well.
+		"""
+		
+		frames,blocks = self.chain._stream_source(frames,n)
+		if (reset):
+			for b in blocks:
+				b.reset()
+		
+		stop = threading.Event()
+		queues = [Queue.Queue(self.maxsize) for ii in range(0,len(blocks) + 1)]
+		threads = [threading.Thread(target=self._produce,args=(frames,queues[0],stop))]
+		for ii in range(0,len(blocks)):
+			threads.append(threading.Thread(target=self._work,args=(blocks[ii],queues[ii],queues[ii+1],stop)))
+		
+		for t in threads:
+			t.daemon = True
+			t.start()
+		
+		try:
+			while (True):
+				item = self._get(queues[-1],stop)
+				if (item is self._end):
+					break
+				elif (isinstance(item,_Failure)):
+					raise item.exc_info[0],item.exc_info[1],item.exc_info[2]
+				
+				telemetry = bl.Block._telemetry
+				if (telemetry != None):
+					telemetry.frame_done()
+					for ii in range(0,len(queues)):
+						telemetry.gauge('queue_depth',queues[ii].qsize(),stage=str(ii))
+				
+				yield item
+		finally:
+			stop.set()
+			for t in threads:
+				t.join()
+	
+	def _produce(self,frames,out_queue,stop):
+		# Stage that puts the input frames in the first queue.
+		
+		try:
+			for frame in frames:
+				if (not self._put(out_queue,frame,stop)):
+					return
+		except:
+			self._put(out_queue,_Failure(sys.exc_info()),stop)
+			return
+		
+		self._put(out_queue,self._end,stop)
+	
+	def _work(self,b,in_queue,out_queue,stop):
+		# Stage that processes each frame from in_queue by block b, and
+		# puts the resulting frames in out_queue.
+		
+		while (True):
+			frame = self._get(in_queue,stop)
+			if ((frame is self._end) or isinstance(frame,_Failure)):
+				self._put(out_queue,frame,stop)
+				return
+			elif (frame == None):
+				# the pipeline was stopped
+				return
+			
+			try:
+				frame = bl.Block._measure(b,b.process,frame)
+			except:
+				self._put(out_queue,_Failure(sys.exc_info()),stop)
+				return
+			
+			if ((frame != None) and not self._put(out_queue,frame,stop)):
+				return
+	
+	def _put(self,q,item,stop):
+		# Put item in the queue, waiting while it is full. Return False if
+		# the pipeline was stopped before the item could be put.
+		
+		while (not stop.is_set()):
+			try:
+				q.put(item,True,self._poll_interval)
+				return True
+			except Queue.Full:
+				pass
+		
+		return False
+	
+	def _get(self,q,stop):
+		# Get an item from the queue, waiting while it is empty. Return
+		# None if the pipeline was stopped before an item was available.
+		
+		while (not stop.is_set()):
+			try:
+				return q.get(True,self._poll_interval)
+			except Queue.Empty:
+				pass
+		
+		return None
+
+# end class Pipeline
+
+class _Failure(object):
+	# Carries an exception raised in a stage to the end of the pipeline.
+	
+	def __init__(self,exc_info):
+		self.exc_info = exc_info
+
+# end class _Failure
@@ -0,0 +1,235 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#  planner.py
+#  Oct 18, 2026 16:27:51 EDT
+#  Copyright 2026
+#         
+#  Andre Young <andre.young@cfa.harvard.edu>
+#  Harvard-Smithsonian Center for Astrophysics
+#  60 Garden Street, Cambridge
+#  MA 02138
+#  
+#  Changelog:
+#  	AY: Created 2026-10-18
+#	AY: Install the planner in the current thread only 2026-10-18
+
+"""
+Defines a planner that estimates word formats and memory use of a network.
+
+"""
+
+import SimSWARM.Blocks as bl
+
+from executor import GraphExecutor
+
+class Planner(object):
+	"""
+	Plan a network of blocks without generating any signal data.
+	
+	The network is compiled into a graph as for GraphExecutor, and the
+	plan of each block (see Block.plan) is computed once, in the order in
+	which the blocks would be evaluated. From the plans the memory needed
+	for the output of each block is estimated, as well as the peak memory
+	during evaluation, assuming that the output of a block is released
+	once all blocks using it have been evaluated.
+	"""
+	
+	@property
+	def root(self):
+		"""
+		Return the block (or list of blocks) that is planned.
+		
+		"""
+		
+		return self._root
+	
+	@property
+	def nodes(self):
+		"""
+		Return the blocks in the graph, in order of evaluation.
+		
+		"""
+		
+		return self._graph.nodes
+	
+	@property
+	def peak_bytes(self):
+		"""
+		Return the estimated peak memory use during evaluation, in bytes.
+		
+		"""
+		
+		return self._peak_bytes
+	
+	def __init__(self,root):
+		"""
+		Construct a planner for the network attached upstream of root.
+		
+		Arguments:
+		root -- Block instance (typically a Chain or Parallel), or a list
+		of Block instances.
+		
+		"""
+		
+		self._root = root
+		self._graph = GraphExecutor(root)
+		self._plans = dict()
+		self._peak_bytes = 0
+	
+	def run(self):
+		"""
+		Plan the graph and return the plan of the root block.
+		
+		Notes:
+		If the root is a list of blocks, a list containing the plan of
+		each of those blocks is returned.
+		"""
+		
+		self._plans = dict()
+		
+		previous = bl.Block._set_planner(self)
+		try:
+			for b in self.nodes:
+				self.resolve(b)
+		finally:
+			bl.Block._set_planner(previous)
+		
+		self._peak_bytes = self._estimate_peak()
+		
+		if (isinstance(self.root,list)):
+			return [self.plan_of(r) for r in self.root]
+		
+		return self.plan_of(self.root)
+	
+	def resolve(self,b):
+		"""
+		Return the plan of block b, computing it only if not yet available.
+		
+		"""
+		
+		key = id(b)
+		if (key not in self._plans):
+			self._plans[key] = b.plan()
+		
+		return self._plans[key]
+	
+	def plan_of(self,b):
+		"""
+		Return the plan of block b computed during the last run.
+		
+		"""
+		
+		return self._plans[id(b)]
+	
+	def node_bytes(self,b):
+		"""
+		Return the estimated memory used by the output of block b, in bytes.
+		
+		Notes:
+		The output of a Chain or Parallel refers to the output of blocks
+		inside it, and takes no memory of its own.
+		"""
+		
+		if (self._is_container(b)):
+			return 0
+		
+		return self._plan_bytes(self.plan_of(b))
+	
+	def overflows(self):
+		"""
+		Return the list of blocks whose output words are wider than 63 bits.
+		
+		"""
+		
+		return [b for b in self.nodes if (not self._is_container(b)) and self._plan_overflows(self.plan_of(b))]
+	
+	def _is_container(self,b):
+		# Return True if the output of b is that of the blocks inside it.
+		
+		return isinstance(b,(bl.Chain,bl.Parallel))
+	
+	def _plan_bytes(self,p):
+		# Return the memory for a plan, or a list of plans.
+		
+		if (isinstance(p,list)):
+			return sum([self._plan_bytes(item) for item in p])
+		
+		return p.nbytes
+	
+	def _plan_overflows(self,p):
+		# Return True if any word width in a plan (or list) is too wide.
+		
+		if (isinstance(p,list)):
+			return any([self._plan_overflows(item) for item in p])
+		
+		return p.overflows
+	
+	def _estimate_peak(self):
+		# Step through the nodes in order of evaluation, adding the output
+		# of each block to the live memory and releasing the output of its
+		# inputs once their last consumer has been evaluated. The output
+		# of a Chain or Parallel keeps the outputs of the blocks inside it
+		# alive until it is released itself. Outputs of root blocks are
+		# never released.
+		
+		roots = set([id(r) for r in self._graph._roots()])
+		remaining = dict([(id(b),self._graph.consumers(b)) for b in self.nodes])
+		state = {'live': 0}
+		
+		def release(u):
+			remaining[id(u)] = remaining[id(u)] - 1
+			if ((remaining[id(u)] == 0) and (id(u) not in roots)):
+				state['live'] = state['live'] - self.node_bytes(u)
+				if (self._is_container(u)):
+					for uu in u.upstream_blocks():
+						release(uu)
+		
+		peak = 0
+		for b in self.nodes:
+			state['live'] = state['live'] + self.node_bytes(b)
+			peak = max(peak,state['live'])
+			if (not self._is_container(b)):
+				for u in b.upstream_blocks():
+					release(u)
+		
+		return peak
+	
+	def report(self):
+		"""
+		Return a string summarizing the plan of each block and the memory estimates.
+		
+		"""
+		
+		lines = list()
+		lines.append("{:>5s}  {:<24s} {:<8s} {:>10s} {:>8s} {:>8s} {:>14s}".format('node','block','kind','samples','type','width','bytes'))
+		for ii in range(0,len(self.nodes)):
+			b = self.nodes[ii]
+			p = self.plan_of(b)
+			if (isinstance(p,list)):
+				p = p[0] if (len(p) > 0) else None
+				name = "{:s} x{:d}".format(type(b).__name__,len(self.plan_of(b)))
+			else:
+				name = type(b).__name__
+			
+			if ((p == None) or (p.kind == 'analog')):
+				kind = 'analog' if (p != None) else '-'
+				samples,sample_type,width = '-','-','-'
+			else:
+				kind = p.kind
+				samples = str(p.number_of_samples)
+				sample_type = 'complex' if p.is_complex else 'real'
+				width = str(p.precision.width)
+				if (self._plan_overflows(self.plan_of(b))):
+					width = width + '!'
+			
+			lines.append("{:5d}  {:<24s} {:<8s} {:>10s} {:>8s} {:>8s} {:14d}".format(ii,name,kind,samples,sample_type,width,self.node_bytes(b)))
+		
+		lines.append("Estimated peak memory {:d} bytes.".format(self.peak_bytes))
+		overflows = self.overflows()
+		if (len(overflows) > 0):
+			lines.append("{:d} block(s) produce words wider than 63 bits, marked with '!'.".format(len(overflows)))
+		
+		return "\n".join(lines)
+
+# end class Planner
@@ -0,0 +1,354 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#  profiling.py
+#  Oct 18, 2026 15:41:09 EDT
+#  Copyright 2026
+#         
+#  Andre Young <andre.young@cfa.harvard.edu>
+#  Harvard-Smithsonian Center for Astrophysics
+#  60 Garden Street, Cambridge
+#  MA 02138
+#  
+#  Changelog:
+#  	AY: Created 2026-10-18
+#	AY: Count stored bytes of packed and narrow sample words 2026-10-18
+
+"""
+Defines instrumentation for profiling blocks and signals.
+
+"""
+
+import collections
+import json
+import threading
+import time
+
+import numpy as np
+
+import SimSWARM.Blocks as bl
+import SimSWARM.Signal as sg
+
+# tracemalloc is used to measure allocated memory if available (Python 3,
+# or the pytracemalloc backport), otherwise only output sizes are recorded
+try:
+	import tracemalloc
+except ImportError:
+	tracemalloc = None
+
+class Profiler(object):
+	"""
+	Record time, calls, memory and samples processed per block and signal.
+	
+	While the profiler is enabled, the output method of every Block class
+	and the sample method of every AnalogSignal class are replaced by
+	wrappers that record each call. The original methods are restored
+	when the profiler is disabled, so that profiling costs nothing when
+	it is not in use. The profiler can be used as a context manager:
+		
+		with Profiler() as prof:
+			out = chain.output()
+		print prof.report()
+	
+	Notes:
+	Only calls made in the current process are recorded, i.e. blocks
+	evaluated by a ProcessPoolRunner are not profiled.
+	"""
+	
+	# Methods that are instrumented, for each baseclass.
+	_instrumented = ((bl.Block,('output','_batch_output')),(sg.AnalogSignal,('sample',)))
+	
+	# Fields in each record, in the order used for reports.
+	_fields = ('name','method','calls','total_time','self_time','samples','output_bytes','allocated_bytes')
+	
+	@property
+	def enabled(self):
+		"""
+		Return True if the profiler is currently recording.
+		
+		"""
+		
+		return self._originals != None
+	
+	@property
+	def trace_memory(self):
+		"""
+		Return True if allocated memory is measured using tracemalloc.
+		
+		"""
+		
+		return self._trace_memory
+	
+	def __init__(self,trace_memory=True):
+		"""
+		Construct a profiler.
+		
+		Keyword arguments:
+		trace_memory -- Measure the memory allocated during each call using
+		tracemalloc, if that module is available (default is True).
+		
+		"""
+		
+		self._trace_memory = trace_memory and (tracemalloc != None)
+		self._originals = None
+		self._started_tracing = False
+		self._lock = threading.Lock()
+		self._local = threading.local()
+		self.clear()
+	
+	def __enter__(self):
+		self.enable()
+		return self
+	
+	def __exit__(self,exc_type,exc_value,traceback):
+		self.disable()
+		return False
+	
+	def clear(self):
+		"""
+		Discard all recorded results.
+		
+		"""
+		
+		self._records = dict()
+		self._labels = dict()
+		self._label_count = dict()
+	
+	def enable(self):
+		"""
+		Install the instrumentation and start recording.
+		
+		"""
+		
+		if (self.enabled):
+			return
+		
+		self._originals = list()
+		for base,methods in self._instrumented:
+			for cls in self._classes(base):
+				for method in methods:
+					if (method in cls.__dict__):
+						original = cls.__dict__[method]
+						self._originals.append((cls,method,original))
+						setattr(cls,method,self._wrap(original,method))
+		
+		if (self.trace_memory and not tracemalloc.is_tracing()):
+			tracemalloc.start()
+			self._started_tracing = True
+	
+	def disable(self):
+		"""
+		Remove the instrumentation and stop recording.
+		
+		"""
+		
+		if (not self.enabled):
+			return
+		
+		for cls,method,original in self._originals:
+			setattr(cls,method,original)
+		
+		self._originals = None
+		
+		if (self._started_tracing):
+			tracemalloc.stop()
+			self._started_tracing = False
+	
+	def _classes(self,base):
+		# Return base and all classes derived from it.
+		
+		result = [base]
+		for cls in base.__subclasses__():
+			for c in self._classes(cls):
+				if (c not in result):
+					result.append(c)
+		
+		return result
+	
+	def _wrap(self,original,method):
+		# Return a function that records calls to original.
+		
+		profiler = self
+		def wrapper(obj,*args,**kwargs):
+			return profiler._call(original,method,obj,args,kwargs)
+		
+		wrapper.__name__ = original.__name__
+		wrapper.__doc__ = original.__doc__
+		
+		return wrapper
+	
+	def _call(self,original,method,obj,args,kwargs):
+		# Call original and record the time, memory and samples for the
+		# call. Calls made by an overriding method to the overridden one
+		# (e.g. TimeSteppingADC.output to AnalogDigitalConverter.output)
+		# are recorded only once.
+		
+		stack = getattr(self._local,'stack',None)
+		if (stack == None):
+			stack = list()
+			self._local.stack = stack
+		
+		if ((len(stack) > 0) and (stack[-1][0] is obj) and (stack[-1][1] == method)):
+			return original(obj,*args,**kwargs)
+		
+		entry = [obj,method,0.0]
+		stack.append(entry)
+		if (self.trace_memory):
+			mem_start = tracemalloc.get_traced_memory()[0]
+		t_start = time.time()
+		try:
+			result = original(obj,*args,**kwargs)
+		finally:
+			elapsed = time.time() - t_start
+			stack.pop()
+			if (len(stack) > 0):
+				stack[-1][2] = stack[-1][2] + elapsed
+		
+		allocated = None
+		if (self.trace_memory):
+			allocated = tracemalloc.get_traced_memory()[0] - mem_start
+		
+		if (method == 'sample'):
+			samples = args[1] if (len(args) > 1) else kwargs.get('n',0)
+		else:
+			samples = self._count_samples(result)
+		
+		self._record(obj,method,elapsed,elapsed - entry[2],samples,self._count_bytes(result),allocated)
+		
+		return result
+	
+	def _record(self,obj,method,total_time,self_time,samples,output_bytes,allocated):
+		# Add a call to the record for obj and method.
+		
+		with self._lock:
+			key = (id(obj),method)
+			rec = self._records.get(key)
+			if (rec == None):
+				rec = dict([(f,0) for f in self._fields])
+				rec['name'] = self._label(obj)
+				rec['method'] = method
+				rec['class'] = type(obj).__name__
+				if (allocated == None):
+					rec['allocated_bytes'] = None
+				self._records[key] = rec
+			
+			rec['calls'] = rec['calls'] + 1
+			rec['total_time'] = rec['total_time'] + total_time
+			rec['self_time'] = rec['self_time'] + self_time
+			rec['samples'] = rec['samples'] + samples
+			rec['output_bytes'] = rec['output_bytes'] + output_bytes
+			if (allocated != None):
+				rec['allocated_bytes'] = rec['allocated_bytes'] + allocated
+	
+	def _label(self,obj):
+		# Return a name for obj that is unique within this profiler, e.g.
+		# "DigitalFFT[2]" for the third DigitalFFT instance encountered.
+		
+		label = self._labels.get(id(obj))
+		if (label == None):
+			name = type(obj).__name__
+			count = self._label_count.get(name,0)
+			self._label_count[name] = count + 1
+			label = "{:s}[{:d}]".format(name,count)
+			self._labels[id(obj)] = label
+		
+		return label
+	
+	def _count_samples(self,out):
+		# Return the number of samples in a block output.
+		
+		if (isinstance(out,list)):
+			return sum([self._count_samples(o) for o in out])
+		elif (isinstance(out,sg.DigitalSignalBatch)):
+			return out.number_of_paths * out.number_of_samples
+		elif (isinstance(out,sg.DigitalSignal)):
+			return out.number_of_samples
+		
+		return 0
+	
+	def _count_bytes(self,out):
+		# Return the size of the sample data in an output, in bytes.
+		
+		if (isinstance(out,list)):
+			return sum([self._count_bytes(o) for o in out])
+		elif (isinstance(out,sg.DigitalSignal)):
+			return out.samples_word.nbytes
+		elif (isinstance(out,np.ndarray)):
+			return out.nbytes
+		
+		return 0
+	
+	def results(self,by='block'):
+		"""
+		Return the recorded results as a list of dictionaries.
+		
+		Keyword arguments:
+		by -- Either 'block' to report each block and signal instance
+		separately, or 'class' to aggregate results per class (default
+		is 'block').
+		
+		Notes:
+		Each dictionary contains the name of the block or signal, the
+		instrumented method, the number of calls, the total time (which
+		includes time spent in upstream blocks and signals) and self time
+		(which excludes it) in seconds, the number of samples produced,
+		the size of the output sample data in bytes, and the net memory
+		allocated during the calls in bytes (None if not measured). The
+		list is sorted by decreasing self time.
+		"""
+		
+		if (by not in ('block','class')):
+			raise ValueError("Results can only be reported by 'block' or 'class'.")
+		
+		with self._lock:
+			records = [dict(rec) for rec in self._records.values()]
+		
+		if (by == 'class'):
+			merged = dict()
+			for rec in records:
+				key = (rec['class'],rec['method'])
+				if (key not in merged):
+					rec['name'] = rec['class']
+					merged[key] = rec
+				else:
+					total = merged[key]
+					for f in ('calls','total_time','self_time','samples','output_bytes'):
+						total[f] = total[f] + rec[f]
+					if ((total['allocated_bytes'] != None) and (rec['allocated_bytes'] != None)):
+						total['allocated_bytes'] = total['allocated_bytes'] + rec['allocated_bytes']
+			records = merged.values()
+		
+		result = [collections.OrderedDict([(f,rec[f]) for f in self._fields]) for rec in records]
+		result.sort(key=lambda rec: rec['self_time'],reverse=True)
+		
+		return result
+	
+	def report(self,by='block',fmt='table'):
+		"""
+		Return a report of the recorded results.
+		
+		Keyword arguments:
+		by -- Either 'block' or 'class', see results (default is 'block').
+		fmt -- Either 'table' for a human-readable table or 'json' for a
+		JSON document (default is 'table').
+		
+		"""
+		
+		results = self.results(by)
+		if (fmt == 'json'):
+			return json.dumps(results,indent=1)
+		elif (fmt != 'table'):
+			raise ValueError("Report format can only be 'table' or 'json'.")
+		
+		lines = list()
+		lines.append("{:<32s} {:<14s} {:>7s} {:>10s} {:>10s} {:>12s} {:>12s} {:>12s}".format('name','method','calls','total [s]','self [s]','samples','output [B]','alloc [B]'))
+		for rec in results:
+			if (rec['allocated_bytes'] == None):
+				allocated = "{:>12s}".format('-')
+			else:
+				allocated = "{:12d}".format(rec['allocated_bytes'])
+			lines.append("{:<32s} {:<14s} {:7d} {:10.4f} {:10.4f} {:12d} {:12d} {:s}".format(rec['name'],rec['method'],rec['calls'],rec['total_time'],rec['self_time'],rec['samples'],rec['output_bytes'],allocated))
+		
+		return "\n".join(lines)
+
+# end class Profiler
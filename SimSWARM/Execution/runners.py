@@ -0,0 +1,267 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#  runners.py
+#  Oct 18, 2026 13:20:06 EDT
+#  Copyright 2026
+#         
+#  Andre Young <andre.young@cfa.harvard.edu>
+#  Harvard-Smithsonian Center for Astrophysics
+#  60 Garden Street, Cambridge
+#  MA 02138
+#  
+#  Changelog:
+#  	AY: Created 2026-10-18
+#	AY: Pass sample buffers in shared memory segments 2026-10-18
+#	AY: Pass outputs computed by the executor to worker processes 2026-10-18
+#	AY: Remove shared segments of all paths if one fails 2026-10-18
+
+"""
+Defines runners that evaluate the paths of a Parallel concurrently.
+
+A runner is attached to a Parallel with Parallel.set_runner, after which
+Parallel.output delegates to the evaluate method of the runner.
+
+"""
+
+import multiprocessing
+import multiprocessing.pool
+import sys
+
+import SimSWARM.Blocks as bl
+
+from executor import GraphExecutor
+from shared import share, attach_shared, discard_shared
+
+class ProcessPoolRunner(object):
+	"""
+	Evaluate the paths of a Parallel in a pool of worker processes.
+	
+	Each parallel block, together with the network attached upstream of
+	it, is sent to a worker process where its output is computed. Sample
+	buffers are passed back in shared memory segments (see SharedSegment)
+	rather than being pickled, and are used by the parent process without
+	copying. The mutable state of the blocks in each path (see 
+	Block.get_state) is copied back so that e.g. time-stepping continues
+	as if the paths were evaluated serially.
+	"""
+	
+	@property
+	def workers(self):
+		"""
+		Return the number of worker processes.
+		
+		"""
+		
+		return self._workers
+	
+	def __init__(self,workers=None):
+		"""
+		Construct a process pool runner.
+		
+		Keyword arguments:
+		workers -- The number of worker processes, or None to use the
+		number of CPUs (default is None).
+		
+		Notes:
+		The pool of worker processes is created on first use, and should
+		be shut down by calling close (or by using the runner as a context
+		manager).
+		"""
+		
+		if (workers == None):
+			workers = multiprocessing.cpu_count()
+		
+		self._workers = workers
+		self._pool = None
+	
+	def __enter__(self):
+		
+		return self
+	
+	def __exit__(self,exc_type,exc_value,traceback):
+		
+		self.close()
+	
+	def close(self):
+		"""
+		Shut down the worker processes.
+		
+		"""
+		
+		if (self._pool != None):
+			self._pool.close()
+			self._pool.join()
+			self._pool = None
+	
+	def evaluate(self,parallel):
+		"""
+		Return the list of outputs of the parallel blocks.
+		
+		Arguments:
+		parallel -- Parallel instance.
+		
+		Notes:
+		The outputs are identical to those obtained by serial evaluation,
+		provided that the paths do not share blocks that carry state. If
+		the Parallel is evaluated by a GraphExecutor, outputs it has 
+		already computed upstream of the paths are sent along with the
+		blocks, so that shared blocks are not computed again.
+		
+		If any of the paths fails, the error is raised once all paths are
+		done, and the shared segments of the other paths are removed.
+		"""
+		
+		if (self._pool == None):
+			self._pool = multiprocessing.Pool(self.workers)
+		
+		executor = bl.Block._get_executor()
+		tasks = list()
+		for b in parallel.blocks:
+			outputs = dict()
+			if (isinstance(executor,GraphExecutor)):
+				outputs = executor.upstream_outputs(b)
+			tasks.append((b,outputs))
+		
+		# collect the results of all paths, also if some fail, since each
+		# returned output holds shared segments that have to be removed
+		pending = [self._pool.apply_async(_evaluate_path,(t,)) for t in tasks]
+		results = list()
+		error = None
+		for p in pending:
+			try:
+				results.append(p.get())
+			except:
+				if (error == None):
+					error = sys.exc_info()
+		
+		out = list()
+		try:
+			if (error != None):
+				raise error[0],error[1],error[2]
+			
+			while (len(results) > 0):
+				packed_output,states = results.pop(0)
+				_restore_states(parallel.blocks[len(out)],states)
+				out.append(attach_shared(packed_output))
+		finally:
+			for packed_output,states in results:
+				discard_shared(packed_output)
+		
+		return out
+
+# end class ProcessPoolRunner
+
+
+def _evaluate_path(task):
+	# Worker function: compute the output of block b, given the outputs
+	# already computed for blocks upstream of it, and return it in packed
+	# form together with the states of the blocks in its graph.
+	
+	b,outputs = task
+	
+	# the worker may have been forked while an executor was running
+	bl.Block._set_executor(None)
+	out = GraphExecutor(b).run(outputs=outputs)
+	states = [n.get_state() for n in GraphExecutor(b).nodes]
+	
+	return (share(out),states)
+
+def _restore_states(b,states):
+	# Apply states returned by _evaluate_path to the blocks in the graph
+	# of b, which are visited in the same order as in the worker.
+	
+	nodes = GraphExecutor(b).nodes
+	for ii in range(0,len(nodes)):
+		nodes[ii].set_state(states[ii])
+
+class ThreadPoolRunner(object):
+	"""
+	Evaluate the paths of a Parallel in a pool of threads.
+	
+	Most of the work in a parallel path is done in NumPy routines (FFTs,
+	random number generation, array arithmetic) that release the GIL, 
+	so threads give a speedup without the cost of sending blocks and 
+	results between processes. The outputs are returned in the order of
+	the parallel blocks.
+	"""
+	
+	@property
+	def workers(self):
+		"""
+		Return the number of worker threads.
+		
+		"""
+		
+		return self._workers
+	
+	def __init__(self,workers=None):
+		"""
+		Construct a thread pool runner.
+		
+		Keyword arguments:
+		workers -- The number of worker threads, or None to use the 
+		number of CPUs (default is None).
+		
+		Notes:
+		The pool of threads is created on first use, and should be shut 
+		down by calling close (or by using the runner as a context 
+		manager).
+		"""
+		
+		if (workers == None):
+			workers = multiprocessing.cpu_count()
+		
+		self._workers = workers
+		self._pool = None
+	
+	def __enter__(self):
+		
+		return self
+	
+	def __exit__(self,exc_type,exc_value,traceback):
+		
+		self.close()
+	
+	def close(self):
+		"""
+		Shut down the worker threads.
+		
+		"""
+		
+		if (self._pool != None):
+			self._pool.close()
+			self._pool.join()
+			self._pool = None
+	
+	def evaluate(self,parallel):
+		"""
+		Return the list of outputs of the parallel blocks.
+		
+		Arguments:
+		parallel -- Parallel instance.
+		
+		Notes:
+		Blocks are evaluated in place, so that their state is updated as
+		in serial evaluation. The paths should not share blocks that carry
+		state, unless the Parallel is evaluated by a GraphExecutor, which
+		ensures that shared blocks are computed only once. The executor of
+		the calling thread, if any, is installed in the worker threads 
+		while they evaluate the paths.
+		"""
+		
+		if (self._pool == None):
+			self._pool = multiprocessing.pool.ThreadPool(self.workers)
+		
+		executor = bl.Block._get_executor()
+		
+		def resolve(b):
+			previous = bl.Block._set_executor(executor)
+			try:
+				return parallel._resolve(b)
+			finally:
+				bl.Block._set_executor(previous)
+		
+		return self._pool.map(resolve,parallel.blocks)
+
+# end class ThreadPoolRunner
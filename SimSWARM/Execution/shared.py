@@ -0,0 +1,363 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#  shared.py
+#  Oct 18, 2026 21:12:38 EDT
+#  Copyright 2026
+#         
+#  Andre Young <andre.young@cfa.harvard.edu>
+#  Harvard-Smithsonian Center for Astrophysics
+#  60 Garden Street, Cambridge
+#  MA 02138
+#  
+#  Changelog:
+#  	AY: Created 2026-10-18
+#	AY: Share packed sample words without unpacking 2026-10-18
+#	AY: Added discard_shared 2026-10-18
+
+"""
+Defines shared memory segments for passing sample buffers between processes.
+
+"""
+
+import mmap
+import os
+import tempfile
+
+import numpy as np
+
+import FixedWidthBinary as fw
+import SimSWARM.Signal as sg
+
+class SharedSegment(object):
+	"""
+	A block of memory that can be mapped by several processes.
+	
+	The segment is backed by a file in shared memory (/dev/shm where
+	available), which is mapped into the memory of each process that
+	creates or attaches to it. Arrays returned by the array method are
+	views of the mapped memory, so that samples written by one process
+	are read by another without copying or pickling.
+	
+	A segment counts its references within the process: the constructor
+	returns a segment with one reference, acquire adds one and release
+	removes one. When the last reference is released, the file of an
+	owned segment is removed. Arrays obtained from the segment remain
+	valid after that, the memory is freed once no process maps it any
+	more. The segment can be used as a context manager, which releases
+	it on exit:
+		
+		with SharedSegment(nbytes) as seg:
+			a = seg.array(np.int64,(n,))
+			pool.apply(worker,(seg.name,))
+	
+	Notes:
+	A segment is owned by the process that creates it, unless ownership
+	is handed to a process that attaches to it (see detach and attach).
+	"""
+	
+	# Prefix of the names of segment files.
+	_prefix = 'simswarm-'
+	
+	@property
+	def name(self):
+		"""
+		Return the name by which other processes attach to this segment.
+		
+		"""
+		
+		return self._name
+	
+	@property
+	def nbytes(self):
+		"""
+		Return the size of this segment in bytes.
+		
+		"""
+		
+		return self._nbytes
+	
+	@property
+	def refcount(self):
+		"""
+		Return the number of references held to this segment in this process.
+		
+		"""
+		
+		return self._refcount
+	
+	@property
+	def owned(self):
+		"""
+		Return True if the segment is removed when its last reference is released.
+		
+		"""
+		
+		return self._owned
+	
+	def __init__(self,nbytes=None,name=None):
+		"""
+		Create a new segment, or attach to an existing one.
+		
+		Keyword arguments:
+		nbytes -- The size in bytes of a new segment (default is None).
+		name -- The name of an existing segment to attach to, as returned
+		by the name property, or None to create a new segment (default is
+		None).
+		
+		Notes:
+		Exactly one of nbytes and name should be given. A new segment is
+		owned by this process, an attached segment is not (see attach).
+		"""
+		
+		if ((nbytes == None) == (name == None)):
+			raise ValueError("Either the size of a new segment or the name of an existing segment should be given.")
+		
+		if (name == None):
+			fd,path = tempfile.mkstemp(prefix=self._prefix,dir=_shared_directory())
+			name = os.path.basename(path)
+			owned = True
+		else:
+			path = os.path.join(_shared_directory(),name)
+			fd = os.open(path,os.O_RDWR)
+			owned = False
+		
+		try:
+			if (nbytes == None):
+				nbytes = os.fstat(fd).st_size
+			else:
+				os.ftruncate(fd,max(nbytes,1))
+			
+			# a mapping cannot be empty
+			self._mmap = mmap.mmap(fd,max(nbytes,1))
+		except:
+			if (owned):
+				os.unlink(path)
+			raise
+		finally:
+			os.close(fd)
+		
+		self._name = name
+		self._path = path
+		self._nbytes = nbytes
+		self._owned = owned
+		self._refcount = 1
+	
+	@classmethod
+	def attach(cls,name,own=False):
+		"""
+		Attach to an existing segment.
+		
+		Arguments:
+		name -- The name of the segment.
+		
+		Keyword arguments:
+		own -- If True, this process takes over ownership of the segment,
+		e.g. from a worker process that called detach (default is False).
+		
+		"""
+		
+		seg = cls(name=name)
+		seg._owned = own
+		
+		return seg
+	
+	def __enter__(self):
+		
+		return self
+	
+	def __exit__(self,exc_type,exc_value,traceback):
+		
+		self.release()
+	
+	def acquire(self):
+		"""
+		Add a reference to this segment, and return the segment.
+		
+		"""
+		
+		if (self._refcount == 0):
+			raise ValueError("Shared segment " + self.name + " was already released.")
+		
+		self._refcount = self._refcount + 1
+		
+		return self
+	
+	def release(self):
+		"""
+		Remove a reference to this segment.
+		
+		Notes:
+		When the last reference is released the segment is unmapped from
+		this process (once no arrays refer to it), and if it is owned its
+		file is removed, after which no other process can attach to it.
+		"""
+		
+		if (self._refcount == 0):
+			raise ValueError("Shared segment " + self.name + " was already released.")
+		
+		self._refcount = self._refcount - 1
+		if (self._refcount > 0):
+			return
+		
+		# arrays returned by the array method hold on to the mapping, so
+		# it is not closed explicitly
+		self._mmap = None
+		if (self._owned and os.path.exists(self._path)):
+			os.unlink(self._path)
+	
+	def detach(self):
+		"""
+		Give up ownership of this segment, so that it is kept when released.
+		
+		Notes:
+		This is used to pass a segment to another process, which should
+		take over ownership when attaching to it.
+		"""
+		
+		self._owned = False
+	
+	def array(self,dtype,shape,offset=0):
+		"""
+		Return an array that is a view of the memory in this segment.
+		
+		Arguments:
+		dtype -- Data type of the array elements.
+		shape -- Shape of the array.
+		
+		Keyword arguments:
+		offset -- Offset in bytes of the first element (default is 0).
+		
+		"""
+		
+		if (self._refcount == 0):
+			raise ValueError("Shared segment " + self.name + " was already released.")
+		
+		dtype = np.dtype(dtype)
+		count = int(np.prod(shape))
+		if (offset + count * dtype.itemsize > self.nbytes):
+			raise ValueError("Array does not fit in shared segment of " + str(self.nbytes) + " bytes.")
+		
+		if (count == 0):
+			return np.zeros(shape,dtype=dtype)
+		
+		return np.frombuffer(self._mmap,dtype=dtype,count=count,offset=offset).reshape(shape)
+
+# end class SharedSegment
+
+
+def share(out):
+	"""
+	Copy the sample buffers in a block output to shared memory.
+	
+	Arguments:
+	out -- A DigitalSignal, a numpy array (e.g. sampled analog signal
+	samples), any other object, or a list of these.
+	
+	Notes:
+	Returns a picklable description of out, in which the scaled values
+	of each DigitalSignal and the elements of each array are replaced by
+	a reference to a new SharedSegment, which is detached to be taken
+	over by the process that calls attach_shared. Other objects are left
+	as they are. Packed samples are shared as packed bytes.
+	"""
+	
+	if (isinstance(out,list)):
+		return [share(o) for o in out]
+	
+	if (isinstance(out,sg.DigitalSignal)):
+		word = out.samples_word
+		if (isinstance(word,fw.PackedWordComplex)):
+			buffers = [word.packed_real,word.packed_imag]
+		elif (isinstance(word,fw.PackedWord)):
+			buffers = [word.packed]
+		elif (isinstance(word,fw.WordComplex)):
+			buffers = [word.scaled_value_real,word.scaled_value_imag]
+		else:
+			buffers = [word.scaled_value]
+	elif (isinstance(out,np.ndarray)):
+		buffers = [out]
+	else:
+		return out
+	
+	buffers = [np.asarray(b) for b in buffers]
+	with SharedSegment(sum([b.nbytes for b in buffers])) as seg:
+		offset = 0
+		for b in buffers:
+			seg.array(b.dtype,b.shape,offset)[...] = b
+			offset = offset + b.nbytes
+		seg.detach()
+	
+	packed = {'segment': seg.name, 'dtype': buffers[0].dtype.str, 'shape': buffers[0].shape}
+	if (isinstance(out,sg.DigitalSignal)):
+		packed.update({'sample_rate': out.sample_rate, 'precision': out.precision, 'buffers': len(buffers)})
+		if (out.is_packed):
+			packed['word_shape'] = out.samples_word.shape
+	
+	return packed
+
+def attach_shared(packed):
+	"""
+	Return the block output described by the result of share.
+	
+	Arguments:
+	packed -- The result of a call to share, possibly in another process.
+	
+	Notes:
+	The DigitalSignals and arrays are constructed around the memory of
+	the shared segments, without copying. The segment files are removed,
+	the memory is freed when the returned signals and arrays are.
+	"""
+	
+	if (isinstance(packed,list)):
+		return [attach_shared(p) for p in packed]
+	
+	if (not (isinstance(packed,dict) and ('segment' in packed))):
+		return packed
+	
+	with SharedSegment.attach(packed['segment'],own=True) as seg:
+		dtype = np.dtype(packed['dtype'])
+		size = dtype.itemsize * int(np.prod(packed['shape']))
+		buffers = [seg.array(dtype,packed['shape'],ii * size) for ii in range(0,packed.get('buffers',1))]
+	
+	if ('sample_rate' not in packed):
+		return buffers[0]
+	
+	if ('word_shape' in packed):
+		if (len(buffers) == 2):
+			word = fw.PackedWordComplex.from_packed(buffers[0],buffers[1],packed['word_shape'],packed['precision'])
+		else:
+			word = fw.PackedWord.from_packed(buffers[0],packed['word_shape'],packed['precision'])
+	elif (len(buffers) == 2):
+		word = fw.WordComplex.from_scaled_value(buffers[0],buffers[1],packed['precision'])
+	else:
+		word = fw.Word.from_scaled_value(buffers[0],packed['precision'])
+	
+	return sg.DigitalSignal.from_word(packed['sample_rate'],word)
+
+def discard_shared(packed):
+	"""
+	Remove the shared segments described by the result of share.
+	
+	Arguments:
+	packed -- The result of a call to share, possibly in another process.
+	
+	Notes:
+	This is used instead of attach_shared for outputs that are not used,
+	e.g. when another path of the same Parallel failed, so that the 
+	segment files are not left behind.
+	"""
+	
+	if (isinstance(packed,list)):
+		for p in packed:
+			discard_shared(p)
+	elif (isinstance(packed,dict) and ('segment' in packed)):
+		SharedSegment.attach(packed['segment'],own=True).release()
+
+def _shared_directory():
+	# Return the directory that holds the files backing shared segments.
+	
+	if (os.path.isdir('/dev/shm')):
+		return '/dev/shm'
+	
+	return tempfile.gettempdir()
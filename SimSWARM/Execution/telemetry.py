@@ -0,0 +1,609 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#  telemetry.py
+#  Oct 18, 2026 21:58:40 EDT
+#  Copyright 2026
+#         
+#  Andre Young <andre.young@cfa.harvard.edu>
+#  Harvard-Smithsonian Center for Astrophysics
+#  60 Garden Street, Cambridge
+#  MA 02138
+#  
+#  Changelog:
+#  	AY: Created 2026-10-18
+
+"""
+Defines telemetry for monitoring the throughput of long-running simulations.
+
+The module can be run as a script to summarize a telemetry file:
+	
+	python -m SimSWARM.Execution.telemetry sweep.jsonl --follow
+
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import SimSWARM.Blocks as bl
+import SimSWARM.Signal as sg
+
+class Telemetry(object):
+	"""
+	Collect counters, gauges and histograms, and flush them to a file periodically.
+	
+	While installed (see install), the telemetry is updated by blocks
+	and executors each time the output of a block is computed, and by
+	Chain.stream and Pipeline.stream for each frame. For each Block class
+	it counts the outputs, samples and seconds spent, and records the
+	time per output in a histogram. The number of frames completed, the
+	depth of the queues in a Pipeline and, if the number of frames is
+	known, the expected time remaining are recorded as well. Other code
+	may add its own metrics with count, gauge and observe:
+		
+		with Telemetry('sweep.jsonl',interval=30.0):
+			for frame in chain.stream(n=100000):
+				...
+	
+	The file holds either one JSON record per flush (fmt='jsonl'), or
+	the latest values in the Prometheus text format (fmt='prometheus'),
+	e.g. for the textfile collector of a node exporter. Either can be
+	summarized with the main function of this module.
+	
+	Notes:
+	Updates take a lock and a few dictionary operations, and flushing is
+	checked on each update, so no additional thread is needed. The time
+	per output includes time spent in upstream blocks that are evaluated
+	within the output call.
+	"""
+	
+	# Upper bounds in seconds of the buckets of duration histograms.
+	_buckets = (1e-4,1e-3,1e-2,1e-1,1.0,10.0,100.0)
+	
+	# Prefix of metric names in the Prometheus text format.
+	_prefix = 'simswarm_'
+	
+	@property
+	def path(self):
+		"""
+		Return the path of the telemetry file.
+		
+		"""
+		
+		return self._path
+	
+	@property
+	def fmt(self):
+		"""
+		Return the format of the telemetry file, 'jsonl' or 'prometheus'.
+		
+		"""
+		
+		return self._fmt
+	
+	@property
+	def interval(self):
+		"""
+		Return the minimum number of seconds between flushes.
+		
+		"""
+		
+		return self._interval
+	
+	@property
+	def installed(self):
+		"""
+		Return True if blocks and executors currently update this telemetry.
+		
+		"""
+		
+		return self._previous != None
+	
+	def __init__(self,path,fmt='jsonl',interval=10.0):
+		"""
+		Construct telemetry that is flushed to the given file.
+		
+		Arguments:
+		path -- Path of the telemetry file.
+		
+		Keyword arguments:
+		fmt -- Either 'jsonl' to append a JSON record to the file on each
+		flush, or 'prometheus' to replace the file by the latest values in
+		the Prometheus text format (default is 'jsonl').
+		interval -- The minimum number of seconds between flushes (default
+		is 10.0).
+		
+		"""
+		
+		if (fmt not in ('jsonl','prometheus')):
+			raise ValueError("Telemetry format can only be 'jsonl' or 'prometheus'.")
+		
+		self._path = path
+		self._fmt = fmt
+		self._interval = interval
+		self._previous = None
+		self._lock = threading.Lock()
+		self.clear()
+	
+	def __enter__(self):
+		self.install()
+		return self
+	
+	def __exit__(self,exc_type,exc_value,traceback):
+		self.uninstall()
+		return False
+	
+	def clear(self):
+		"""
+		Discard all metrics, and restart the clock.
+		
+		"""
+		
+		with self._lock:
+			self._counters = dict()
+			self._gauges = dict()
+			self._histograms = dict()
+			self._start = time.time()
+			self._next_flush = self._start + self.interval
+			self._target = None
+	
+	def install(self):
+		"""
+		Let blocks and executors update this telemetry.
+		
+		"""
+		
+		if (self.installed):
+			return
+		
+		self._previous = [bl.Block._telemetry]
+		bl.Block._telemetry = self
+	
+	def uninstall(self):
+		"""
+		Stop updating this telemetry, and flush it.
+		
+		"""
+		
+		if (not self.installed):
+			return
+		
+		bl.Block._telemetry = self._previous[0]
+		self._previous = None
+		self.flush()
+	
+	def count(self,name,value=1,**labels):
+		"""
+		Increment a counter.
+		
+		Arguments:
+		name -- Name of the counter.
+		
+		Keyword arguments:
+		value -- The amount to add (default is 1).
+		labels -- Labels that distinguish counters with the same name,
+		e.g. block='DigitalFFT'.
+		
+		"""
+		
+		key = (name,tuple(sorted(labels.items())))
+		with self._lock:
+			self._counters[key] = self._counters.get(key,0) + value
+		
+		self._flush_if_due()
+	
+	def gauge(self,name,value,**labels):
+		"""
+		Set a gauge to the given value.
+		
+		Arguments:
+		name -- Name of the gauge.
+		value -- The current value.
+		
+		Keyword arguments:
+		labels -- See count.
+		
+		"""
+		
+		key = (name,tuple(sorted(labels.items())))
+		with self._lock:
+			self._gauges[key] = value
+		
+		self._flush_if_due()
+	
+	def observe(self,name,value,**labels):
+		"""
+		Add a value to a histogram.
+		
+		Arguments:
+		name -- Name of the histogram.
+		value -- The observed value, e.g. a duration in seconds.
+		
+		Keyword arguments:
+		labels -- See count.
+		
+		"""
+		
+		key = (name,tuple(sorted(labels.items())))
+		with self._lock:
+			self._observe(key,value)
+		
+		self._flush_if_due()
+	
+	def expect(self,frames):
+		"""
+		Announce the number of frames that will be completed from now on.
+		
+		Arguments:
+		frames -- The number of frames, used to estimate the time remaining.
+		
+		Notes:
+		This is called by Chain.stream and Pipeline.stream when the number
+		of frames to generate is given.
+		"""
+		
+		with self._lock:
+			done = self._counters.get(('frames',()),0)
+			self._target = (done + frames,done,time.time())
+	
+	def measure(self,b,call,*args):
+		"""
+		Call a method that computes the output of a block, and record it.
+		
+		Arguments:
+		b -- Block instance.
+		call -- The method to call, e.g. b.output or b.process.
+		args -- Arguments passed to call.
+		
+		Notes:
+		The result of call is returned. The number of outputs, samples and
+		seconds are counted, and the duration is added to a histogram,
+		labelled by the class of the block.
+		"""
+		
+		t_start = time.time()
+		out = call(*args)
+		elapsed = time.time() - t_start
+		
+		labels = (('block',type(b).__name__),)
+		with self._lock:
+			for name,value in (('block_outputs',1),('block_samples',_count_samples(out)),('block_seconds',elapsed)):
+				key = (name,labels)
+				self._counters[key] = self._counters.get(key,0) + value
+			self._observe(('block_output_seconds',labels),elapsed)
+		
+		self._flush_if_due()
+		
+		return out
+	
+	def frame_done(self):
+		"""
+		Count a completed frame.
+		
+		"""
+		
+		self.count('frames')
+	
+	def _observe(self,key,value):
+		# Add a value to a histogram, with the lock held.
+		
+		hist = self._histograms.get(key)
+		if (hist == None):
+			hist = {'counts': [0] * (len(self._buckets) + 1), 'sum': 0.0, 'count': 0}
+			self._histograms[key] = hist
+		
+		ii = 0
+		while ((ii < len(self._buckets)) and (value > self._buckets[ii])):
+			ii = ii + 1
+		hist['counts'][ii] = hist['counts'][ii] + 1
+		hist['sum'] = hist['sum'] + value
+		hist['count'] = hist['count'] + 1
+	
+	def _flush_if_due(self):
+		# Flush if the interval has passed since the last flush.
+		
+		if (time.time() >= self._next_flush):
+			self.flush()
+	
+	def snapshot(self):
+		"""
+		Return the current values of all metrics as a dictionary.
+		
+		Notes:
+		The dictionary holds the time, the seconds elapsed since the clock
+		was started, the estimated seconds remaining (None if unknown), and
+		lists of counters, gauges and histograms. Each metric is described
+		by its name, labels and value; histograms have cumulative counts
+		per bucket upper bound instead of a value, as well as the sum and
+		number of observations.
+		"""
+		
+		now = time.time()
+		with self._lock:
+			record = {'time': now, 'elapsed': now - self._start, 'eta': self._eta(now)}
+			record['counters'] = [{'name': k[0], 'labels': dict(k[1]), 'value': v} for k,v in sorted(self._counters.items())]
+			record['gauges'] = [{'name': k[0], 'labels': dict(k[1]), 'value': v} for k,v in sorted(self._gauges.items())]
+			record['histograms'] = list()
+			for k,hist in sorted(self._histograms.items()):
+				cumulative = [sum(hist['counts'][:(ii + 1)]) for ii in range(0,len(self._buckets))]
+				buckets = [[le,c] for le,c in zip(self._buckets,cumulative)] + [['+Inf',hist['count']]]
+				record['histograms'].append({'name': k[0], 'labels': dict(k[1]), 'buckets': buckets, 'sum': hist['sum'], 'count': hist['count']})
+		
+		return record
+	
+	def _eta(self,now):
+		# Return the estimated seconds until the expected number of frames
+		# is completed, with the lock held.
+		
+		if (self._target == None):
+			return None
+		
+		target,done_at_start,t_start = self._target
+		done = self._counters.get(('frames',()),0)
+		if (done >= target):
+			return 0.0
+		elif ((done <= done_at_start) or (now <= t_start)):
+			return None
+		
+		rate = (done - done_at_start) / (now - t_start)
+		
+		return (target - done) / rate
+	
+	def flush(self):
+		"""
+		Write the current values of all metrics to the telemetry file.
+		
+		"""
+		
+		record = self.snapshot()
+		with self._lock:
+			self._next_flush = record['time'] + self.interval
+			if (self.fmt == 'jsonl'):
+				with open(self.path,'a') as fh:
+					fh.write(json.dumps(record) + "\n")
+			else:
+				self._write_prometheus(record)
+	
+	def _write_prometheus(self,record):
+		# Replace the telemetry file by the record in the Prometheus text
+		# format. The file is written to a temporary file first, so that a
+		# collector never reads an incomplete file.
+		
+		lines = list()
+		lines.append("# TYPE {:s}elapsed_seconds gauge".format(self._prefix))
+		lines.append("{:s}elapsed_seconds {!r}".format(self._prefix,record['elapsed']))
+		if (record['eta'] != None):
+			lines.append("# TYPE {:s}eta_seconds gauge".format(self._prefix))
+			lines.append("{:s}eta_seconds {!r}".format(self._prefix,record['eta']))
+		
+		for kind,suffix in (('counters','_total'),('gauges','')):
+			typed = set()
+			for m in record[kind]:
+				name = self._prefix + m['name'] + suffix
+				if (name not in typed):
+					lines.append("# TYPE {:s} {:s}".format(name,'counter' if (kind == 'counters') else 'gauge'))
+					typed.add(name)
+				lines.append("{:s}{:s} {!r}".format(name,_prometheus_labels(m['labels']),m['value']))
+		
+		typed = set()
+		for m in record['histograms']:
+			name = self._prefix + m['name']
+			if (name not in typed):
+				lines.append("# TYPE {:s} histogram".format(name))
+				typed.add(name)
+			for le,c in m['buckets']:
+				labels = dict(m['labels'])
+				labels['le'] = str(le)
+				lines.append("{:s}_bucket{:s} {:d}".format(name,_prometheus_labels(labels),c))
+			lines.append("{:s}_sum{:s} {!r}".format(name,_prometheus_labels(m['labels']),m['sum']))
+			lines.append("{:s}_count{:s} {:d}".format(name,_prometheus_labels(m['labels']),m['count']))
+		
+		directory = os.path.dirname(os.path.abspath(self.path))
+		fd,tmp_path = tempfile.mkstemp(prefix='.' + os.path.basename(self.path) + '.',dir=directory)
+		try:
+			with os.fdopen(fd,'w') as fh:
+				fh.write("\n".join(lines) + "\n")
+			os.rename(tmp_path,self.path)
+		except:
+			if (os.path.exists(tmp_path)):
+				os.remove(tmp_path)
+			raise
+
+# end class Telemetry
+
+
+def _count_samples(out):
+	# Return the number of samples in a block output or frame.
+	
+	if (isinstance(out,sg.Frame)):
+		out = out.payload
+	
+	if (isinstance(out,list)):
+		return sum([_count_samples(o) for o in out])
+	elif (isinstance(out,sg.DigitalSignalBatch)):
+		return out.number_of_paths * out.number_of_samples
+	elif (isinstance(out,sg.DigitalSignal)):
+		return out.number_of_samples
+	
+	return 0
+
+def _prometheus_labels(labels):
+	# Format labels as in the Prometheus text format.
+	
+	if (len(labels) == 0):
+		return ""
+	
+	items = ['{:s}="{:s}"'.format(k,str(v).replace('\\','\\\\').replace('"','\\"')) for k,v in sorted(labels.items())]
+	
+	return "{" + ",".join(items) + "}"
+
+def read_records(path):
+	"""
+	Read the records in a telemetry file.
+	
+	Arguments:
+	path -- Path of a file written by Telemetry, in either format.
+	
+	Notes:
+	Returns a list of records as returned by Telemetry.snapshot, one per
+	flush for JSON lines, or a single record for the Prometheus format,
+	in which case histograms are not included. Incomplete lines at the end
+	of a file that is being written are ignored.
+	"""
+	
+	with open(path,'r') as fh:
+		text = fh.read()
+	
+	if (text.startswith('{')):
+		records = list()
+		for line in text.split("\n"):
+			try:
+				records.append(json.loads(line))
+			except ValueError:
+				continue
+		return records
+	
+	record = {'time': os.path.getmtime(path), 'elapsed': None, 'eta': None, 'counters': list(), 'gauges': list(), 'histograms': list()}
+	types = dict()
+	prefix = Telemetry._prefix
+	for line in text.split("\n"):
+		if (line.startswith('# TYPE ')):
+			name,kind = line[len('# TYPE '):].split()
+			types[name] = kind
+			continue
+		elif ((len(line) == 0) or line.startswith('#')):
+			continue
+		
+		metric,value = line.rsplit(' ',1)
+		labels = dict()
+		name = metric
+		if ('{' in metric):
+			name,label_text = metric[:-1].split('{',1)
+			for item in label_text.split('",'):
+				k,v = item.split('=',1)
+				labels[k] = v.strip('"').replace('\\"','"').replace('\\\\','\\')
+		
+		kind = types.get(name)
+		short = name[len(prefix):] if name.startswith(prefix) else name
+		if (short in ('elapsed_seconds','eta_seconds')):
+			record[short[:-len('_seconds')]] = float(value)
+		elif (kind == 'counter'):
+			record['counters'].append({'name': short[:-len('_total')], 'labels': labels, 'value': float(value)})
+		elif (kind == 'gauge'):
+			record['gauges'].append({'name': short, 'labels': labels, 'value': float(value)})
+	
+	return [record]
+
+def summarize(records,window=None):
+	"""
+	Return a table that summarizes the throughput per Block class.
+	
+	Arguments:
+	records -- List of records, see read_records.
+	
+	Keyword arguments:
+	window -- The number of seconds before the last record over which
+	rates are computed, or None to compute rates over all records
+	(default is None).
+	
+	Notes:
+	For each Block class the table lists the number of outputs, samples
+	and seconds spent in total, and the rate of samples per second and
+	the fraction of time busy over the window. If only a single record is
+	available, the rates are computed over the time elapsed since the
+	telemetry was started. The number of frames, the frame rate, queue
+	depths and estimated time remaining are listed below the table.
+	"""
+	
+	if (len(records) == 0):
+		return "No telemetry records."
+	
+	last = records[-1]
+	first = None
+	for rec in records[:-1]:
+		if ((window == None) or (last['time'] - rec['time'] <= window)):
+			first = rec
+			break
+	
+	if (first != None):
+		span = last['time'] - first['time']
+	else:
+		span = last['elapsed']
+	
+	def values(rec,name):
+		result = dict()
+		if (rec != None):
+			for m in rec['counters']:
+				if (m['name'] == name):
+					result[m['labels'].get('block')] = m['value']
+		return result
+	
+	lines = list()
+	lines.append("{:<28s} {:>10s} {:>14s} {:>10s} {:>14s} {:>6s}".format('block','outputs','samples','busy [s]','samples/s','busy'))
+	counts = dict([(name,(values(last,name),values(first,name))) for name in ('block_outputs','block_samples','block_seconds')])
+	rows = list()
+	for block in counts['block_samples'][0].keys():
+		d_samples = counts['block_samples'][0][block] - counts['block_samples'][1].get(block,0)
+		d_seconds = counts['block_seconds'][0].get(block,0) - counts['block_seconds'][1].get(block,0)
+		rate = d_samples / span if (span > 0) else 0.0
+		busy = d_seconds / span if (span > 0) else 0.0
+		rows.append((rate,"{:<28s} {:10d} {:14d} {:10.3f} {:14.4g} {:6.1%}".format(str(block),int(counts['block_outputs'][0].get(block,0)),
+			int(counts['block_samples'][0][block]),counts['block_seconds'][0].get(block,0),rate,busy)))
+	rows.sort(reverse=True)
+	lines.extend([row for rate,row in rows])
+	
+	frames = values(last,'frames').get(None,0)
+	d_frames = frames - values(first,'frames').get(None,0)
+	lines.append("")
+	lines.append("frames: {:d}, {:.4g} frames/s over {:.1f} s".format(int(frames),d_frames / span if (span > 0) else 0.0,span))
+	for m in last['gauges']:
+		if (m['name'] == 'queue_depth'):
+			lines.append("queue {:s}: {:d}".format(m['labels'].get('stage','?'),int(m['value'])))
+	if (last['eta'] != None):
+		lines.append("eta: {:.1f} s".format(last['eta']))
+	
+	return "\n".join(lines)
+
+def main(argv=None):
+	"""
+	Summarize a telemetry file, optionally following it as it is written.
+	
+	Keyword arguments:
+	argv -- List of command line arguments, or None to use sys.argv
+	(default is None).
+	
+	"""
+	
+	parser = argparse.ArgumentParser(description="Summarize the throughput per Block class in a SimSWARM telemetry file.")
+	parser.add_argument('path',help="telemetry file, JSON lines or Prometheus text format")
+	parser.add_argument('-f','--follow',action='store_true',help="print a new summary whenever the file changes")
+	parser.add_argument('-w','--window',type=float,default=60.0,help="seconds over which rates are computed (default is 60)")
+	parser.add_argument('-i','--poll',type=float,default=1.0,help="seconds between checks for changes when following (default is 1)")
+	args = parser.parse_args(argv)
+	if (not (args.follow or os.path.exists(args.path))):
+		parser.error("telemetry file " + args.path + " does not exist")
+	
+	mtime = None
+	while (True):
+		if (os.path.exists(args.path) and (os.path.getmtime(args.path) != mtime)):
+			mtime = os.path.getmtime(args.path)
+			print summarize(read_records(args.path),args.window)
+			if (args.follow):
+				print ""
+				sys.stdout.flush()
+		
+		if (not args.follow):
+			return 0
+		
+		try:
+			time.sleep(args.poll)
+		except KeyboardInterrupt:
+			return 0
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -0,0 +1,327 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#  tracing.py
+#  Oct 18, 2026 20:41:26 EDT
+#  Copyright 2026
+#         
+#  Andre Young <andre.young@cfa.harvard.edu>
+#  Harvard-Smithsonian Center for Astrophysics
+#  60 Garden Street, Cambridge
+#  MA 02138
+#  
+#  Changelog:
+#  	AY: Created 2026-10-18
+
+"""
+Defines tracing of signal generation and block evaluation to detect redundant work.
+
+"""
+
+import collections
+import hashlib
+import time
+
+import numpy as np
+
+import SimSWARM.Blocks as bl
+import SimSWARM.Signal as sg
+import SimSWARM.Spec as sp
+
+from profiling import Profiler
+
+class Tracer(Profiler):
+	"""
+	Log every call that generates signal samples or block output, and find repeated work.
+	
+	While the tracer is enabled, each call to the generate method of a
+	Generator is logged with the identity of the generator and the
+	requested sample rate, number of samples and time offset, and each
+	call to the output method of a Block is logged with a fingerprint of
+	the output. Generators are identified by their spec digest (see
+	SimSWARM.Spec.digest), so that copies of the same generator, e.g. made
+	by Parallel.attach_source, are recognized as the same signal. The
+	log is then searched for duplicate requests, which compute the same
+	samples or output again, and for overlapping requests, which sample
+	part of the same time range again:
+		
+		with Tracer() as tr:
+			out = chain.output()
+		print tr.report()
+	
+	Notes:
+	The cost of a repeated call is its self time, i.e. the time spent in
+	the call excluding nested instrumented calls, see Profiler. For
+	overlapping requests the self time is prorated by the fraction of
+	samples that overlap.
+	"""
+	
+	# Methods that are instrumented, for each baseclass.
+	_instrumented = ((bl.Block,('output',)),(sg.Generator,('generate',)))
+	
+	@property
+	def events(self):
+		"""
+		Return the list of logged calls, in the order they completed.
+		
+		Notes:
+		Each call is described by a dictionary with its kind ('generate'
+		or 'output'), the name and class of the generator or block, the
+		identity key used to compare calls, the number of samples, and
+		the total and self time in seconds. Calls to generate also hold
+		the sample rate r, number of samples n and time offset t.
+		"""
+		
+		with self._lock:
+			return [dict(e) for e in self._events]
+	
+	def __init__(self):
+		"""
+		Construct a tracer.
+		
+		"""
+		
+		super(Tracer,self).__init__(trace_memory=False)
+	
+	def clear(self):
+		"""
+		Discard all logged calls.
+		
+		"""
+		
+		super(Tracer,self).clear()
+		self._events = list()
+		self._keys = dict()
+		# referenced objects are kept so that their ids remain unique
+		self._objects = dict()
+	
+	def _call(self,original,method,obj,args,kwargs):
+		# Call original and log the call. Calls made by an overriding
+		# method to the overridden one are logged only once.
+		
+		stack = getattr(self._local,'stack',None)
+		if (stack == None):
+			stack = list()
+			self._local.stack = stack
+		
+		if ((len(stack) > 0) and (stack[-1][0] is obj) and (stack[-1][1] == method)):
+			return original(obj,*args,**kwargs)
+		
+		entry = [obj,method,0.0]
+		stack.append(entry)
+		t_start = time.time()
+		try:
+			result = original(obj,*args,**kwargs)
+		finally:
+			elapsed = time.time() - t_start
+			stack.pop()
+			if (len(stack) > 0):
+				stack[-1][2] = stack[-1][2] + elapsed
+		
+		event = {'name': self._label(obj), 'class': type(obj).__name__, 'total_time': elapsed, 'time': elapsed - entry[2]}
+		if (method == 'generate'):
+			r,n,t = self._generate_args(args,kwargs)
+			event.update({'kind': 'generate', 'key': self._generator_key(obj), 'r': r, 'n': n, 't': t, 'samples': n})
+		else:
+			event.update({'kind': 'output', 'key': self._fingerprint(result), 'samples': self._count_samples(result)})
+		
+		with self._lock:
+			self._events.append(event)
+		
+		return result
+	
+	def _generate_args(self,args,kwargs):
+		# Return the arguments r, n and t of a call to generate.
+		
+		names = ('r','n','t')
+		values = list(args) + [kwargs[k] for k in names[len(args):]]
+		
+		return tuple(values)
+	
+	def _generator_key(self,gen):
+		# Return the spec digest of a generator, which is computed once per
+		# instance.
+		
+		with self._lock:
+			key = self._keys.get(id(gen))
+			if (key == None):
+				key = sp.digest(gen)
+				self._keys[id(gen)] = key
+				self._objects[id(gen)] = gen
+		
+		return key
+	
+	def _fingerprint(self,out):
+		# Return a hash of the samples in a block output, or None if the
+		# output holds no digital samples (e.g. analog signals, which are
+		# only sampled when their samples are requested).
+		
+		if (isinstance(out,list)):
+			keys = [self._fingerprint(o) for o in out]
+			if (None in keys):
+				return None
+			return hashlib.sha1(",".join(keys)).hexdigest()
+		elif (isinstance(out,sg.DigitalSignal)):
+			samples = np.ascontiguousarray(out.samples)
+			h = hashlib.sha1(samples.reshape(-1).view(np.uint8))
+			h.update("{!r},{:s},{!r}".format(out.sample_rate,str(samples.dtype),samples.shape))
+			return h.hexdigest()
+		
+		return None
+	
+	def _groups(self,kind,key):
+		# Return the logged calls of the given kind grouped by key(event),
+		# leaving out calls for which the key is None.
+		
+		groups = collections.OrderedDict()
+		for e in self.events:
+			if (e['kind'] != kind):
+				continue
+			
+			k = key(e)
+			if (k != None):
+				groups.setdefault(k,list()).append(e)
+		
+		return groups
+	
+	def _names(self,events):
+		# Return the distinct names in a list of logged calls.
+		
+		names = list()
+		for e in events:
+			if (e['name'] not in names):
+				names.append(e['name'])
+		
+		return ",".join(names)
+	
+	def duplicates(self):
+		"""
+		Return the requests that were repeated with identical results.
+		
+		Notes:
+		Calls to generate are duplicates if they request the same samples
+		(r, n and t) from generators with the same identity, and calls to
+		output are duplicates if blocks of the same class produce the same
+		output samples. Each duplicate request is described by a dictionary
+		with its kind, the names of the generators or blocks involved, the
+		number of calls, the number of samples and the self time spent in
+		the calls after the first, and for generate requests the values of
+		r, n and t. The list is sorted by decreasing wasted time.
+		"""
+		
+		result = list()
+		for kind,key in (('generate',lambda e: (e['key'],e['r'],e['n'],e['t'])),('output',lambda e: (e['class'],e['key']) if (e['key'] != None) else None)):
+			for events in self._groups(kind,key).values():
+				if (len(events) < 2):
+					continue
+				
+				rec = collections.OrderedDict([('kind',kind),('name',self._names(events)),('calls',len(events))])
+				if (kind == 'generate'):
+					rec.update([('r',events[0]['r']),('n',events[0]['n']),('t',events[0]['t'])])
+				rec['wasted_samples'] = sum([e['samples'] for e in events[1:]])
+				rec['wasted_time'] = sum([e['time'] for e in events[1:]])
+				result.append(rec)
+		
+		result.sort(key=lambda rec: rec['wasted_time'],reverse=True)
+		
+		return result
+	
+	def overlaps(self):
+		"""
+		Return the generate requests that sample part of a time range sampled before.
+		
+		Notes:
+		Requests from generators with the same identity and at the same
+		sample rate are compared by the time range they cover. Each request
+		that overlaps the ranges of requests starting at or before it, but
+		is not a duplicate of one of them, is described by a dictionary
+		with the names of the generators involved, the values of r, n and
+		t, the number of overlapping samples, and the self time of the
+		request prorated by the fraction of overlapping samples. The list
+		is sorted by decreasing wasted time.
+		"""
+		
+		result = list()
+		for events in self._groups('generate',lambda e: (e['key'],e['r'])).values():
+			# duplicates are reported separately, keep the first of each
+			requests = collections.OrderedDict()
+			for e in events:
+				requests.setdefault((e['t'],e['n']),e)
+			
+			end = None
+			for (t,n),e in sorted(requests.items()):
+				r = e['r']
+				t_end = t + 1.0 * n / r
+				if ((end != None) and (end > t) and (n > 0)):
+					overlap = min(int(round((min(end,t_end) - t) * r)),n)
+					if (overlap > 0):
+						rec = collections.OrderedDict([('kind','generate'),('name',self._names(events)),('r',r),('n',n),('t',t)])
+						rec['overlap_samples'] = overlap
+						rec['wasted_time'] = e['time'] * overlap / n
+						result.append(rec)
+				
+				if ((end == None) or (t_end > end)):
+					end = t_end
+		
+		result.sort(key=lambda rec: rec['wasted_time'],reverse=True)
+		
+		return result
+	
+	def results(self,by='block'):
+		"""
+		Return the duplicate and overlapping requests as a single list.
+		
+		Keyword arguments:
+		by -- Only 'block' is supported, repeated work is always reported
+		per request (default is 'block').
+		
+		"""
+		
+		if (by != 'block'):
+			raise ValueError("Repeated work can only be reported by 'block'.")
+		
+		result = self.duplicates() + self.overlaps()
+		result.sort(key=lambda rec: rec['wasted_time'],reverse=True)
+		
+		return result
+	
+	def report(self,by='block',fmt='table'):
+		"""
+		Return a report of the duplicate and overlapping requests.
+		
+		Keyword arguments:
+		by -- Only 'block' is supported, see results (default is 'block').
+		fmt -- Either 'table' for a human-readable table or 'json' for a
+		JSON document (default is 'table').
+		
+		"""
+		
+		if (fmt == 'json'):
+			return super(Tracer,self).report(by,fmt)
+		elif (fmt != 'table'):
+			raise ValueError("Report format can only be 'table' or 'json'.")
+		
+		events = self.events
+		duplicates = self.duplicates()
+		overlaps = self.overlaps()
+		
+		lines = list()
+		lines.append("{:d} generate calls, {:d} output calls, {:.4f} s".format(
+			len([e for e in events if (e['kind'] == 'generate')]),len([e for e in events if (e['kind'] == 'output')]),sum([e['time'] for e in events])))
+		lines.append("")
+		lines.append("Duplicate requests: {:d}, wasted {:.4f} s".format(len(duplicates),sum([rec['wasted_time'] for rec in duplicates])))
+		lines.append("{:<8s} {:<40s} {:>6s} {:>12s} {:>10s} {:>14s} {:>12s}".format('kind','name','calls','n','wasted [s]','t [s]','samples'))
+		for rec in duplicates:
+			n = "{:12d}".format(rec['n']) if ('n' in rec) else "{:>12s}".format('-')
+			t = "{:14.6e}".format(rec['t']) if ('t' in rec) else "{:>14s}".format('-')
+			lines.append("{:<8s} {:<40s} {:6d} {:s} {:10.4f} {:s} {:12d}".format(rec['kind'],rec['name'],rec['calls'],n,rec['wasted_time'],t,rec['wasted_samples']))
+		
+		lines.append("")
+		lines.append("Overlapping requests: {:d}, wasted {:.4f} s".format(len(overlaps),sum([rec['wasted_time'] for rec in overlaps])))
+		lines.append("{:<8s} {:<40s} {:>6s} {:>12s} {:>10s} {:>14s} {:>12s}".format('kind','name','','n','wasted [s]','t [s]','overlap'))
+		for rec in overlaps:
+			lines.append("{:<8s} {:<40s} {:>6s} {:12d} {:10.4f} {:14.6e} {:12d}".format(rec['kind'],rec['name'],'',rec['n'],rec['wasted_time'],rec['t'],rec['overlap_samples']))
+		
+		return "\n".join(lines)
+
+# end class Tracer
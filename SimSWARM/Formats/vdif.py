@@ -0,0 +1,873 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#  vdif.py
+#  Oct 18, 2026 22:31:05 EDT
+#  Copyright 2026
+#         
+#  Andre Young <andre.young@cfa.harvard.edu>
+#  Harvard-Smithsonian Center for Astrophysics
+#  60 Garden Street, Cambridge
+#  MA 02138
+#  
+#  Changelog:
+#  	AY: Created 2026-10-18
+#	AY: Added memory-mapped reader 2026-10-18
+#	AY: Plan reader output at its storage size 2026-10-18
+#	AY: Refuse to clone VDIFWriter 2026-10-18
+
+"""
+Defines reading and writing of digital signals in the VLBI Data Interchange
+Format (VDIF).
+
+"""
+
+import numpy as np
+
+import FixedWidthBinary as fw
+import SimSWARM.Blocks as bl
+import SimSWARM.Signal as sg
+
+class VDIFWriter(bl.Block):
+	"""
+	Sink block that writes its input to a VDIF file and passes it on.
+	
+	Each of the parallel signals in the input (e.g. the output of a
+	Parallel of Requantizer blocks, one for each antenna) is written as a
+	separate VDIF thread, with the index of the signal as thread ID. The
+	input is cut into data frames of frame_length bytes, and the frames
+	of all threads are interleaved in time order. Frame headers hold the
+	time of the first sample in the frame, which is taken from the
+	timestamp of the frame in streaming mode (see process), and otherwise
+	from the first block upstream that produces a stream of frames, e.g.
+	a TimeSteppingADC:
+		
+		writer = VDIFWriter('/data/sim.vdif',station='Sm')
+		chain = Chain()
+		chain.add_block(Parallel([TimeSteppingADC(rate,n,fmt8) for ii in range(4)]))
+		chain.add_block(Parallel(Requantizer(fmt2),4))
+		chain.add_block(writer)
+		for frame in chain.stream(n=1000):
+			pass
+		writer.close()
+	
+	Samples are written as offset binary with bits per sample (per
+	component for complex signals, with the real component first) packed
+	into bytes least-significant bits first. All frames of a single
+	input are written with a single write to the file.
+	
+	Notes:
+	Inputs are expected to be contiguous in time. Samples that do not
+	fill a complete frame are kept until the next input, and discarded
+	when the writer is closed or reset. The sample rate should be an
+	integer multiple of the number of samples in a frame, so that each
+	second holds a whole number of frames.
+	
+	A writer cannot be cloned (see clone), e.g. by Parallel(writer,n),
+	since the copies would write to the same file. Construct a writer
+	for each file instead.
+	"""
+	
+	# Size of a VDIF frame header in bytes (no legacy headers are used).
+	_header_length = 32
+	
+	# Number of bits per sample that can be written.
+	_bits = (1,2,4,8,16)
+	
+	@property
+	def path(self):
+		"""
+		Return the path of the VDIF file.
+		
+		"""
+		
+		return self._path
+	
+	@property
+	def bits(self):
+		"""
+		Return the number of bits per sample, or None to use the width of the input precision.
+		
+		"""
+		
+		return self._bits_per_sample
+	
+	@property
+	def station(self):
+		"""
+		Return the station ID written in frame headers.
+		
+		"""
+		
+		return self._station
+	
+	@property
+	def epoch(self):
+		"""
+		Return the reference epoch, in half-years since 2000-01-01.
+		
+		"""
+		
+		return self._epoch
+	
+	@property
+	def start(self):
+		"""
+		Return the number of seconds since the reference epoch at time zero.
+		
+		"""
+		
+		return self._start
+	
+	@property
+	def frame_length(self):
+		"""
+		Return the number of data bytes in a frame, excluding the header.
+		
+		"""
+		
+		return self._frame_length
+	
+	@property
+	def buffer_size(self):
+		"""
+		Return the size of the file buffer in bytes.
+		
+		"""
+		
+		return self._buffer_size
+	
+	def __init__(self,path,bits=None,station=0,epoch=0,start=0,frame_length=8000,buffer_size=2**22):
+		"""
+		Construct a VDIF writer.
+		
+		Arguments:
+		path -- Path of the VDIF file, which is overwritten.
+		
+		Keyword arguments:
+		bits -- Number of bits per sample, one of 1, 2, 4, 8 or 16, or None
+		to use the width of the input precision (default is None).
+		station -- Station ID, either an integer or a string of two
+		characters (default is 0).
+		epoch -- Reference epoch, in half-years since 2000-01-01 (default
+		is 0).
+		start -- Number of seconds since the reference epoch at time zero,
+		i.e. the time of the first sample of a TimeSteppingADC with zero
+		time offset (default is 0).
+		frame_length -- Number of data bytes in a frame, excluding the
+		header, which should be a multiple of 8 (default is 8000).
+		buffer_size -- Size of the file buffer in bytes (default is 2**22).
+		
+		Notes:
+		If bits is less than the width of the input precision, samples are
+		requantized to the given number of bits over the same range, and
+		saturated as by the Requantizer block.
+		"""
+		
+		if ((bits != None) and (bits not in self._bits)):
+			raise ValueError("VDIFWriter can only write " + ",".join([str(b) for b in self._bits]) + " bits per sample.")
+		
+		if ((frame_length <= 0) or (frame_length % 8 != 0)):
+			raise ValueError("Length of VDIF frames should be a positive multiple of 8 bytes.")
+		
+		if (isinstance(station,str)):
+			if (len(station) != 2):
+				raise ValueError("Station ID should be an integer or a string of two characters.")
+			station = (ord(station[0]) << 8) | ord(station[1])
+		
+		self._path = path
+		self._bits_per_sample = bits
+		self._station = station
+		self._epoch = epoch
+		self._start = start
+		self._frame_length = frame_length
+		self._buffer_size = buffer_size
+		self._file = None
+		self.reset()
+	
+	def __getstate__(self):
+		# The open file is not copied or pickled, copies reopen the file
+		# at the offset they have written up to.
+		
+		state = self.__dict__.copy()
+		state['_file'] = None
+		
+		return state
+	
+	def clone(self,memo=None):
+		"""
+		Raise a TypeError, a VDIFWriter cannot be cloned.
+		
+		Notes:
+		Clones would share the path of the original, and write to the 
+		same file.
+		"""
+		
+		raise TypeError("VDIFWriter cannot be cloned, copies would write to the same file " + self.path + ".")
+	
+	def output(self):
+		"""
+		Write the output of the source to file and return it.
+		
+		Notes:
+		The time of the first sample is taken from the first block
+		upstream that produces a stream of frames, e.g. a TimeSteppingADC,
+		before its output is requested. If there is no such block, the
+		output is taken to follow the previous output without a gap,
+		starting at time zero.
+		"""
+		
+		timestamp = self._upstream_time()
+		
+		s_in = self._resolve(self.source)
+		
+		self._write(s_in,timestamp)
+		
+		return s_in
+	
+	def process(self,frame):
+		"""
+		Write a single frame in streaming mode, and return it.
+		
+		Arguments:
+		frame -- SimSWARM.Signal.Frame instance.
+		
+		"""
+		
+		self._write(frame.payload,frame.timestamp)
+		
+		return frame
+	
+	def reset(self):
+		"""
+		Close the file and discard samples that do not fill a complete frame.
+		
+		Notes:
+		The next write starts the file over.
+		"""
+		
+		self.close()
+		self._pending = None
+		self._sample_index = None
+		self._offset = 0
+	
+	def close(self):
+		"""
+		Flush and close the file.
+		
+		Notes:
+		Samples that do not fill a complete frame are not written. Writing
+		continues at the end of the file if the writer is used again.
+		"""
+		
+		if (self._file != None):
+			self._file.close()
+			self._file = None
+	
+	def get_state(self):
+		"""
+		Return the samples not yet written and the file position as the mutable state of this writer.
+		
+		"""
+		
+		return {'pending': self._pending, 'sample_index': self._sample_index, 'offset': self._offset}
+	
+	def set_state(self,state):
+		"""
+		Restore the samples not yet written and the file position.
+		
+		Arguments:
+		state -- Dictionary as returned by get_state.
+		
+		Notes:
+		The file is reopened on the next write, and truncated to the
+		restored position.
+		"""
+		
+		self.close()
+		self._pending = state['pending']
+		self._sample_index = state['sample_index']
+		self._offset = state['offset']
+	
+	def plan(self):
+		"""
+		Return a description of the output, which is the input.
+		
+		"""
+		
+		return self._resolve_plan(self.source)
+	
+	def _spec_params(self):
+		"""
+		Return the file and frame parameters as constructor arguments.
+		
+		"""
+		
+		return {'path': self.path, 'bits': self.bits, 'station': self.station, 'epoch': self.epoch,
+			'start': self.start, 'frame_length': self.frame_length, 'buffer_size': self.buffer_size}
+	
+	def _upstream_time(self):
+		# Return the time of the next output of the nearest block upstream
+		# that produces a stream of frames, or None.
+		
+		blocks = self.upstream_blocks()
+		while (len(blocks) > 0):
+			timestamp = blocks[0]._frame_time()
+			if (timestamp != None):
+				return timestamp
+			blocks = blocks[1:] + blocks[0].upstream_blocks()
+		
+		return None
+	
+	def _write(self,s_in,timestamp):
+		# Encode the input signals and write all complete frames.
+		
+		if (isinstance(s_in,sg.DigitalSignalBatch)):
+			s_in = s_in.split()
+		elif (not isinstance(s_in,list)):
+			s_in = [s_in]
+		
+		if ((len(s_in) == 0) or (not all([isinstance(s,sg.DigitalSignal) for s in s_in]))):
+			raise ValueError("Input to VDIFWriter should be a DigitalSignal instance, or a list of such instances.")
+		
+		first = s_in[0]
+		is_complex = isinstance(first.samples_word,fw.WordComplex)
+		for s in s_in:
+			if ((s.sample_rate != first.sample_rate) or (s.number_of_samples != first.number_of_samples) or
+				(s.precision.width != first.precision.width) or (isinstance(s.samples_word,fw.WordComplex) != is_complex)):
+				raise ValueError("Signals written by VDIFWriter should have the same sample rate, length, width and sample type.")
+		
+		rate = int(first.sample_rate)
+		bits = self.bits if (self.bits != None) else first.precision.width
+		if (bits not in self._bits):
+			raise ValueError("VDIFWriter can only write " + ",".join([str(b) for b in self._bits]) + " bits per sample.")
+		if (rate != first.sample_rate):
+			raise ValueError("Sample rate for VDIFWriter should be a whole number of samples per second.")
+		
+		components = 2 if is_complex else 1
+		samples_per_frame = 8 * self.frame_length / (bits * components)
+		if (rate % samples_per_frame != 0):
+			raise ValueError("Sample rate should be a multiple of the " + str(samples_per_frame) + " samples in a VDIF frame.")
+		
+		# the time of the first sample only matters if there are no
+		# samples waiting to be written, later samples follow without gaps
+		if ((self._pending is None) or (self._pending.shape[-1] == 0)):
+			if (timestamp != None):
+				self._sample_index = int(round(timestamp * rate))
+			elif (self._sample_index == None):
+				self._sample_index = 0
+			
+			if (self._sample_index % samples_per_frame != 0):
+				raise ValueError("Time of first sample should be aligned to the start of a VDIF frame.")
+		
+		encoded = np.array([self._encode(s,bits) for s in s_in])
+		if ((self._pending is not None) and (self._pending.shape[-1] > 0)):
+			if (self._pending.shape[0] != encoded.shape[0]):
+				raise ValueError("Number of signals written by VDIFWriter should not change.")
+			encoded = np.concatenate((self._pending,encoded),axis=-1)
+		
+		frames = encoded.shape[-1] / (components * samples_per_frame)
+		split = frames * components * samples_per_frame
+		self._pending = encoded[:,split:]
+		if (frames == 0):
+			return
+		
+		data = encoded[:,:split].reshape((encoded.shape[0],frames,components * samples_per_frame))
+		if (bits < 8):
+			data = fw.pack(data,bits)
+		elif (bits == 8):
+			data = data.astype(np.uint8)
+		else:
+			data = data.astype('<u2').view(np.uint8)
+		
+		buf = np.empty((frames,len(s_in),self._header_length + self.frame_length),dtype=np.uint8)
+		buf[:,:,:self._header_length] = self._headers(frames,len(s_in),rate,samples_per_frame,bits,is_complex)
+		buf[:,:,self._header_length:] = data.transpose((1,0,2))
+		
+		self._open()
+		buf.tofile(self._file)
+		self._offset = self._offset + buf.nbytes
+		self._sample_index = self._sample_index + frames * samples_per_frame
+	
+	def _encode(self,s,bits):
+		# Return the samples of a signal as offset binary values of the
+		# given width, with real and imaginary components interleaved.
+		
+		word = s.samples_word
+		if (bits != s.precision.width):
+			lsb_pot = int(np.log2(s.precision.lsb_value)) + s.precision.width - bits
+			word_type = fw.WordComplex if isinstance(word,fw.WordComplex) else fw.Word
+			word = word_type.saturate(s.samples,fw.WordFormat(bits,lsb_pot))
+		
+		dtype = np.dtype(np.uint8) if (bits <= 8) else np.dtype(np.uint16)
+		if (isinstance(word,fw.WordComplex)):
+			scaled = np.empty((word.shape[-1],2),dtype=dtype)
+			scaled[:,0] = word.scaled_value_real
+			scaled[:,1] = word.scaled_value_imag
+			scaled = scaled.reshape(-1)
+		else:
+			scaled = np.array(word.scaled_value,dtype=dtype)
+		
+		# two's complement to offset binary by inverting the sign bit
+		np.bitwise_xor(scaled,dtype.type(1 << (bits - 1)),out=scaled)
+		
+		return scaled
+	
+	def _headers(self,frames,threads,rate,samples_per_frame,bits,is_complex):
+		# Return the headers of consecutive frames for each thread, as a
+		# (frames,threads,32) array of bytes.
+		
+		sample_index = self._sample_index + samples_per_frame * np.arange(0,frames,dtype=np.int64)
+		
+		words = np.zeros((frames,threads,8),dtype='<u4')
+		words[:,:,0] = ((self.start + sample_index / rate) & 0x3FFFFFFF).reshape((frames,1))
+		words[:,:,1] = ((self.epoch & 0x3F) << 24) | ((sample_index % rate) / samples_per_frame).reshape((frames,1))
+		words[:,:,2] = (self._header_length + self.frame_length) / 8
+		words[:,:,3] = (int(is_complex) << 31) | ((bits - 1) << 26) | (np.arange(0,threads) << 16) | (self.station & 0xFFFF)
+		
+		return words.view(np.uint8)
+	
+	def _open(self):
+		# Open the file for writing at the current offset.
+		
+		if ((self._file != None) and (not self._file.closed)):
+			return
+		
+		if (self._offset == 0):
+			self._file = open(self.path,'wb',self.buffer_size)
+		else:
+			self._file = open(self.path,'r+b',self.buffer_size)
+			self._file.seek(self._offset)
+			self._file.truncate()
+
+# end class VDIFWriter
+
+class VDIFReader(bl.Block):
+	"""
+	Source block that reads digital signals from a VDIF file.
+	
+	The file is memory-mapped, and the headers of all frames are indexed
+	once on construction, so that each output only reads the data frames
+	it needs from disk, whatever the size of the file. Like a 
+	TimeSteppingADC, each output holds the next number_of_samples samples
+	and advances the time offset, so that recorded data can be streamed
+	through the same blocks as simulated data:
+		
+		reader = VDIFReader('/data/sm.vdif',2**15,threads=[0,1,2,3])
+		chain = Chain()
+		chain.add_block(reader)
+		chain.add_block(Parallel(Requantizer(fmt2),4))
+		chain.add_block(Parallel(DigitalFFT(),4))
+		for frame in chain.stream():
+			...
+	
+	The output is a list of DigitalSignal instances, one for each of the
+	selected threads, or a single DigitalSignal if a single thread ID is
+	given. Time is counted from the start time, by default that of the 
+	first frame in the file, and seek moves to any time in the file 
+	through the frame index.
+	
+	Notes:
+	Samples are decoded by lookup tables that map each byte of packed 
+	samples (or each sample for 8 and 16 bits) directly to scaled values
+	in the output precision. Frames that are missing from the file, or
+	that are marked invalid, read as zero samples. For evaluation without
+	streaming, use a Parallel of readers with a single thread each, e.g.
+	Parallel([VDIFReader(path,length,threads=ii) for ii in range(4)]).
+	"""
+	
+	# Number of bits per sample that can be read.
+	_bits = (1,2,4,8,16)
+	
+	@property
+	def path(self):
+		"""
+		Return the path of the VDIF file.
+		
+		"""
+		
+		return self._path
+	
+	@property
+	def number_of_samples(self):
+		"""
+		Return the number of samples in each output.
+		
+		"""
+		
+		return self._number_of_samples
+	
+	@property
+	def precision(self):
+		"""
+		Return the precision of output samples.
+		
+		"""
+		
+		return self._precision
+	
+	@property
+	def threads(self):
+		"""
+		Return the thread ID, or list of thread IDs, that are read.
+		
+		"""
+		
+		return self._threads
+	
+	@property
+	def levels(self):
+		"""
+		Return the sample value for each code, or None for two's complement values.
+		
+		"""
+		
+		return self._levels
+	
+	@property
+	def sample_rate(self):
+		"""
+		Return the sample rate in samples per second.
+		
+		"""
+		
+		return self._sample_rate
+	
+	@property
+	def start(self):
+		"""
+		Return the number of seconds since the reference epoch at time zero.
+		
+		"""
+		
+		return self._start
+	
+	@property
+	def time_offset(self):
+		"""
+		Return the time of the first sample in the next output.
+		
+		"""
+		
+		return self._time_offset
+	
+	@property
+	def end_time(self):
+		"""
+		Return the time just after the last frame in the file.
+		
+		"""
+		
+		return 1.0 * self._frame_index.shape[0] * self._samples_per_frame / self.sample_rate
+	
+	@property
+	def bits(self):
+		"""
+		Return the number of bits per sample in the file.
+		
+		"""
+		
+		return self._bits_per_sample
+	
+	@property
+	def is_complex(self):
+		"""
+		Return True if the file holds complex samples.
+		
+		"""
+		
+		return self._is_complex
+	
+	@property
+	def station(self):
+		"""
+		Return the station ID in the first frame header.
+		
+		"""
+		
+		return self._station
+	
+	@property
+	def epoch(self):
+		"""
+		Return the reference epoch in the first frame header, in half-years since 2000-01-01.
+		
+		"""
+		
+		return self._epoch
+	
+	def __init__(self,path,length,precision=None,threads=None,levels=None,rate=None,start=None):
+		"""
+		Construct a VDIF reader.
+		
+		Arguments:
+		path -- Path of the VDIF file.
+		length -- The number of samples in each output.
+		
+		Keyword arguments:
+		precision -- FixedWidthBinary.WordFormat of output samples, or None
+		to use the bits per sample in the file with an lsb_value of one
+		(default is None).
+		threads -- Thread ID or list of thread IDs to read, or None to read
+		all threads in the file in order of ID (default is None).
+		levels -- Sample value for each of the 2**bits codes in the file,
+		in order of code, or None to read codes as offset binary numbers
+		(default is None).
+		rate -- Sample rate in samples per second, or None to derive it from
+		the largest frame number in the file, which then should span at
+		least one second (default is None).
+		start -- Number of seconds since the reference epoch at time zero,
+		or None to start at the first frame in the file (default is None).
+		
+		Notes:
+		Without levels, codes are read as offset binary numbers over the
+		range of the precision, the inverse of VDIFWriter. With levels 
+		(e.g. [-3.3359,-1,1,3.3359] for the usual 2-bit VLBI levels), 
+		values are saturated to the precision. Either way the values for
+		all codes are quantized once on construction.
+		"""
+		
+		self._source = None
+		self._path = path
+		self._number_of_samples = length
+		self._threads = threads
+		self._levels = levels
+		self._time_offset = 0.0
+		self._map = None
+		
+		self._index(rate,start)
+		
+		if (precision == None):
+			precision = fw.WordFormat(self.bits,0)
+		self._precision = precision
+		self._code_table = self._codes()
+	
+	def __getstate__(self):
+		# The memory map is not copied or pickled, copies map the file 
+		# again on their next output.
+		
+		state = self.__dict__.copy()
+		state['_map'] = None
+		
+		return state
+	
+	def seek(self,time):
+		"""
+		Set the time of the first sample in the next output.
+		
+		Arguments:
+		time -- Time in seconds since time zero, see start.
+		
+		"""
+		
+		self._time_offset = time
+	
+	def output(self):
+		"""
+		Return the next samples of each of the selected threads.
+		
+		Notes:
+		Only the frames that hold the requested samples are read, as found
+		through the frame index. The time offset is incremented by the 
+		time spanned by the samples.
+		"""
+		
+		length = self.number_of_samples
+		samples_per_frame = self._samples_per_frame
+		components = 2 if self.is_complex else 1
+		first = int(round(self.time_offset * self.sample_rate))
+		first_frame = first / samples_per_frame
+		end_frame = (first + length + samples_per_frame - 1) / samples_per_frame
+		if ((first < 0) or (end_frame > self._frame_index.shape[0])):
+			raise ValueError("Samples requested from VDIFReader are outside the time spanned by the file.")
+		
+		positions = self._frame_index[first_frame:end_frame].transpose()
+		data = self._open()[np.maximum(positions,0),self._header_length:]
+		scaled = self._decode(data)
+		scaled[positions < 0] = 0
+		
+		skip = first - first_frame * samples_per_frame
+		scaled = scaled.reshape((scaled.shape[0],-1))[:,(components * skip):(components * (skip + length))]
+		
+		self._time_offset = self.time_offset + 1.0 * length / self.sample_rate
+		
+		if (self.is_complex):
+			words = [fw.WordComplex.from_scaled_value(s[0::2],s[1::2],self.precision) for s in scaled]
+		else:
+			words = [fw.Word.from_scaled_value(s,self.precision) for s in scaled]
+		
+		out = [sg.DigitalSignal.from_word(self.sample_rate,word) for word in words]
+		if (self._single_thread()):
+			return out[0]
+		
+		return out
+	
+	def frames(self,n=None):
+		"""
+		Generate frames by repeatedly requesting the output of this reader.
+		
+		Keyword arguments:
+		n -- The number of frames to generate, or None to generate frames
+		up to the end of the file (default is None).
+		
+		"""
+		
+		if (n == None):
+			available = self._frame_index.shape[0] * self._samples_per_frame - int(round(self.time_offset * self.sample_rate))
+			n = max(available / self.number_of_samples,0)
+		
+		return super(VDIFReader,self).frames(n)
+	
+	def _frame_time(self):
+		# Each output is a new frame starting at the current time offset.
+		
+		return self.time_offset
+	
+	def get_state(self):
+		"""
+		Return the time offset as the mutable state of this reader.
+		
+		"""
+		
+		return {'time_offset': self.time_offset}
+	
+	def set_state(self,state):
+		"""
+		Restore the time offset of this reader.
+		
+		Arguments:
+		state -- Dictionary as returned by get_state.
+		"""
+		
+		self._time_offset = state['time_offset']
+	
+	def plan(self):
+		"""
+		Return a description of the digital output, without reading the file.
+		
+		"""
+		
+		plans = [sg.SignalPlan('digital',self.sample_rate,self.number_of_samples,self.is_complex,self.precision,saturated=True) for ii in self._thread_ids]
+		if (self._single_thread()):
+			return plans[0]
+		
+		return plans
+	
+	def _spec_params(self):
+		"""
+		Return the file, selection and decoding parameters as constructor arguments.
+		
+		"""
+		
+		return {'path': self.path, 'length': self.number_of_samples, 'precision': self.precision, 
+			'threads': self.threads, 'levels': self.levels, 'rate': self.sample_rate, 'start': self.start}
+	
+	def _single_thread(self):
+		# Return True if output is a single signal rather than a list.
+		
+		return (self.threads != None) and (not isinstance(self.threads,(list,tuple)))
+	
+	def _open(self):
+		# Map the file if needed, and return its frames as a 
+		# (frames,bytes) array.
+		
+		if (self._map is None):
+			data = np.memmap(self.path,dtype=np.uint8,mode='r')
+			count = data.size / self._frame_bytes
+			self._map = data[:(count * self._frame_bytes)].reshape((count,self._frame_bytes))
+		
+		return self._map
+	
+	def _index(self,rate,start):
+		# Read the format from the first frame header, and index the
+		# position in the file of the frame of each selected thread at 
+		# each frame time, as a (times,threads) array with -1 for missing
+		# frames.
+		
+		first = np.fromfile(self.path,dtype='<u4',count=4)
+		if (first.size < 4):
+			raise ValueError("File " + self.path + " does not hold a VDIF frame.")
+		
+		# legacy headers omit the last four words
+		self._header_length = 16 if ((first[0] >> 30) & 1) else 32
+		self._frame_bytes = int(first[2] & 0xFFFFFF) * 8
+		
+		frames = self._open()
+		words = np.ascontiguousarray(frames[:,:16]).view('<u4')
+		if ((np.any(words[:,2] & 0xFFFFFF != words[0,2] & 0xFFFFFF)) or (np.any(words[:,3] >> 26 != words[0,3] >> 26))):
+			raise ValueError("Frames in a VDIF file should have the same length, bits per sample and sample type.")
+		
+		self._bits_per_sample = int((words[0,3] >> 26) & 0x1F) + 1
+		self._is_complex = bool(words[0,3] >> 31)
+		self._station = int(words[0,3] & 0xFFFF)
+		self._epoch = int((words[0,1] >> 24) & 0x3F)
+		if (self.bits not in self._bits):
+			raise ValueError("VDIFReader can only read " + ",".join([str(b) for b in self._bits]) + " bits per sample.")
+		
+		components = 2 if self.is_complex else 1
+		self._samples_per_frame = 8 * (self._frame_bytes - self._header_length) / (self.bits * components)
+		
+		frame_number = (words[:,1] & 0xFFFFFF).astype(np.int64)
+		if (rate == None):
+			rate = (int(frame_number.max()) + 1) * self._samples_per_frame
+		if (rate % self._samples_per_frame != 0):
+			raise ValueError("Sample rate should be a multiple of the " + str(self._samples_per_frame) + " samples in a VDIF frame.")
+		self._sample_rate = rate
+		
+		# count frames of each thread from the frame at time zero
+		frames_per_second = int(rate) / self._samples_per_frame
+		count = (words[:,0] & 0x3FFFFFFF).astype(np.int64) * frames_per_second + frame_number
+		if (start == None):
+			start = 1.0 * count.min() / frames_per_second
+		self._start = start
+		count = count - int(round(start * frames_per_second))
+		
+		thread = (words[:,3] >> 16) & 0x3FF
+		in_file = np.unique(thread)
+		if (self.threads == None):
+			self._thread_ids = [int(t) for t in in_file]
+		elif (self._single_thread()):
+			self._thread_ids = [self.threads]
+		else:
+			self._thread_ids = list(self.threads)
+		
+		for t in self._thread_ids:
+			if (t not in in_file):
+				raise ValueError("Thread " + str(t) + " is not in the VDIF file.")
+		
+		column = -np.ones(1024,dtype=np.int64)
+		column[self._thread_ids] = np.arange(0,len(self._thread_ids))
+		column = column[thread]
+		
+		valid = (column >= 0) & (count >= 0) & ((words[:,0] >> 31) == 0)
+		times = int(count[valid].max()) + 1 if np.any(valid) else 0
+		self._frame_index = -np.ones((times,len(self._thread_ids)),dtype=np.int64)
+		self._frame_index[count[valid],column[valid]] = np.nonzero(valid)[0]
+	
+	def _codes(self):
+		# Return the scaled value in the output precision for each code.
+		
+		codes = np.arange(0,2**self.bits)
+		if (self.levels is None):
+			lsb_value = self.precision.lsb_value * 2.0**(self.precision.width - self.bits)
+			levels = (codes - 2**(self.bits - 1)) * lsb_value
+		else:
+			levels = np.asarray(self.levels,dtype=np.float64)
+			if (levels.shape != codes.shape):
+				raise ValueError("Number of levels should be " + str(codes.size) + " for " + str(self.bits) + " bits per sample.")
+		
+		return fw.Word.saturate(levels,self.precision).scaled_value
+	
+	def _decode(self,data):
+		# Return the scaled values for the data of each frame, as a 
+		# (threads,frames,values) array.
+		
+		if (self.bits < 8):
+			count = 8 * data.shape[-1] / self.bits
+			return fw.unpack(data,self.bits,count,table=self._code_table)
+		elif (self.bits == 8):
+			return self._code_table[data]
+		
+		return self._code_table[data.view('<u2')]
+
+# end class VDIFReader
@@ -16,6 +16,19 @@
 #	AY: Implemented more memory efficient noise generation for large time offsets 2015-02-11
 #	AY: Zero-padding for FFT when adding fine delay
 #	AY: Changed noise generation to more CPU- and memory efficient implementation 2015-02-19
+#	AY: Added time-varying delay (delay polynomial) to TransformedAnalogSignal 2026-10-18
+#	AY: Added Frame for streaming signals through blocks 2026-10-18
+#	AY: Replaced deep copy of signals by clone method 2026-10-18
+#	AY: Added DigitalSignalBatch for batched parallel paths 2026-10-18
+#	AY: Added SignalPlan for planning block networks 2026-10-18
+#	AY: Added spec methods and explicit seeds for declarative descriptions 2026-10-18
+#	AY: Fixed length of time vector for some sample counts and rates 2026-10-18
+#	AY: Added construction of DigitalSignal from a samples word 2026-10-18
+#	AY: Added bit-packed storage of low-width digital signals 2026-10-18
+#	AY: Count saturated samples at their storage size in SignalPlan 2026-10-18
+#	AY: Keep generator seeds within the range of the random generator 2026-10-18
+#	AY: Stack and split batches on scaled values 2026-10-18
+#	AY: Aligned description of overflows in SignalPlan with the planner report 2026-10-18
 
 """
 Defines various signal utilities.
@@ -55,10 +68,41 @@ class Signal(object):
 		s -- Signal instance to copy.
 		
 		Notes:
-		Current implementation uses a deep copy.
+		Current implementation uses the clone method of s, see clone.
 		"""
 		
-		return copy.deepcopy(s)
+		return s.clone()
+	
+	def clone(self):
+		"""
+		Construct and return a copy of this signal.
+		
+		Notes:
+		Parameters such as the signal generator or stored samples are 
+		shared with the original, only attributes that are changed by 
+		the apply_* methods of derived classes are copied. This is much
+		cheaper than a deep copy, and equivalent since generators and
+		samples are never modified after construction.
+		
+		This implementation returns a shallow copy, derived classes that
+		hold mutable containers should override it.
+		"""
+		
+		return copy.copy(self)
+	
+	def _spec_params(self):
+		"""
+		Return the constructor arguments of this signal as a dictionary.
+		
+		Notes:
+		The dictionary maps keyword argument names of the constructor to 
+		their values, and is used to describe the signal in a declarative 
+		spec (see SimSWARM.Spec). This implementation returns an empty 
+		dictionary, derived classes of which the constructor takes arguments
+		should override it.
+		"""
+		
+		return dict()
 
 # end class Signal
 
@@ -105,6 +149,14 @@ class AnalogSignal(Signal):
 		"""
 		
 		return self._generator
+	
+	def _spec_params(self):
+		"""
+		Return the generator as constructor argument.
+		
+		"""
+		
+		return {'gen': self.generator}
 
 # end class AnalogSignal
 
@@ -113,8 +165,9 @@ class TransformedAnalogSignal(AnalogSignal):
 	"""
 	Extend functionality of AnalogSignal to account for analog transformations.
 	
-	Current implementation allows for a flat gain, time delay, frequency
-	magnitude slope, and frequency phase slope. All methods are
+	Current implementation allows for a flat gain, time delay (constant or
+	polynomial in time), frequency magnitude slope, and frequency phase 
+	slope. All methods are
 	inherited as-is from AnalogSignal, except for the sample method 
 	which applies the transformations to the signal before returning the
 	result, and the constructor which sets default parameters for all
@@ -122,6 +175,16 @@ class TransformedAnalogSignal(AnalogSignal):
 	related to these transformations.
 	"""
 	
+	# Half-width, in samples, of the windowed-sinc kernel used to resample
+	# the generator output when the delay varies with time. The kernel
+	# spans 2*_resampler_half_width samples of the underlying signal.
+	_resampler_half_width = 16
+	
+	# Number of output samples resampled at once when the delay varies
+	# with time. Long sampling requests are processed in chunks of this
+	# size so that the interpolation temporaries remain bounded.
+	_resampler_chunk_size = 2**14
+	
 	@property
 	def time_delay(self):
 		"""
@@ -131,6 +194,18 @@ class TransformedAnalogSignal(AnalogSignal):
 		
 		return self._time_delay
 	
+	@property
+	def delay_polynomial(self):
+		"""
+		Return the delay polynomial coefficients applied to the signal.
+		
+		The coefficients are returned as a tuple (d0,d1,d2,...) in order
+		of ascending power, such that the delay at time t is given by 
+		d0 + d1*t + d2*t**2 + ... The constant term d0 is the time_delay.
+		"""
+		
+		return (self.time_delay,) + tuple(self._delay_rates)
+	
 	@property
 	def flat_gain(self):
 		"""
@@ -173,11 +248,13 @@ class TransformedAnalogSignal(AnalogSignal):
 			raise ValueError("TransformedAnalogSignal can only be created from instances of AnalogSignal.")
 		elif (isinstance(analog_signal, TransformedAnalogSignal)):
 			self._time_delay = analog_signal.time_delay
+			self._delay_rates = list(analog_signal._delay_rates)
 			self._flat_gain = analog_signal.flat_gain
 			self._frequency_magnitude_slope = analog_signal.frequency_magnitude_slope
 			self._frequency_phase_slope = analog_signal.frequency_phase_slope
 		else:
 			self._time_delay = 0.0
+			self._delay_rates = list()
 			self._flat_gain = 1.0
 			self._frequency_magnitude_slope = None
 			self._frequency_phase_slope = None
@@ -203,9 +280,16 @@ class TransformedAnalogSignal(AnalogSignal):
 		samples corresponding to the time-domain sampling. Finally, the
 		iFFT is applied to obtain the corresponding time-domain signal
 		samples, which are then returned.
+		
+		If the delay polynomial has non-zero terms of order one or higher,
+		the generator output is instead resampled at the delayed sample
+		times using a windowed-sinc interpolator, see _sample_variable_delay.
 		"""
 		
-		td_samples = self.flat_gain * self.generator.generate(r,n,t + self.time_delay)
+		if (any(self._delay_rates)):
+			td_samples = self.flat_gain * self._sample_variable_delay(r,n,t)
+		else:
+			td_samples = self.flat_gain * self.generator.generate(r,n,t + self.time_delay)
 		if ((self.frequency_magnitude_slope == None) and (self.frequency_phase_slope == None)):
 			return td_samples
 		
@@ -223,6 +307,48 @@ class TransformedAnalogSignal(AnalogSignal):
 		td_samples = np.fft.ifft(np.fft.ifftshift(fd_samples)).real
 		return td_samples
 	
+	def _sample_variable_delay(self,r,n,t):
+		# Sample the generator at times t_k + delay(t_k), where t_k are the
+		# sampling instants and delay(t) the delay polynomial. The generator
+		# is sampled on its own regular grid (at rate r) covering the delayed
+		# times of a chunk of output samples, and each output sample is then
+		# interpolated from the 2*L nearest grid samples with a Hann-windowed
+		# sinc kernel. This is band-limited interpolation, so it is exact up
+		# to the kernel truncation error for signals band-limited to r/2.
+		
+		L = self._resampler_half_width
+		taps = np.arange(-L+1,L+1)
+		result = np.zeros(n)
+		for start in range(0,n,self._resampler_chunk_size):
+			stop = min(n,start + self._resampler_chunk_size)
+			t_k = t + np.arange(start,stop)/(1.0*r)
+			# delayed sample instants in units of the sample period
+			pos = (t_k + self._delay_at(t_k))*r
+			idx = np.array(np.floor(pos),dtype=np.int64)
+			frac = pos - idx
+			# sample the generator over the range spanned by the kernel
+			grid_start = idx.min() - L + 1
+			grid_count = idx.max() + L - grid_start + 1
+			grid = self.generator.generate(r,grid_count,1.0*grid_start/r)[0:grid_count]
+			# distance from each interpolation point to each kernel tap
+			dist = frac.reshape((-1,1)) - taps.reshape((1,-1))
+			kernel = np.sinc(dist) * (0.5 + 0.5*np.cos(pi*dist/L))
+			grid_idx = (idx - grid_start).reshape((-1,1)) + taps.reshape((1,-1))
+			result[start:stop] = np.sum(grid[grid_idx]*kernel,axis=1)
+		
+		return result
+	
+	def _delay_at(self,t):
+		# Evaluate the delay polynomial at the given time(s).
+		
+		delay = self.time_delay * np.ones(np.shape(t))
+		t_pow = 1.0
+		for d in self._delay_rates:
+			t_pow = t_pow * t
+			delay = delay + d*t_pow
+		
+		return delay
+	
 	def apply_delay(self,d):
 		"""
 		Apply a delay to the analog signal.
@@ -236,6 +362,46 @@ class TransformedAnalogSignal(AnalogSignal):
 		
 		self._time_delay = self.time_delay + d
 	
+	def clone(self):
+		"""
+		Construct and return a copy of this signal.
+		
+		Notes:
+		The generator is shared with the original, the transformation
+		parameters are copied.
+		"""
+		
+		result = copy.copy(self)
+		result._delay_rates = list(self._delay_rates)
+		
+		return result
+	
+	def apply_delay_polynomial(self,coeffs):
+		"""
+		Apply a time-varying delay to the analog signal.
+		
+		Arguments:
+		coeffs -- Sequence of delay polynomial coefficients (d0,d1,d2,...)
+		in order of ascending power, in units of s, s/s, s/s^2, etc.
+		
+		Notes:
+		The delay at time t is d0 + d1*t + d2*t**2 + ..., where t is the 
+		absolute sampling time, i.e. including the time offset passed to
+		sample. The constant term is added to time_delay.
+		
+		Additional delay polynomials are additive.
+		"""
+		
+		coeffs = list(coeffs)
+		if (len(coeffs) == 0):
+			return
+		
+		self.apply_delay(coeffs[0])
+		for ii in range(1,len(coeffs)):
+			if (ii > len(self._delay_rates)):
+				self._delay_rates.append(0.0)
+			self._delay_rates[ii-1] = self._delay_rates[ii-1] + coeffs[ii]
+	
 	def apply_gain(self,g):
 		"""
 		Apply a constant gain to the analog signal.
@@ -300,6 +466,36 @@ class TransformedAnalogSignal(AnalogSignal):
 			self._frequency_phase_slope = p
 		else:
 			self._frequency_phase_slope = self.frequency_phase_slope * p
+	
+	def _spec_params(self):
+		"""
+		Return the generator and transformation parameters of this signal.
+		
+		Notes:
+		The constructor of this class takes an AnalogSignal instead, see
+		_from_spec_params.
+		"""
+		
+		return {'generator': self.generator, 'time_delay': self.time_delay,
+			'delay_rates': self._delay_rates, 'flat_gain': self.flat_gain,
+			'frequency_magnitude_slope': self.frequency_magnitude_slope,
+			'frequency_phase_slope': self.frequency_phase_slope}
+	
+	@classmethod
+	def _from_spec_params(cls,params):
+		"""
+		Construct a signal from the dictionary returned by _spec_params.
+		
+		"""
+		
+		result = cls(AnalogSignal(params['generator']))
+		result._time_delay = params['time_delay']
+		result._delay_rates = list(params['delay_rates'])
+		result._flat_gain = params['flat_gain']
+		result._frequency_magnitude_slope = params['frequency_magnitude_slope']
+		result._frequency_phase_slope = params['frequency_phase_slope']
+		
+		return result
 
 # end class TransformedAnalogSignal
 
@@ -385,6 +581,36 @@ class CompoundAnalogSignal(TransformedAnalogSignal):
 		
 		for c in self.components:
 			c.apply_delay(d)
+	
+	def clone(self):
+		"""
+		Construct and return a copy of this compound signal.
+		
+		Notes:
+		Each of the components is cloned, see TransformedAnalogSignal.clone.
+		"""
+		
+		result = copy.copy(self)
+		result._components = [c.clone() for c in self.components]
+		
+		return result
+	
+	def apply_delay_polynomial(self,coeffs):
+		"""
+		Apply a time-varying delay to the compound analog signal.
+		
+		Arguments:
+		coeffs -- Sequence of delay polynomial coefficients (d0,d1,d2,...)
+		in order of ascending power.
+		
+		Notes:
+		Delay polynomials are applied to each component signal individually.
+		
+		See method in TransformedAnalogSignal for more information.
+		"""
+		
+		for c in self.components:
+			c.apply_delay_polynomial(coeffs)
 
 	def apply_gain(self,g):
 		"""
@@ -439,6 +665,23 @@ class CompoundAnalogSignal(TransformedAnalogSignal):
 		
 		for c in self.components:
 			c.apply_frequency_phase_slope(p)
+	
+	def _spec_params(self):
+		"""
+		Return the signal components as constructor argument.
+		
+		"""
+		
+		return {'signals': self.components}
+	
+	@classmethod
+	def _from_spec_params(cls,params):
+		"""
+		Construct a signal from the dictionary returned by _spec_params.
+		
+		"""
+		
+		return cls(params['signals'])
 
 # end class CompoundAnalogSignal
 
@@ -488,9 +731,22 @@ class Generator(object):
 		"""
 		
 		delta_t = 1.0/r
-		t_stop = n*delta_t
 		
-		return np.arange(0,t_stop,delta_t) + t
+		# build from sample indices, since an arange over [0,n*delta_t)
+		# may contain n+1 elements due to rounding
+		return np.arange(0,n)*delta_t + t
+	
+	def _spec_params(self):
+		"""
+		Return the constructor arguments of this generator as a dictionary.
+		
+		Notes:
+		See SimSWARM.Signal.Signal._spec_params. This implementation returns
+		an empty dictionary, derived classes of which the constructor takes
+		arguments should override it.
+		"""
+		
+		return dict()
 
 # end class Generator
 
@@ -533,6 +789,14 @@ class ConstantGenerator(Generator):
 		
 		"""
 		return self._amplitude
+	
+	def _spec_params(self):
+		"""
+		Return the amplitude as constructor argument.
+		
+		"""
+		
+		return {'amplitude': self.amplitude}
 
 # end class ConstantGenerator
 
@@ -598,6 +862,14 @@ class SinusoidGenerator(Generator):
 		"""
 		
 		return self._phase
+	
+	def _spec_params(self):
+		"""
+		Return the amplitude, frequency and phase as constructor arguments.
+		
+		"""
+		
+		return {'amplitude': self.amplitude, 'frequency': self.frequency, 'phase': self.phase}
 
 # end class SinusoidGenerator
 
@@ -609,12 +881,17 @@ class GaussianNoiseGenerator(Generator):
 	
 	# Keeps a list of all the seeds used so far to reseed the random
 	# number generator with each new instance of a GaussianNoiseGenerator
-	# object. The list contains unsigned integers and new seeds are
-	# added with increments of 2. This is to allow both positive and
-	# negative time delays in the signal by using even-numbered seeds for
-	# positive time sampling and odd-numbered seeds for negative time 
-	# sampling.
+	# object. The list contains unsigned integers, and its last element 
+	# is the seed for the next generator created without a seed. Each 
+	# generator uses seeds with increments of 2 from its base seed. This 
+	# is to allow both positive and negative time delays in the signal by
+	# using even-numbered seeds for positive time sampling and 
+	# odd-numbered seeds for negative time sampling.
 	_seed_list = list([0])
+	
+	# The random generator accepts seeds in [0,2**32-1]. Base seeds and 
+	# the seeds derived from them are taken modulo this number.
+	_seed_modulus = 2**32
 
 	#~ # In order to generate signals with very large time-offsets we define
 	#~ # this parameter as the largest argument to the call np.rand.randn().
@@ -632,23 +909,28 @@ class GaussianNoiseGenerator(Generator):
 	
 	# To allow for very large time offsets a large number of seeds need
 	# to be available for each different generator. This is the increment
-	# in seed value for each  new generator. Allows for roughly 1G different
-	# generators to be instantiated without error, and combined with the
-	# the number of samples per seed gives about 4P samples per generator
-	# before overlap occurs.
+	# in base seed for each new generator, modulo _seed_modulus. It is 
+	# close to _seed_modulus divided by the golden ratio, which spreads
+	# the base seeds of successive generators evenly over the range of 
+	# seeds, e.g. the base seeds of the first 10 generators are at least
+	# 2**27 apart, which combined with the number of samples per seed
+	# gives about 2**26 windows or 70T samples per generator in either
+	# direction of time before overlap occurs.
 	#
 	# Something strange happens when this parameter is a large power-of-two
 	# which results in different generators producing the exact sample
 	# series.
-	_seed_increment_per_generator = 2**32-1
+	_seed_increment_per_generator = 2654435769
 	
-	def __init__(self,mean=0.0,variance=1.0):
+	def __init__(self,mean=0.0,variance=1.0,seed=None):
 		"""
 		Construct a gaussian noise signal with the given characteristics.
 		
 		Keyword arguments:
 		mean -- Signal mean to pass to the random generator.
 		variance -- Signal variance to pass to the random generator.
+		seed -- Base seed for the random generator in [0,2**32-1], or 
+		None to assign a new unique seed (default is None).
 		
 		Notes:
 		The statistical properties are only pass to the random number
@@ -660,11 +942,27 @@ class GaussianNoiseGenerator(Generator):
 		setting the random generator seed accordingly. This means that
 		calling the generate method may impact on other code that uses
 		numpy.random.
+		
+		If a seed is given, e.g. to reconstruct a generator described in
+		a spec, it is added to the seeds used so far, and the seeds 
+		assigned to generators created afterwards differ from it, so that
+		these do not produce the same samples. A ValueError is raised if
+		the seed is outside the range of the random generator.
 		"""
 		
-		# Create new seed and add to the list.
-		this_seed = self._seed_list[-1]
-		self._seed_list.append(this_seed + self._seed_increment_per_generator)
+		if (seed == None):
+			# Use the next seed, and add a new unused seed to the list.
+			this_seed = self._seed_list[-1]
+			self._seed_list.append(self._next_free_seed(this_seed))
+		else:
+			if ((seed < 0) or (seed >= self._seed_modulus)):
+				raise ValueError("Seed for GaussianNoiseGenerator should be between 0 and 2**32 - 1.")
+			
+			this_seed = int(seed)
+			if (this_seed == self._seed_list[-1]):
+				self._seed_list.append(self._next_free_seed(this_seed))
+			elif (this_seed not in self._seed_list):
+				self._seed_list.insert(-1,this_seed)
 		
 		# Assign this instance seed
 		self._base_seed = this_seed
@@ -672,6 +970,18 @@ class GaussianNoiseGenerator(Generator):
 		self._mean = mean
 		self._variance = variance
 	
+	@classmethod
+	def _next_free_seed(cls,seed):
+		# Return the first seed after the given one, in increments of 
+		# _seed_increment_per_generator, that is not yet in the list of 
+		# seeds used.
+		
+		next_seed = (seed + cls._seed_increment_per_generator) % cls._seed_modulus
+		while (next_seed in cls._seed_list):
+			next_seed = (next_seed + cls._seed_increment_per_generator) % cls._seed_modulus
+		
+		return next_seed
+	
 	def generate(self,r,n,t):
 		"""
 		Generate samples for a gaussian noise signal.
@@ -873,7 +1183,7 @@ class GaussianNoiseGenerator(Generator):
 		else:
 			base_seed = base_seed['pos']
 		
-		seed = base_seed + 2*np.abs(window)
+		seed = (base_seed + 2*abs(window)) % self._seed_modulus
 		
 		return np.random.RandomState(seed)
 
@@ -910,6 +1220,17 @@ class GaussianNoiseGenerator(Generator):
 		"""
 		
 		return self._variance
+	
+	def _spec_params(self):
+		"""
+		Return the mean, variance and seed as constructor arguments.
+		
+		Notes:
+		The seed is included so that the generator constructed from these
+		arguments produces the same samples as this one.
+		"""
+		
+		return {'mean': self.mean, 'variance': self.variance, 'seed': self._base_seed}
 
 # end class GaussianNoiseGenerator
 
@@ -923,7 +1244,7 @@ class DigitalSignal(Signal):
 	as a FixedWidthBinary.Word (or .WordComplex) instance.
 	"""
 	
-	def __init__(self,rate,precision,svec,force_complex=False):
+	def __init__(self,rate,precision,svec,force_complex=False,packed=False):
 		"""
 		Construct a digital signal for the given rate, precision and samples.
 		
@@ -936,19 +1257,24 @@ class DigitalSignal(Signal):
 		Keyword arguments:
 		force_complex -- Force FixedWidthBinary.WordComplex to be used when
 		set to True (default is False).
+		packed -- Store samples packed into bytes when set to True, which
+		requires a precision of 1, 2 or 4 bits (default is False).
 		
 		Notes:
 		svec can be complex-valued, in which case it is stored internally
 		as FixedWidthBinary.WordComplex; if it is real-valued, it is stored
-		as FixedWidthBinary.Word.
+		as FixedWidthBinary.Word. Packed samples are stored as
+		FixedWidthBinary.PackedWordComplex and .PackedWord respectively.
 		"""
 		
 		self._sample_rate = rate
 		self._precision = precision
 		if (np.iscomplexobj(svec) or force_complex):
-			self._samples_word = fw.WordComplex(svec,precision)
+			word_type = fw.PackedWordComplex if packed else fw.WordComplex
 		else:
-			self._samples_word = fw.Word(svec,precision)
+			word_type = fw.PackedWord if packed else fw.Word
+		
+		self._samples_word = word_type(svec,precision)
 	
 	@property
 	def sample_rate(self):
@@ -992,11 +1318,452 @@ class DigitalSignal(Signal):
 		
 		"""
 		
-		return self._samples_word.value.size
+		return int(np.prod(self._samples_word.shape))
+	
+	@property
+	def is_packed(self):
+		"""
+		Return True if the samples are stored packed into bytes.
+		
+		"""
+		
+		return isinstance(self._samples_word,(fw.PackedWord,fw.PackedWordComplex))
+	
+	@classmethod
+	def from_word(cls,rate,word):
+		"""
+		Construct a digital signal around the given samples word.
+		
+		Arguments:
+		rate -- Sampling rate in samples per second.
+		word -- FixedWidthBinary.Word (or .WordComplex) instance that holds
+		the signal samples, and defines the precision.
+		
+		Notes:
+		Unlike the constructor, the samples are not converted to the word
+		format, and the word is used without copying, e.g. a word built 
+		around a buffer in shared memory (see 
+		FixedWidthBinary.Word.from_scaled_value).
+		"""
+		
+		s = cls.__new__(cls)
+		s._sample_rate = rate
+		s._precision = word.word_format
+		s._samples_word = word
+		
+		return s
+	
+	def _spec_params(self):
+		"""
+		Return the sample rate, precision and samples as constructor arguments.
+		
+		"""
+		
+		params = {'rate': self.sample_rate, 'precision': self.precision, 'svec': self.samples,
+			'force_complex': isinstance(self.samples_word,fw.WordComplex)}
+		# only given for packed signals, which leaves other specs unchanged
+		if (self.is_packed):
+			params['packed'] = True
+		
+		return params
 
 # end class DigitalSignal
 
 
+class DigitalSignalBatch(DigitalSignal):
+	"""
+	Represent a number of digital signals as a single batch.
+	
+	The samples of N parallel signal paths are stored as a single
+	(N,samples) array, with sample rate and precision shared by all
+	paths. This allows blocks to process all paths of a Parallel in a
+	single numpy operation, see SimSWARM.Blocks.Parallel.batch_output.
+	"""
+	
+	def __init__(self,rate,precision,svec,force_complex=False,packed=False):
+		"""
+		Construct a batch of digital signals.
+		
+		Arguments:
+		rate -- Sampling rate in samples per second.
+		precision -- FixedWidthType that defines the binary representation
+		of signal samples
+		svec -- A two-dimensional array of sampled values, each row
+		contains the samples of one signal path.
+		
+		Keyword arguments:
+		force_complex -- Force FixedWidthBinary.WordComplex to be used when
+		set to True (default is False).
+		packed -- Store samples packed into bytes when set to True, see
+		DigitalSignal (default is False).
+		
+		"""
+		
+		if (np.ndim(svec) != 2):
+			raise ValueError("Samples for DigitalSignalBatch should be a two-dimensional array.")
+		
+		super(DigitalSignalBatch,self).__init__(rate,precision,svec,force_complex=force_complex,packed=packed)
+	
+	@property
+	def number_of_paths(self):
+		"""
+		Return the number of signal paths in the batch.
+		
+		"""
+		
+		return self._samples_word.shape[0]
+	
+	@property
+	def number_of_samples(self):
+		"""
+		Return the number of signal samples per path.
+		
+		"""
+		
+		return self._samples_word.shape[-1]
+	
+	def path(self,ii):
+		"""
+		Return the signal in the given path as a DigitalSignal.
+		
+		Arguments:
+		ii -- Index of the signal path.
+		
+		"""
+		
+		return DigitalSignal(self.sample_rate,self.precision,self.samples[ii],force_complex=self._is_complex(),packed=self.is_packed)
+	
+	def split(self):
+		"""
+		Return the signals in all paths as a list of DigitalSignal instances.
+		
+		Notes:
+		The signals are constructed around the scaled values of each path,
+		without converting the samples to the word format again.
+		"""
+		
+		word = self.samples_word
+		fmt = word.word_format
+		if (self._is_complex()):
+			real = word.scaled_value_real
+			imag = word.scaled_value_imag
+			words = [type(word).from_scaled_value(real[ii],imag[ii],fmt) for ii in range(0,real.shape[0])]
+		else:
+			scaled = word.scaled_value
+			words = [type(word).from_scaled_value(scaled[ii],fmt) for ii in range(0,scaled.shape[0])]
+		
+		return [DigitalSignal.from_word(self.sample_rate,w) for w in words]
+	
+	def _is_complex(self):
+		# Samples are complex if stored as FixedWidthBinary.WordComplex.
+		
+		return isinstance(self._samples_word,fw.WordComplex)
+	
+	@classmethod
+	def stackable(cls,signals):
+		"""
+		Return True if the given signals can be combined into a batch.
+		
+		Arguments:
+		signals -- List of DigitalSignal instances.
+		
+		Notes:
+		Signals can be combined if they have the same sample rate,
+		precision, number of samples and sample type (real or complex).
+		"""
+		
+		if ((len(signals) == 0) or (not all([isinstance(s,DigitalSignal) for s in signals]))):
+			return False
+		
+		first = signals[0]
+		for s in signals:
+			if (isinstance(s,DigitalSignalBatch)):
+				return False
+			
+			if ((s.sample_rate != first.sample_rate) or
+				(s.precision.width != first.precision.width) or
+				(s.precision.lsb_value != first.precision.lsb_value) or
+				(s.number_of_samples != first.number_of_samples) or
+				(type(s.samples_word) != type(first.samples_word))):
+				return False
+		
+		return True
+	
+	@classmethod
+	def stack(cls,signals):
+		"""
+		Combine a list of digital signals into a batch.
+		
+		Arguments:
+		signals -- List of DigitalSignal instances, see stackable.
+		
+		Notes:
+		The scaled values of the signals are stacked, without converting
+		the samples to the word format again.
+		"""
+		
+		if (not cls.stackable(signals)):
+			raise ValueError("Signals cannot be combined into a DigitalSignalBatch.")
+		
+		first = signals[0]
+		word_type = type(first.samples_word)
+		if (isinstance(first.samples_word,fw.WordComplex)):
+			real = np.array([s.samples_word.scaled_value_real for s in signals])
+			imag = np.array([s.samples_word.scaled_value_imag for s in signals])
+			word = word_type.from_scaled_value(real,imag,first.precision)
+		else:
+			scaled = np.array([s.samples_word.scaled_value for s in signals])
+			word = word_type.from_scaled_value(scaled,first.precision)
+		
+		return cls.from_word(first.sample_rate,word)
+
+# end class DigitalSignalBatch
+
+
+class SignalPlan(object):
+	"""
+	Describe a signal without holding its samples.
+	
+	A SignalPlan records the properties of a signal that a block would
+	produce: whether it is analog or digital, and for digital signals the
+	sample rate, number of samples, sample type (real or complex) and
+	precision. Plans are propagated through a network of blocks by
+	Block.plan, to estimate word formats and memory use before any data
+	is generated.
+	"""
+	
+	@property
+	def kind(self):
+		"""
+		Return the kind of signal, either 'analog' or 'digital'.
+		
+		"""
+		
+		return self._kind
+	
+	@property
+	def sample_rate(self):
+		"""
+		Return the sample rate, or None for analog signals.
+		
+		"""
+		
+		return self._sample_rate
+	
+	@property
+	def number_of_samples(self):
+		"""
+		Return the number of samples, or None for analog signals.
+		
+		"""
+		
+		return self._number_of_samples
+	
+	@property
+	def is_complex(self):
+		"""
+		Return True if samples are complex-valued.
+		
+		"""
+		
+		return self._is_complex
+	
+	@property
+	def precision(self):
+		"""
+		Return the precision as a FixedWidthBinary.WordFormat, or None for analog signals.
+		
+		"""
+		
+		return self._precision
+	
+	@property
+	def is_packed(self):
+		"""
+		Return True if samples are stored packed into bytes.
+		
+		"""
+		
+		return self._is_packed
+	
+	@property
+	def is_saturated(self):
+		"""
+		Return True if samples are stored in the narrowest type for their width.
+		
+		"""
+		
+		return self._is_saturated
+	
+	@property
+	def nbytes(self):
+		"""
+		Return the memory needed to store the samples, in bytes.
+		
+		Notes:
+		Samples are stored as 64-bit scaled values, packed into bytes for 
+		packed signals, or in the storage type of the precision (see 
+		FixedWidthBinary.WordFormat.storage_dtype) for saturated signals,
+		with separate real and imaginary parts for complex samples. Analog signals are not stored, but sampled when
+		requested, and take no memory.
+		"""
+		
+		if (self.kind == 'analog'):
+			return 0
+		
+		if (self.is_packed):
+			per_byte = 8 / self.precision.width
+			nbytes = (self.number_of_samples + per_byte - 1) / per_byte
+		elif (self.is_saturated):
+			nbytes = self.precision.storage_dtype.itemsize * self.number_of_samples
+		else:
+			nbytes = 8 * self.number_of_samples
+		
+		if (self.is_complex):
+			return 2 * nbytes
+		
+		return nbytes
+	
+	@property
+	def overflows(self):
+		"""
+		Return True if the words are wider than 63 bits.
+		
+		Notes:
+		Scaled values are stored as numpy.int64, so words wider than 63 
+		bits cannot be represented.
+		"""
+		
+		return (self.precision != None) and (self.precision.width > 63)
+	
+	def __init__(self,kind,rate=None,length=None,is_complex=False,precision=None,packed=False,saturated=False):
+		"""
+		Construct a signal plan.
+		
+		Arguments:
+		kind -- Either 'analog' or 'digital'.
+		
+		Keyword arguments:
+		rate -- Sample rate in samples per second (default is None).
+		length -- Number of samples (default is None).
+		is_complex -- True if samples are complex-valued (default is False).
+		precision -- FixedWidthBinary.WordFormat of the samples (default
+		is None).
+		packed -- True if samples are stored packed into bytes (default
+		is False).
+		saturated -- True if samples are stored in the narrowest type for
+		the width of the precision, as produced by 
+		FixedWidthBinary.Word.saturate (default is False).
+		
+		"""
+		
+		if (kind not in ('analog','digital')):
+			raise ValueError("Kind of SignalPlan should be 'analog' or 'digital'.")
+		
+		self._kind = kind
+		self._sample_rate = rate
+		self._number_of_samples = length
+		self._is_complex = is_complex
+		self._precision = precision
+		self._is_packed = packed
+		self._is_saturated = saturated
+	
+	def __repr__(self):
+		"""
+		Unambiguous string representation.
+		
+		"""
+		
+		if (self.kind == 'analog'):
+			return 'SignalPlan(analog)'
+		
+		return 'SignalPlan(digital, ' + str(self.number_of_samples) + (' complex' if self.is_complex else ' real') + (' packed' if self.is_packed else '') + ' samples, ' + str(self.precision) + ')'
+	
+	@classmethod
+	def describe(cls,s):
+		"""
+		Return the plan that describes the given signal.
+		
+		Arguments:
+		s -- Signal or SignalPlan instance, or a list of such instances.
+		
+		"""
+		
+		if (isinstance(s,list)):
+			return [cls.describe(item) for item in s]
+		elif (isinstance(s,SignalPlan)):
+			return s
+		elif (isinstance(s,DigitalSignal)):
+			word = s.samples_word
+			is_complex = isinstance(word,fw.WordComplex)
+			saturated = False
+			if (not s.is_packed):
+				scaled = word.scaled_value_real if is_complex else word.scaled_value
+				saturated = (np.asarray(scaled).dtype == s.precision.storage_dtype)
+			
+			return cls('digital',s.sample_rate,s.number_of_samples,is_complex,s.precision,s.is_packed,saturated)
+		elif (isinstance(s,AnalogSignal)):
+			return cls('analog')
+		
+		raise TypeError("Only Signal instances can be described by a SignalPlan.")
+
+# end class SignalPlan
+
+
+class Frame(object):
+	"""
+	Represent a single frame in a stream of signals.
+	
+	A Frame is a timestamped container for the signal (or list of signals,
+	for parallel paths) that is pushed from block to block in streaming
+	mode, see SimSWARM.Blocks.Chain.stream.
+	"""
+	
+	def __init__(self,timestamp,sample_rate,payload):
+		"""
+		Construct a frame.
+		
+		Arguments:
+		timestamp -- Time of the first sample in the frame, in seconds.
+		sample_rate -- Sample rate of the payload in samples per second,
+		or None if the payload is not sampled (e.g. AnalogSignal).
+		payload -- Signal instance, or list of Signal instances.
+		"""
+		
+		self._timestamp = timestamp
+		self._sample_rate = sample_rate
+		self._payload = payload
+	
+	@property
+	def timestamp(self):
+		"""
+		Return the time of the first sample in the frame.
+		
+		"""
+		
+		return self._timestamp
+	
+	@property
+	def sample_rate(self):
+		"""
+		Return the sample rate of the frame payload.
+		
+		"""
+		
+		return self._sample_rate
+	
+	@property
+	def payload(self):
+		"""
+		Return the signal, or list of signals, carried by the frame.
+		
+		"""
+		
+		return self._payload
+
+# end class Frame
+
+
 #~ class DigitalSignalComplex(DigitalSignal):
 	#~ """
 	#~ Represent a complex digital signal.
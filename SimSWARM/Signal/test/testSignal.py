@@ -0,0 +1,42 @@
+#!/usr/bin/python
+# unit-tests for SimSWARM.Signal
+# Creator: Andre Young
+# Date: Oct 18, 2026
+
+import math, sys, unittest
+
+from SimSWARM.Signal import *
+
+class TestGaussianNoiseGeneratorSeeds(unittest.TestCase):
+
+	def setUp(self):
+		self.seed_list = list(GaussianNoiseGenerator._seed_list)
+		GaussianNoiseGenerator._seed_list[:] = [0]
+
+	def tearDown(self):
+		GaussianNoiseGenerator._seed_list[:] = self.seed_list
+
+	def testUnseededAfterSeeded(self):
+		GaussianNoiseGenerator(seed=5)
+		g = GaussianNoiseGenerator()
+		self.assertEqual(g.generate(1.0,4,0.0).size,4)
+
+	def testSeedsInRange(self):
+		for ii in range(0,10):
+			g = GaussianNoiseGenerator()
+			g.generate(1.0,4,-3.0e6)
+			g.generate(1.0,4,3.0e6)
+		GaussianNoiseGenerator(seed=2**32-1).generate(1.0,4,-3.0e6)
+		self.assertTrue(all([(s >= 0) and (s < 2**32) for s in GaussianNoiseGenerator._seed_list]))
+
+	def testSeedOutOfRange(self):
+		self.assertRaises(ValueError,GaussianNoiseGenerator,seed=-1)
+		self.assertRaises(ValueError,GaussianNoiseGenerator,seed=2**32)
+
+	def testGivenSeedNotReassigned(self):
+		g1 = GaussianNoiseGenerator(seed=GaussianNoiseGenerator._seed_list[-1])
+		g2 = GaussianNoiseGenerator()
+		self.assertNotEqual(g1.base_seed['pos'],g2.base_seed['pos'])
+
+if __name__ == '__main__':
+	unittest.main()
@@ -12,6 +12,7 @@
 #  
 #  Changelog:
 #  	AY: Created 2015-01-22
+#	AY: Added spec methods for declarative descriptions 2026-10-18
 """
 Defines a number of classes and utilities that are used to describe sources.
 
@@ -34,6 +35,17 @@ class Position(object):
 		
 		Nothing to see here.
 		"""
+	
+	def _spec_params(self):
+		"""
+		Return the constructor arguments of this position as a dictionary.
+		
+		Notes:
+		See SimSWARM.Signal.Signal._spec_params. This implementation returns
+		an empty dictionary.
+		"""
+		
+		return dict()
 
 # end class Position
 
@@ -101,6 +113,14 @@ class CartesianPosition(Position):
 		self._x = coords[0]
 		self._y = coords[1]
 		self._z = coords[2]
+	
+	def _spec_params(self):
+		"""
+		Return the coordinates as constructor argument.
+		
+		"""
+		
+		return {'coords': self.coords}
 
 # end class CartesianPosition
 
@@ -163,6 +183,14 @@ class SkyPosition(Position):
 		
 		self._theta = coords[0]
 		self._phi = coords[1]
+	
+	def _spec_params(self):
+		"""
+		Return the coordinates as constructor argument.
+		
+		"""
+		
+		return {'coords': self.coords}
 
 # end class SkyPosition
 
@@ -191,6 +219,16 @@ class Source(object):
 		"""
 		
 		self._signal = asig
+	
+	def _spec_params(self):
+		"""
+		Return the constructor arguments of this source as a dictionary.
+		
+		Notes:
+		See SimSWARM.Signal.Signal._spec_params.
+		"""
+		
+		return {'asig': self.signal}
 
 # end class Source
 
@@ -222,4 +260,12 @@ class PointSource(Source):
 		self._signal = asig
 		self._position = pos
 	
+	def _spec_params(self):
+		"""
+		Return the signal and position as constructor arguments.
+		
+		"""
+		
+		return {'asig': self.signal, 'pos': self.position}
+	
 # end class PointSource
@@ -0,0 +1,453 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#  spec.py
+#  Oct 18, 2026 17:12:40 EDT
+#  Copyright 2026
+#         
+#  Andre Young <andre.young@cfa.harvard.edu>
+#  Harvard-Smithsonian Center for Astrophysics
+#  60 Garden Street, Cambridge
+#  MA 02138
+#  
+#  Changelog:
+#  	AY: Created 2026-10-18
+#	AY: Added digest and value encoding functions 2026-10-18
+#	AY: Restricted spec types to simulator classes 2026-10-18
+
+"""
+Defines a declarative, JSON-serializable description of simulation objects.
+
+A spec describes a network of blocks, together with the signals,
+generators, sources and antennas it uses, as a list of objects each
+given by its class and constructor arguments. Objects refer to each
+other by index, so that objects shared within the network (e.g. a
+generator that produces correlated signals in several antennas) are
+shared in the reconstructed network as well. Constructing the network
+from a spec takes no more than constructing the objects themselves, so
+that e.g. worker processes can rebuild a network from a few KB of text
+instead of receiving a pickled copy.
+
+The objects that can be described in a spec are those that implement
+_spec_params, i.e. instances of SimSWARM.Blocks.Block,
+SimSWARM.Signal.Signal and Generator, SimSWARM.Source.Position and
+Source, and SimSWARM.Antenna.Antenna, as well as derived classes that
+follow the same conventions. Parameters may be numbers, strings, None,
+lists, tuples, dictionaries, numpy arrays and FixedWidthBinary.WordFormat
+instances.
+
+Since specs are read from files (e.g. checkpoints and cached outputs),
+only classes defined in the SimSWARM and FixedWidthBinary packages, or
+registered with register, are constructed from a spec.
+"""
+
+import hashlib
+import importlib
+import json
+
+import numpy as np
+
+import FixedWidthBinary as fw
+
+# Version of the spec layout produced by to_spec.
+SPEC_VERSION = 1
+
+# Packages of which the classes may be constructed from a spec.
+_spec_packages = ('SimSWARM','FixedWidthBinary')
+
+# Classes defined elsewhere that may be constructed from a spec, by fully
+# qualified name, see register.
+_registered = dict()
+
+def to_spec(obj):
+	"""
+	Return a declarative description of the given object.
+	
+	Arguments:
+	obj -- The object to describe, e.g. a Chain, Parallel or Array, or a
+	list or dictionary of such objects.
+	
+	Notes:
+	The result is a dictionary that contains only JSON-serializable
+	values, see dumps. The object and everything it refers to is
+	described, including the network of blocks upstream of a block, the
+	mutable state of each block (see SimSWARM.Blocks.Block.get_state)
+	and the seeds of random generators. Parallel runners are not
+	included in the description.
+	"""
+	
+	return _SpecWriter().write(obj)
+
+def from_spec(spec):
+	"""
+	Construct and return the object described by the given spec.
+	
+	Arguments:
+	spec -- Dictionary as returned by to_spec.
+	
+	Notes:
+	Constructing the described objects does not advance the seeds used
+	by objects created before, but generators created afterwards are
+	assigned seeds beyond those in the spec, see
+	SimSWARM.Signal.GaussianNoiseGenerator.
+	
+	A ValueError is raised if the spec names a class outside of the
+	SimSWARM and FixedWidthBinary packages that is not registered (see
+	register), or a class that does not implement _spec_params.
+	"""
+	
+	return _SpecReader(spec).read()
+
+def register(cls):
+	"""
+	Allow a class defined outside of the simulator packages in specs.
+	
+	Arguments:
+	cls -- The class, which should implement _spec_params.
+	
+	Notes:
+	Returns cls, so that this function can be used as a class decorator.
+	"""
+	
+	if (not hasattr(cls,'_spec_params')):
+		raise ValueError("Class " + cls.__name__ + " does not implement _spec_params.")
+	
+	_registered[cls.__module__ + '.' + cls.__name__] = cls
+	
+	return cls
+
+def dumps(obj,**kwargs):
+	"""
+	Return a declarative description of the given object as a JSON string.
+	
+	Arguments:
+	obj -- The object to describe, see to_spec.
+	
+	Keyword arguments:
+	Passed on to json.dumps.
+	"""
+	
+	return json.dumps(to_spec(obj),**kwargs)
+
+def loads(text):
+	"""
+	Construct and return the object described by the given JSON string.
+	
+	Arguments:
+	text -- String as returned by dumps.
+	
+	"""
+	
+	return from_spec(json.loads(text))
+
+def digest(obj,memo=None):
+	"""
+	Return a hash of the description of the given object.
+	
+	Arguments:
+	obj -- The object to describe, see to_spec.
+	
+	Keyword arguments:
+	memo -- Dictionary that maps the id of objects to their digests,
+	used to share the work between calls for objects in the same 
+	network (default is None).
+	
+	Notes:
+	The digest is computed from the class, constructor arguments, links
+	and state of the object, with each object it refers to replaced by
+	the digest of that object. Two objects have the same digest if the
+	networks upstream of them are described by the same spec, e.g. a
+	network built twice by the same script, even though the objects 
+	themselves differ. Sample arrays are hashed rather than encoded.
+	"""
+	
+	return _DigestWriter(memo).digest(obj)
+
+def encode_value(v):
+	"""
+	Return the JSON-serializable encoding of a value as used in a spec.
+	
+	Arguments:
+	v -- The value to encode, which can be any parameter value allowed
+	in a spec apart from objects that are themselves described by a 
+	spec, e.g. the state of a block (see SimSWARM.Blocks.Block.get_state).
+	
+	"""
+	
+	writer = _SpecWriter()
+	result = writer._value(v)
+	if (len(writer._objects) > 0):
+		raise TypeError("Objects described by a spec cannot be encoded as a value.")
+	
+	return result
+
+def decode_value(v):
+	"""
+	Return the value of which encode_value returned the given encoding.
+	
+	"""
+	
+	return _SpecReader({'version': SPEC_VERSION, 'root': v, 'objects': list()}).read()
+
+class _SpecWriter(object):
+	# Collects the objects referred to by a root object, and encodes
+	# each of them. Objects are queued when first referred to, and
+	# encoded in turn, so that no recursion is needed to follow long
+	# networks of blocks.
+	
+	def __init__(self):
+		self._objects = list()
+		self._index = dict()
+		self._queue = list()
+	
+	def write(self,obj):
+		root = self._value(obj)
+		while (len(self._queue) > 0):
+			ii = self._queue.pop(0)
+			self._objects[ii] = self._entry(self._objects[ii])
+		
+		return {'version': SPEC_VERSION, 'root': root, 'objects': self._objects}
+	
+	def _entry(self,obj):
+		# Encode a single object as its class name, constructor arguments
+		# and, if any, links and state.
+		
+		cls = type(obj)
+		entry = dict()
+		entry['type'] = cls.__module__ + '.' + cls.__name__
+		entry['params'] = self._mapping(obj._spec_params())
+		if (hasattr(obj,'_spec_links')):
+			links = obj._spec_links()
+			if (len(links) > 0):
+				entry['links'] = self._mapping(links)
+		
+		if (hasattr(obj,'get_state')):
+			state = obj.get_state()
+			if (len(state) > 0):
+				entry['state'] = self._mapping(state)
+		
+		return entry
+	
+	def _mapping(self,d):
+		# Encode the values in a dictionary with string keys.
+		
+		return dict([(str(k),self._value(v)) for k,v in d.items()])
+	
+	def _value(self,v):
+		# Encode a single value.
+		
+		if (hasattr(v,'_spec_params')):
+			return {'__ref__': self._ref(v)}
+		elif (isinstance(v,fw.WordFormat)):
+			return {'__WordFormat__': [v.width,_lsb_pot(v)]}
+		elif (isinstance(v,np.ndarray)):
+			if (np.iscomplexobj(v)):
+				return {'__ndarray__': v.real.tolist(), 'imag': v.imag.tolist(), 'dtype': str(v.dtype)}
+			return {'__ndarray__': v.tolist(), 'dtype': str(v.dtype)}
+		elif (isinstance(v,np.generic)):
+			return self._value(v.item())
+		elif (isinstance(v,complex)):
+			return {'__complex__': [v.real,v.imag]}
+		elif (isinstance(v,list)):
+			return [self._value(item) for item in v]
+		elif (isinstance(v,tuple)):
+			return {'__tuple__': [self._value(item) for item in v]}
+		elif (isinstance(v,dict)):
+			return {'__dict__': self._mapping(v)}
+		elif ((v == None) or isinstance(v,(bool,int,long,float,basestring))):
+			return v
+		
+		raise TypeError("Cannot describe instance of " + type(v).__name__ + " in spec.")
+	
+	def _ref(self,obj):
+		# Return the index of obj in the list of objects, queueing it for
+		# encoding if it is encountered for the first time.
+		
+		ii = self._index.get(id(obj))
+		if (ii == None):
+			ii = len(self._objects)
+			self._index[id(obj)] = ii
+			self._objects.append(obj)
+			self._queue.append(ii)
+		
+		return ii
+
+# end class _SpecWriter
+
+class _DigestWriter(_SpecWriter):
+	# Computes digests of objects, with the objects they refer to 
+	# replaced by their digests. The objects referred to are visited 
+	# first, using an explicit stack rather than recursion.
+	
+	def __init__(self,memo=None):
+		super(_DigestWriter,self).__init__()
+		if (memo == None):
+			memo = dict()
+		
+		self._memo = memo
+	
+	def digest(self,obj):
+		stack = [obj]
+		while (len(stack) > 0):
+			o = stack[-1]
+			if (id(o) in self._memo):
+				stack.pop()
+				continue
+			
+			missing = [r for r in self._references(o) if (id(r) not in self._memo)]
+			if (len(missing) > 0):
+				stack.extend(missing)
+				continue
+			
+			entry = json.dumps(self._entry(o),sort_keys=True)
+			self._memo[id(o)] = hashlib.sha1(entry).hexdigest()
+			stack.pop()
+		
+		return self._memo[id(obj)]
+	
+	def _references(self,obj):
+		# Return the objects referred to in the parameters and links of obj.
+		
+		values = list(obj._spec_params().values())
+		if (hasattr(obj,'_spec_links')):
+			values.extend(obj._spec_links().values())
+		
+		result = list()
+		while (len(values) > 0):
+			v = values.pop()
+			if (hasattr(v,'_spec_params')):
+				result.append(v)
+			elif (isinstance(v,(list,tuple))):
+				values.extend(v)
+			elif (isinstance(v,dict)):
+				values.extend(v.values())
+		
+		return result
+	
+	def _value(self,v):
+		if (isinstance(v,np.ndarray)):
+			data = np.ascontiguousarray(v).reshape(-1).view(np.uint8)
+			return {'__ndarray__': hashlib.sha1(data).hexdigest(), 'dtype': str(v.dtype), 'shape': list(v.shape)}
+		
+		return super(_DigestWriter,self)._value(v)
+	
+	def _ref(self,obj):
+		return self._memo[id(obj)]
+
+# end class _DigestWriter
+
+class _SpecReader(object):
+	# Constructs the objects in a spec. Objects are constructed on
+	# demand, so that objects passed as constructor arguments are
+	# constructed first. Links between objects (such as the source of a
+	# block) are restored once all objects exist, so that constructing
+	# a long network of blocks needs no recursion.
+	
+	def __init__(self,spec):
+		if (spec.get('version') != SPEC_VERSION):
+			raise ValueError("Unsupported spec version " + str(spec.get('version')) + ".")
+		
+		self._entries = spec['objects']
+		self._root = spec['root']
+		self._objects = [None] * len(self._entries)
+		self._building = set()
+	
+	def read(self):
+		for ii in range(0,len(self._entries)):
+			self._object(ii)
+		
+		for ii in range(0,len(self._entries)):
+			entry = self._entries[ii]
+			if ('links' in entry):
+				self._objects[ii]._restore_spec_links(self._mapping(entry['links']))
+			if ('state' in entry):
+				self._objects[ii].set_state(self._mapping(entry['state']))
+		
+		return self._value(self._root)
+	
+	def _object(self,ii):
+		# Return the object at index ii, constructing it if needed.
+		
+		obj = self._objects[ii]
+		if (obj != None):
+			return obj
+		
+		if (ii in self._building):
+			raise ValueError("Spec contains a cycle in constructor arguments.")
+		
+		self._building.add(ii)
+		entry = self._entries[ii]
+		cls = _lookup(entry['type'])
+		params = self._mapping(entry['params'])
+		if (hasattr(cls,'_from_spec_params')):
+			obj = cls._from_spec_params(params)
+		else:
+			obj = cls(**params)
+		self._building.remove(ii)
+		
+		self._objects[ii] = obj
+		
+		return obj
+	
+	def _mapping(self,d):
+		# Decode the values in a dictionary.
+		
+		return dict([(str(k),self._value(v)) for k,v in d.items()])
+	
+	def _value(self,v):
+		# Decode a single value.
+		
+		if (isinstance(v,list)):
+			return [self._value(item) for item in v]
+		elif (not isinstance(v,dict)):
+			return v
+		elif ('__ref__' in v):
+			return self._object(v['__ref__'])
+		elif ('__WordFormat__' in v):
+			return fw.WordFormat(v['__WordFormat__'][0],v['__WordFormat__'][1])
+		elif ('__ndarray__' in v):
+			if ('imag' in v):
+				return (np.array(v['__ndarray__']) + 1j*np.array(v['imag'])).astype(v['dtype'])
+			return np.array(v['__ndarray__'],dtype=v['dtype'])
+		elif ('__complex__' in v):
+			return complex(v['__complex__'][0],v['__complex__'][1])
+		elif ('__tuple__' in v):
+			return tuple([self._value(item) for item in v['__tuple__']])
+		elif ('__dict__' in v):
+			return self._mapping(v['__dict__'])
+		
+		raise ValueError("Invalid value in spec: " + str(v))
+
+# end class _SpecReader
+
+def _lsb_pot(fmt):
+	# Return the power-of-two of the LSB value of a WordFormat, as an
+	# integer if possible.
+	
+	lsb_pot = np.log2(fmt.lsb_value)
+	if (isinstance(fmt.lsb_value,(int,long)) or (lsb_pot != int(lsb_pot))):
+		return int(lsb_pot) if (lsb_pot == int(lsb_pot)) else float(lsb_pot)
+	
+	return float(lsb_pot)
+
+def _lookup(name):
+	# Return the class with the given fully qualified name. Only modules
+	# in the simulator packages are imported, and only classes that can
+	# be described in a spec are returned, so that a spec read from file
+	# cannot call arbitrary functions.
+	
+	if (name in _registered):
+		return _registered[name]
+	
+	if ('.' not in name):
+		raise ValueError("Type " + name + " is not allowed in a spec.")
+	
+	module,cls_name = name.rsplit('.',1)
+	if (module.split('.')[0] not in _spec_packages):
+		raise ValueError("Type " + name + " is not allowed in a spec.")
+	
+	cls = getattr(importlib.import_module(module),cls_name,None)
+	if ((not isinstance(cls,type)) or (not hasattr(cls,'_spec_params'))):
+		raise ValueError("Type " + name + " is not allowed in a spec.")
+	
+	return cls
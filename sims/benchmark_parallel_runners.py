@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+#  benchmark_parallel_runners.py
+#  Oct 18, 2026 14:05:31 EDT
+#  Copyright 2026
+#         
+#  Andre Young <andre.young@cfa.harvard.edu>
+#  Harvard-Smithsonian Center for Astrophysics
+#  60 Garden Street, Cambridge
+#  MA 02138
+#  
+#  Changelog:
+#  	AY: Created 2026-10-18
+#	AY: Explicit noise seeds and runners closed on error 2026-10-18
+#	AY: Noise generators assign their own seeds again 2026-10-18
+
+"""
+Benchmark serial, thread-pool and process-pool evaluation of Parallel.
+
+Each parallel path comprises an independent noise signal, ADC and FFT,
+which is representative of the per-antenna processing in the phasing
+efficiency simulation. The time taken to compute the output of all paths
+is measured for each evaluation mode and a number of path counts, and
+the outputs are checked to be identical across modes.
+
+"""
+
+# some useful libraries to import
+import sys
+import numpy as np
+
+# import to time execution
+import time
+
+# add local path for custome modules
+sys.path.append('../')
+
+# import for handling fixed-width binary representation
+import FixedWidthBinary as fw
+
+# import for system description building blocks
+import SimSWARM.Blocks as bl
+import SimSWARM.Execution as ex
+import SimSWARM.Signal as sg
+
+# Global parameters
+#
+# Numbers of parallel paths to benchmark
+NUM_PATHS = (2,4,8,16)
+#
+# Number of workers used by the thread and process pools
+NUM_WORKERS = 4
+#
+# Number of repetitions per measurement, the best time is reported
+NUM_REPEAT = 3
+#
+# ADC characteristics
+ADC_RATE = 4576e6 # samples per second
+ADC_NUM_OF_SAMPLES = 2**14
+ADC_WIDTH = 8 # bits
+#
+# FFT characteristics
+FFT_WIDTH = 18 # bits
+#
+# Use numpy FFT (True) or limited precision FFT (False)
+FFT_USE_ALT_OUTPUT = True
+
+def main():
+	
+	# the runners shut down their pools also if a measurement fails
+	with ex.ThreadPoolRunner(NUM_WORKERS) as thread_runner, ex.ProcessPoolRunner(NUM_WORKERS) as process_runner:
+		runners = (('serial',None),('thread',thread_runner),('process',process_runner))
+		
+		print "{:>6s} {:>12s} {:>12s} {:>12s}".format('paths','serial [s]','thread [s]','process [s]')
+		for num_paths in NUM_PATHS:
+			par = generate_parallel(num_paths)
+			times = list()
+			reference = None
+			for name,runner in runners:
+				par.set_runner(runner)
+				t_best = None
+				for ii in range(0,NUM_REPEAT):
+					t_start = time.time()
+					out = par.output()
+					t_end = time.time()
+					if ((t_best == None) or (t_end - t_start < t_best)):
+						t_best = t_end - t_start
+				
+				if (reference == None):
+					reference = out
+				elif (not outputs_identical(reference,out)):
+					print "Output of {:s} runner differs from serial output.".format(name)
+				
+				times.append(t_best)
+			
+			print "{:6d} {:12.3f} {:12.3f} {:12.3f}".format(num_paths,times[0],times[1],times[2])
+	
+	return 0
+
+def generate_parallel(num_paths):
+	"""
+	Generate a Parallel of noise + ADC + FFT paths.
+	
+	Arguments:
+	num_paths -- The number of parallel paths.
+	
+	"""
+	
+	max_in = 5.0
+	adc_precision = fw.WordFormat(ADC_WIDTH,np.ceil(np.log2(max_in)) - ADC_WIDTH)
+	fft_precision = fw.WordFormat(FFT_WIDTH,np.ceil(np.log2(max_in*np.sqrt(ADC_NUM_OF_SAMPLES))) - FFT_WIDTH)
+	
+	paths = list()
+	for ii in range(0,num_paths):
+		chain = bl.Chain()
+		chain.add_block(bl.AnalogDigitalConverter(ADC_RATE,ADC_NUM_OF_SAMPLES,adc_precision))
+		chain.add_block(bl.DigitalFFT(fft_precision,use_alt_output=FFT_USE_ALT_OUTPUT))
+		chain.attach_source(sg.AnalogSignal(sg.GaussianNoiseGenerator()))
+		paths.append(chain)
+	
+	return bl.Parallel(paths)
+
+def outputs_identical(out_a,out_b):
+	"""
+	Return True if the two lists of DigitalSignal have identical samples.
+	
+	"""
+	
+	for a,b in zip(out_a,out_b):
+		if (not np.array_equal(a.samples,b.samples)):
+			return False
+	
+	return True
+
+if __name__ == '__main__':
+	main()